@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+記事オブジェクト（Article）のメモリ・生成時間のベンチマーク
+
+同じ値から --count 件の記事を作り、1件あたりの生成時間と保持するメモリを比較する。
+
+    legacy:          変更前の Article（__dict__ 付きの dataclass、検証あり、source はインスタンスごとの文字列）
+    article:         Article(...)（__slots__、検証あり、source・category を intern）
+    trusted:         Article.trusted(...)（検証を省略。RSSの収集で使う）
+    frozen:          FrozenArticle(...)
+    frozen_trusted:  FrozenArticle.trusted(...)
+
+入力の source・category はパーサーが返す値と同じく1件ごとに別の文字列オブジェクトにする。
+メモリは記事リストだけが残った状態で tracemalloc が追跡しているサイズ（入力の値は記事が参照する分だけ数える）。
+
+使い方:
+    python benchmarks/bench_article.py --count 1000000
+    python benchmarks/bench_article.py --count 100000 --json
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from collectors.base_collector import Article, FrozenArticle  # noqa: E402
+
+# 変更前の collectors/base_collector.py の Article
+@dataclass
+class LegacyArticle:
+    title: str
+    url: str
+    summary: str
+    published_date: Optional[datetime] = None
+    source: str = ""
+    score: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.published_date is None:
+            self.published_date = datetime.now()
+        if not isinstance(self.title, str) or not self.title.strip():
+            raise ValueError("title must be a non-empty string")
+        if not isinstance(self.url, str) or not self.url.strip():
+            raise ValueError("url must be a non-empty string")
+        if not isinstance(self.score, (int, float)) or self.score < 0:
+            raise ValueError("score must be a non-negative number")
+
+SOURCES = ["ITmedia AI+", "はてなブックマーク テクノロジー", "Zenn AI", "Twitter - ChatGPT研究所", "Twitter - みのるん"]
+
+Row = Tuple[str, str, str, datetime, str, str]
+
+def generate_rows(count: int) -> Iterator[Row]:
+    """(タイトル, URL, 要約, 公開日時, ソース名, カテゴリ)。ソース名・カテゴリは1件ごとに別オブジェクト"""
+    base = datetime(2026, 10, 19)
+    for i in range(count):
+        source = SOURCES[i % len(SOURCES)]
+        yield (
+            f"生成AIの最新動向 第{i}回: モデルとツールのアップデート",
+            f"https://example.com/articles/{i:09d}",
+            f"新しいモデルとエージェント機能について、導入の手順と注意点を解説します。({i})",
+            base - timedelta(minutes=i % 20160),
+            "".join(source),
+            "".join("twitter" if source.startswith("Twitter") else "rss"),
+        )
+
+def _make_legacy(row: Row) -> Any:
+    return LegacyArticle(row[0], row[1], row[2], row[3], row[4])
+
+VARIANTS: Dict[str, Callable[[Row], Any]] = {
+    'legacy': _make_legacy,
+    'article': lambda row: Article(row[0], row[1], row[2], row[3], row[4], category=row[5]),
+    'trusted': lambda row: Article.trusted(row[0], row[1], row[2], row[3], row[4], category=row[5]),
+    'frozen': lambda row: FrozenArticle(row[0], row[1], row[2], row[3], row[4], category=row[5]),
+    'frozen_trusted': lambda row: FrozenArticle.trusted(row[0], row[1], row[2], row[3], row[4], category=row[5]),
+}
+
+def bench_construction(make: Callable[[Row], Any], rows: List[Row], repeat: int) -> float:
+    """rows から記事を作る時間の中央値（秒）"""
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        articles = [make(row) for row in rows]
+        samples.append(time.perf_counter() - start)
+        del articles
+    return statistics.median(samples)
+
+def bench_memory(make: Callable[[Row], Any], count: int) -> int:
+    """記事 count 件を保持するメモリ（バイト）"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        articles = [make(row) for row in generate_rows(count)]
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+        del articles
+    finally:
+        tracemalloc.stop()
+    return retained
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """エントリーポイント"""
+    parser = argparse.ArgumentParser(description="Article のメモリ・生成時間のベンチマーク")
+    parser.add_argument("--count", type=int, default=200_000, help="作成する記事数")
+    parser.add_argument("--repeat", type=int, default=5, help="生成時間の計測回数")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    rows = list(generate_rows(args.count))
+    results = {}
+    for name, make in VARIANTS.items():
+        seconds = bench_construction(make, rows, args.repeat)
+        retained = bench_memory(make, args.count)
+        results[name] = {
+            'seconds': seconds,
+            'microseconds_per_article': seconds / args.count * 1e6,
+            'bytes': retained,
+            'bytes_per_article': retained / args.count,
+        }
+    del rows
+
+    legacy = results['legacy']
+    for result in results.values():
+        result['time_ratio'] = result['seconds'] / legacy['seconds']
+        result['memory_ratio'] = result['bytes'] / legacy['bytes']
+
+    report = {'count': args.count, 'python': sys.version.split()[0], 'variants': results}
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"📊 記事 {args.count:,}件（生成時間は{args.repeat}回の中央値）")
+    for name, r in results.items():
+        print(f"  {name:15s} 生成 {r['microseconds_per_article']:6.2f}µs/件 (x{r['time_ratio']:.2f}) | "
+              f"メモリ {r['bytes_per_article']:6.0f} B/件 (x{r['memory_ratio']:.2f}) "
+              f"{r['bytes'] / 1024 / 1024:8.1f} MB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
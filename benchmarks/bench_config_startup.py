@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+設定読み込み（コールドスタート）のベンチマーク
+
+新しいプロセスで設定ファイル4つを読み込み、キーワード・スコア表を導出するまでの時間を比較する。
+
+    legacy:   純Pythonの yaml.safe_load で解析して導出（変更前の経路）
+    yaml:     設定キャッシュ（LibYAML）で解析して導出し、スナップショットを書き出す
+    snapshot: コンパイル済みスナップショットから読み込む
+
+使い方:
+    python benchmarks/bench_config_startup.py --runs 20
+    python benchmarks/bench_config_startup.py --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+MODES = ("legacy", "yaml", "snapshot")
+
+def child(mode: str) -> None:
+    """計測用の子プロセス（モジュールのimportは計測に含めない）"""
+    import yaml
+    from utils.config import Config
+    from utils.compiled_config import COMPILED_FILES, compile_config, get_compiled_config
+
+    config = Config()
+    start = time.perf_counter()
+    if mode == "legacy":
+        data = {}
+        for name in COMPILED_FILES:
+            with open(config.config_dir / name, 'r', encoding='utf-8') as f:
+                data[name] = yaml.safe_load(f) or {}
+        compile_config(data)
+    else:
+        get_compiled_config(config)
+        for name in COMPILED_FILES:
+            config.load_yaml(name)
+    print(time.perf_counter() - start)
+
+def run_child(mode: str, data_dir: Path) -> float:
+    """子プロセスを起動して読み込み時間（秒）を取得"""
+    env = dict(os.environ, NEWS_PUBLISHER_DATA_DIR=str(data_dir))
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", mode],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+def bench(mode: str, runs: int, work_dir: Path) -> Dict[str, Any]:
+    """1モード分の計測"""
+    samples: List[float] = []
+    for i in range(runs):
+        if mode == "snapshot":
+            data_dir = work_dir / "snapshot"
+            if i == 0:
+                run_child("yaml", data_dir)  # スナップショットを用意
+        else:
+            # 毎回スナップショットのない状態から始める
+            data_dir = work_dir / f"{mode}-{i}"
+        samples.append(run_child(mode, data_dir))
+    return {
+        'runs': runs,
+        'mean_ms': statistics.mean(samples) * 1000,
+        'median_ms': statistics.median(samples) * 1000,
+        'min_ms': min(samples) * 1000,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """エントリーポイント"""
+    parser = argparse.ArgumentParser(description="設定読み込みのベンチマーク")
+    parser.add_argument("--runs", type=int, default=10, help="モードごとの実行回数")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child(args.child)
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="bench_config_") as tmp:
+        report = {mode: bench(mode, args.runs, Path(tmp)) for mode in MODES}
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"📊 設定読み込み {args.runs}回（プロセスごとのコールドスタート）")
+    for mode in MODES:
+        r = report[mode]
+        print(f"  {mode:8s} 平均 {r['mean_ms']:8.3f}ms / 中央値 {r['median_ms']:8.3f}ms / 最小 {r['min_ms']:8.3f}ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
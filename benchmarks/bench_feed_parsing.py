@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+フィード解析（プロセスプール）のベンチマーク
+
+記事数の違う合成フィードで、次の時間を比較する。
+
+    inline:    このプロセスで parse_feed() を実行
+    pool:      共有プロセスプールに1件渡して結果を待つ（ワーカーは起動済み）
+    serialize: プロセス間の受け渡し（フィードと解析結果の pickle / unpickle）
+
+pool と inline の差が受け渡しのオーバーヘッドで、これが解析時間の --max-overhead 以下になる
+最小のフィードサイズを control.yml の feed_parsing.min_feed_bytes の目安として表示する。
+最後に、同じサイズのフィード --feeds 件をまとめて解析する時間（parse_feeds()）を比較する。
+
+使い方:
+    python benchmarks/bench_feed_parsing.py
+    python benchmarks/bench_feed_parsing.py --items 10 50 200 --workers 4 --feeds 200 --json
+"""
+
+import argparse
+import json
+import os
+import pickle
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from collectors.feed_parser import (  # noqa: E402
+    FeedParseSettings, close_parse_pool, get_parse_pool, parse_feed, parse_feeds
+)
+
+SUMMARY_HTML = (
+    "<p><strong>OpenAI</strong> が新しい<a href=\"https://example.com/model\">AIモデル</a>を発表しました。"
+    "<br/>長文の推論とエージェント機能が強化され、<em>Claude</em> や <em>Gemini</em> との比較も話題です。</p>"
+)
+
+def make_feed(items: int) -> bytes:
+    """記事 items 件の RSS 2.0 フィード"""
+    from xml.sax.saxutils import escape
+
+    entries = "".join(
+        f"""
+    <item>
+      <title>AIニュース {i}: 生成AIの最新動向</title>
+      <link>https://example.com/articles/{i}</link>
+      <description>{escape(SUMMARY_HTML * 3)}</description>
+      <pubDate>Mon, 19 Oct 2026 {i % 24:02d}:00:00 +0900</pubDate>
+    </item>""" for i in range(items)
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>bench feed</title>
+    <link>https://example.com/</link>
+    <description>bench</description>{entries}
+  </channel>
+</rss>""".encode('utf-8')
+
+def median_seconds(func: Callable[[], Any], repeat: int) -> float:
+    """func の実行時間の中央値（秒）"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def bench_size(items: int, workers: int, repeat: int) -> Dict[str, Any]:
+    """1つのフィードサイズの計測"""
+    content = make_feed(items)
+    entries = parse_feed(content)
+    pool = get_parse_pool(workers)
+
+    def serialize() -> None:
+        pickle.loads(pickle.dumps(content, pickle.HIGHEST_PROTOCOL))
+        pickle.loads(pickle.dumps(entries, pickle.HIGHEST_PROTOCOL))
+
+    inline = median_seconds(lambda: parse_feed(content), repeat)
+    pooled = median_seconds(lambda: pool.submit(parse_feed, content).result(), repeat)
+    return {
+        'items': items,
+        'feed_bytes': len(content),
+        'result_bytes': len(pickle.dumps(entries, pickle.HIGHEST_PROTOCOL)),
+        'inline_ms': inline * 1000,
+        'pool_ms': pooled * 1000,
+        'serialize_ms': median_seconds(serialize, repeat) * 1000,
+        'overhead_ms': (pooled - inline) * 1000,
+    }
+
+def bench_batch(items: int, feeds: int, workers: int, chunksize: int) -> Dict[str, Any]:
+    """同じサイズのフィード feeds 件をまとめて解析"""
+    contents = [make_feed(items)] * feeds
+    inline = FeedParseSettings(workers=0)
+    pooled = FeedParseSettings(workers=workers, min_feed_bytes=0, chunksize=chunksize)
+    return {
+        'items': items,
+        'feeds': feeds,
+        'chunksize': chunksize,
+        'inline_s': median_seconds(lambda: parse_feeds(contents, inline), 1),
+        'pool_s': median_seconds(lambda: parse_feeds(contents, pooled), 1),
+    }
+
+def recommend_threshold(sizes: List[Dict[str, Any]], max_overhead: float) -> Optional[int]:
+    """受け渡しのオーバーヘッドが解析時間の max_overhead 以下になる最小のフィードサイズ"""
+    for result in sorted(sizes, key=lambda r: r['feed_bytes']):
+        if result['overhead_ms'] <= result['inline_ms'] * max_overhead:
+            return result['feed_bytes']
+    return None
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """エントリーポイント"""
+    parser = argparse.ArgumentParser(description="フィード解析のベンチマーク")
+    parser.add_argument("--items", type=int, nargs='+', default=[5, 20, 50, 100, 200],
+                        help="フィードあたりの記事数（サイズごとに計測）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="プロセスプールのワーカー数")
+    parser.add_argument("--repeat", type=int, default=7, help="サイズごとの計測回数")
+    parser.add_argument("--feeds", type=int, default=50, help="まとめて解析するフィード数")
+    parser.add_argument("--chunksize", type=int, default=4, help="まとめて解析するときの chunksize")
+    parser.add_argument("--max-overhead", type=float, default=0.1,
+                        help="プロセスプールを使う目安（受け渡しのオーバーヘッド / 解析時間）")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    try:
+        # ワーカーの起動・feedparser の import は計測に含めない
+        pool = get_parse_pool(args.workers)
+        list(pool.map(parse_feed, [make_feed(1)] * args.workers))
+
+        sizes = [bench_size(items, args.workers, args.repeat) for items in args.items]
+        threshold = recommend_threshold(sizes, args.max_overhead)
+        batch = bench_batch(max(args.items), args.feeds, args.workers, args.chunksize)
+    finally:
+        close_parse_pool()
+
+    report = {
+        'workers': args.workers,
+        'cpu_count': os.cpu_count(),
+        'sizes': sizes,
+        'recommended_min_feed_bytes': threshold,
+        'batch': batch,
+    }
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"📊 フィード解析（ワーカー {args.workers} / CPU {os.cpu_count()}、中央値）")
+    print(f"  {'記事数':>6s} {'サイズ':>10s} {'結果':>9s} {'inline':>10s} {'pool':>10s} {'pickle':>9s} {'差':>9s}")
+    for r in sizes:
+        print(f"  {r['items']:6d} {r['feed_bytes']:9d}B {r['result_bytes']:8d}B "
+              f"{r['inline_ms']:8.2f}ms {r['pool_ms']:8.2f}ms {r['serialize_ms']:7.3f}ms {r['overhead_ms']:7.2f}ms")
+    if threshold is None:
+        print(f"  ⚠️  受け渡しのオーバーヘッドが解析時間の{args.max_overhead:.0%}以下になるサイズはありませんでした")
+    else:
+        print(f"  💡 min_feed_bytes の目安: {threshold}B（オーバーヘッド {args.max_overhead:.0%} 以下）")
+    print(f"📦 {batch['feeds']}フィード（{batch['items']}記事）をまとめて解析: "
+          f"inline {batch['inline_s']:.3f}s / pool {batch['pool_s']:.3f}s "
+          f"（{batch['inline_s'] / batch['pool_s']:.2f}倍, chunksize={batch['chunksize']}）")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
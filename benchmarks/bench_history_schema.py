@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+履歴DBスキーマのベンチマーク
+
+旧スキーマ（URL・MD5文字列・UNIQUE制約と2つのインデックス）と現行スキーマ
+（64bit整数キーの WITHOUT ROWID テーブル）で、一括追加・重複チェックのスループットと
+ファイルサイズ、旧スキーマからの移行時間を比較する。
+
+使い方:
+    python benchmarks/bench_history_schema.py --rows 1000000
+    python benchmarks/bench_history_schema.py --rows 100000 --lookups 20000 --json
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from utils.database import ArticleHistoryDB
+
+# 変更前の utils/database.py のスキーマ
+LEGACY_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS article_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT UNIQUE NOT NULL,
+        title TEXT NOT NULL,
+        url_hash TEXT NOT NULL,
+        published_date DATE NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_url_hash ON article_history(url_hash);
+    CREATE INDEX IF NOT EXISTS idx_created_at ON article_history(created_at);
+'''
+
+SOURCES = ["Qiita AI", "Zenn AI", "ITmedia AI+", "Publickey", "GIGAZINE", "@openai", "@AnthropicAI"]
+
+def generate_rows(count: int, offset: int = 0) -> List[Tuple[str, str, str]]:
+    """(URL, タイトル, ソース名) のテストデータを生成（実際の収集順に近づけるためシャッフル）"""
+    rows = [
+        (f"https://example.com/articles/{i:09d}?utm_source=rss",
+         f"生成AIの最新動向 第{i}回: モデルとツールのアップデート",
+         SOURCES[i % len(SOURCES)])
+        for i in range(offset, offset + count)
+    ]
+    random.Random(offset).shuffle(rows)
+    return rows
+
+def file_size(path: Path) -> int:
+    """WALをチェックポイントした後のDBファイルサイズ"""
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    finally:
+        conn.close()
+    return path.stat().st_size
+
+def bench_legacy(path: Path, rows: List[Tuple[str, str, str]], lookups: List[str],
+                 batch_size: int) -> Dict[str, Any]:
+    """旧スキーマでの計測（変更前の add_article / is_duplicate と同じSQL）"""
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(LEGACY_SCHEMA)
+    today = time.strftime('%Y-%m-%d')
+
+    start = time.perf_counter()
+    for i in range(0, len(rows), batch_size):
+        with conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO article_history (url, title, url_hash, published_date) VALUES (?, ?, ?, ?)',
+                [(url, title, hashlib.md5(url.encode('utf-8')).hexdigest(), today)
+                 for url, title, _ in rows[i:i + batch_size]]
+            )
+    insert_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hits = 0
+    for url in lookups:
+        url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()
+        count = conn.execute('SELECT COUNT(*) FROM article_history WHERE url_hash = ?', (url_hash,)).fetchone()[0]
+        hits += count > 0
+    lookup_seconds = time.perf_counter() - start
+    conn.close()
+
+    return _result(len(rows), insert_seconds, len(lookups), lookup_seconds, hits, file_size(path))
+
+def bench_current(path: Path, rows: List[Tuple[str, str, str]], lookups: List[str],
+                  batch_size: int) -> Dict[str, Any]:
+    """現行スキーマ（ArticleHistoryDB）での計測"""
+    with ArticleHistoryDB(path) as db:
+        start = time.perf_counter()
+        for i in range(0, len(rows), batch_size):
+            db.add_articles(rows[i:i + batch_size])
+        insert_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        hits = sum(db.is_duplicate(url) for url in lookups)
+        lookup_seconds = time.perf_counter() - start
+
+    return _result(len(rows), insert_seconds, len(lookups), lookup_seconds, hits, file_size(path))
+
+def bench_migration(legacy_path: Path, work_dir: Path) -> Dict[str, Any]:
+    """旧スキーマのDBを現行スキーマへ移行する時間"""
+    path = work_dir / "migrated.db"
+    shutil.copyfile(legacy_path, path)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), ArticleHistoryDB(path):
+        pass
+    return {'seconds': time.perf_counter() - start, 'bytes': file_size(path)}
+
+def _result(rows: int, insert_seconds: float, lookups: int, lookup_seconds: float,
+            hits: int, size: int) -> Dict[str, Any]:
+    return {
+        'insert_seconds': insert_seconds,
+        'inserts_per_second': rows / insert_seconds if insert_seconds else 0.0,
+        'lookup_seconds': lookup_seconds,
+        'lookups_per_second': lookups / lookup_seconds if lookup_seconds else 0.0,
+        'lookup_hits': hits,
+        'bytes': size,
+        'bytes_per_row': size / rows if rows else 0.0,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """エントリーポイント"""
+    parser = argparse.ArgumentParser(description="履歴DBスキーマのベンチマーク")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="登録する件数")
+    parser.add_argument("--lookups", type=int, default=100_000, help="重複チェックの回数（半数は未登録URL）")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="1トランザクションあたりの件数")
+    parser.add_argument("--no-migration", action="store_true", help="移行時間を計測しない")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    rows = generate_rows(args.rows)
+    rng = random.Random(0)
+    half = args.lookups // 2
+    lookups = [url for url, _, _ in rng.sample(rows, min(half, len(rows)))]
+    lookups += [url for url, _, _ in generate_rows(args.lookups - len(lookups), offset=args.rows)]
+    rng.shuffle(lookups)
+
+    with tempfile.TemporaryDirectory(prefix="bench_history_") as tmp:
+        work_dir = Path(tmp)
+        report = {
+            'rows': args.rows,
+            'lookups': len(lookups),
+            'legacy': bench_legacy(work_dir / "legacy.db", rows, lookups, args.batch_size),
+            'current': bench_current(work_dir / "current.db", rows, lookups, args.batch_size),
+        }
+        if not args.no_migration:
+            report['migration'] = bench_migration(work_dir / "legacy.db", work_dir)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"📊 {args.rows:,}件 / 重複チェック {len(lookups):,}回")
+    for name in ('legacy', 'current'):
+        r = report[name]
+        print(f"  {name:8s} 追加 {r['inserts_per_second']:>10,.0f} 件/秒 | "
+              f"重複チェック {r['lookups_per_second']:>10,.0f} 回/秒 | "
+              f"{r['bytes'] / 1024 / 1024:7.1f} MB ({r['bytes_per_row']:.0f} B/件)")
+    if 'migration' in report:
+        m = report['migration']
+        print(f"  移行     {m['seconds']:.2f}秒 → {m['bytes'] / 1024 / 1024:.1f} MB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+マイクロベンチマーク（合成した記事コーパス）
+
+記事数 --sizes 件の合成コーパス（キーワードに一致しない記事・除外キーワード・古い記事・短いタイトル・
+重複URLを実際の収集結果に近い割合で含む）と固定のフィクスチャで、パイプラインの主な処理を計測する。
+
+    コーパスの件数ごと:
+        filter_by_keywords   BaseCollector.filter_by_keywords（RSSCollector）
+        content_filter       ContentFilter.filter_articles（履歴DBに1割のURLを登録済み）
+        popularity_scorer    PopularityScorer.score_articles
+        history_db_insert    ArticleHistoryDB.add_articles（空のDBに全件を1万件ずつ登録）
+        history_db_lookup    ArticleHistoryDB.is_duplicate（半数は登録済みのURL）
+    フィクスチャ:
+        clean_html           feed_parser.clean_html（HTMLの要約1000件）
+        parse_feed/<記事数>   feed_parser.parse_feed（bench_feed_parsing.py と同じ合成フィード）
+        build_prompt/gemini  AISummarizer のプロンプト組み立て（1000回）
+        build_prompt/ollama
+
+結果は JSON（--json / --output）で出力できる。変更前に --save-baseline で保存しておき、
+変更後に --baseline で比較すると、--threshold より遅くなったケースを表示して終了コード1を返す
+（比較はノイズの影響を受けにくい最小値で行う。同じマシンで計測したもの同士を比較すること）。
+
+使い方:
+    python benchmarks/bench_micro.py
+    python benchmarks/bench_micro.py --sizes 1000 10000 100000 1000000 --json
+    python benchmarks/bench_micro.py --save-baseline /tmp/baseline.json      # 変更前
+    python benchmarks/bench_micro.py --baseline /tmp/baseline.json           # 変更後
+
+1,000,000件のコーパスは 1GB 程度のメモリを使う。
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from bench_feed_parsing import SUMMARY_HTML, make_feed  # noqa: E402
+from collectors.base_collector import Article  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+FEED_ITEMS = (5, 50, 200)
+FIXTURE_CALLS = 1000
+
+SOURCES = ["ITmedia AI+", "はてなブックマーク テクノロジー", "Zenn AI", "ChatGPT研究所", "ぬこぬこ", "usutaku", "みのるん"]
+TOPICS = [
+    "OpenAI が GPT の新モデルを発表",
+    "Anthropic の Claude がエージェント機能を強化",
+    "Google Gemini の長文コンテキストを試す",
+    "生成AIで社内ドキュメント検索を作った話",
+    "LLM の推論コストを下げる量子化の実践",
+    "ChatGPT のAPIで業務を自動化する",
+    "機械学習パイプラインの監視を整える",
+    "画像生成モデルのファインチューニング入門",
+]
+OFF_TOPICS = ["週末に読みたい技術書まとめ", "Rust の所有権をもう一度理解する", "キーボード沼の入り口"]
+EXCLUDED = ["AIエンジニア求人のお知らせ", "生成AIスタートアップが採用を強化"]
+
+def make_corpus(size: int, seed: int = 0) -> List[Article]:
+    """合成コーパス
+
+    7割は対象の話題、1割はキーワードなし、1割は除外キーワード、5%は短いタイトル、
+    3%は前の記事と同じURL。公開日時は直近14日に散らばる（半数は日付フィルタで落ちる）。
+    """
+    rng = random.Random(seed)
+    now = datetime.now()
+    articles: List[Article] = []
+    for i in range(size):
+        roll = rng.random()
+        if roll < 0.05:
+            title = f"AI速報{i % 10}"
+        elif roll < 0.15:
+            title = f"{rng.choice(OFF_TOPICS)} #{i}"
+        elif roll < 0.25:
+            title = f"{rng.choice(EXCLUDED)} #{i}"
+        else:
+            title = f"{rng.choice(TOPICS)}（第{i}回）"
+        if articles and rng.random() < 0.03:
+            url = articles[rng.randrange(len(articles))].url
+        else:
+            url = f"https://example.com/{rng.choice(('news', 'blog', 'articles'))}/{i:08d}"
+        articles.append(Article(
+            title=title,
+            url=url,
+            summary=f"{title}。{rng.choice(TOPICS)}について、導入の手順と注意点を実例とともに解説します。({i})",
+            published_date=now - timedelta(minutes=rng.randrange(14 * 24 * 60)),
+            source=rng.choice(SOURCES),
+        ))
+    return articles
+
+def measure(func: Callable[[], Any], repeat: int, max_seconds: float,
+            setup: Optional[Callable[[], Any]] = None) -> List[float]:
+    """func の実行時間（秒）を repeat 回、または合計が max_seconds を超えるまで計測（最低1回）
+
+    setup の戻り値を func に渡す（setup の時間は含めない）。
+    """
+    samples: List[float] = []
+    while len(samples) < repeat and (not samples or sum(samples) < max_seconds):
+        args = (setup(),) if setup is not None else ()
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def _result(name: str, size: Optional[int], items: int, samples: List[float]) -> Dict[str, Any]:
+    median = statistics.median(samples)
+    return {
+        'name': name,
+        'size': size,
+        'items': items,
+        'runs': len(samples),
+        'median_seconds': median,
+        'min_seconds': min(samples),
+        'items_per_second': items / median if median else 0.0,
+    }
+
+def bench_corpus(size: int, work_dir: Path, repeat: int, max_seconds: float) -> List[Dict[str, Any]]:
+    """コーパスの件数ごとの計測"""
+    from collectors.rss_collector import RSSCollector
+    from processors.content_filter import ContentFilter
+    from processors.popularity_scorer import PopularityScorer
+    from utils.config import Config
+    from utils.database import ArticleHistoryDB
+
+    config = Config()
+    corpus = make_corpus(size)
+    rows = [(article.url, article.title, article.source) for article in corpus]
+    results = []
+
+    collector = RSSCollector(config)
+    results.append(_result("filter_by_keywords", size, size, measure(
+        lambda: collector.filter_by_keywords(corpus), repeat, max_seconds)))
+
+    with ArticleHistoryDB(work_dir / f"filter_{size}.db") as db:
+        db.add_articles(rows[::10])
+        content_filter = ContentFilter(config, db=db)
+        results.append(_result("content_filter", size, size, measure(
+            lambda: content_filter.filter_articles(corpus), repeat, max_seconds)))
+
+    scorer = PopularityScorer(config)
+    results.append(_result("popularity_scorer", size, size, measure(
+        lambda articles: scorer.score_articles(articles), repeat, max_seconds, setup=lambda: list(corpus))))
+
+    counter = iter(range(repeat))
+
+    def fresh_db() -> ArticleHistoryDB:
+        return ArticleHistoryDB(work_dir / f"insert_{size}_{next(counter)}.db")
+
+    def insert(db: ArticleHistoryDB) -> None:
+        with db:
+            for i in range(0, len(rows), 10_000):
+                db.add_articles(rows[i:i + 10_000])
+
+    results.append(_result("history_db_insert", size, size, measure(insert, repeat, max_seconds, setup=fresh_db)))
+
+    lookups = [url for url, _, _ in rows]
+    with ArticleHistoryDB(work_dir / f"lookup_{size}.db") as db:
+        db.add_articles(rows[::2])
+        results.append(_result("history_db_lookup", size, len(lookups), measure(
+            lambda: [db.is_duplicate(url) for url in lookups], repeat, max_seconds)))
+    return results
+
+def bench_fixtures(repeat: int, max_seconds: float) -> List[Dict[str, Any]]:
+    """件数によらない処理の計測"""
+    from collectors.feed_parser import clean_html, parse_feed
+    from generators.ai_summarizer import AISummarizer
+
+    results = []
+    summaries = [f"{SUMMARY_HTML}<p>{i}</p>" for i in range(FIXTURE_CALLS)]
+    results.append(_result("clean_html", None, len(summaries), measure(
+        lambda: [clean_html(summary) for summary in summaries], repeat, max_seconds)))
+
+    for items in FEED_ITEMS:
+        content = make_feed(items)
+        results.append(_result(f"parse_feed/{items}", None, items, measure(
+            lambda: parse_feed(content), repeat, max_seconds)))
+
+    top_articles = make_corpus(20, seed=1)
+    for provider, build in (("gemini", AISummarizer._build_gemini_prompt),
+                            ("ollama", AISummarizer._build_ollama_prompt)):
+        results.append(_result(f"build_prompt/{provider}", None, FIXTURE_CALLS, measure(
+            lambda: [build(top_articles) for _ in range(FIXTURE_CALLS)], repeat, max_seconds)))
+    return results
+
+def result_key(result: Dict[str, Any]) -> str:
+    """ベースラインと突き合わせるキー（例: content_filter/10000）"""
+    return result['name'] if result['size'] is None else f"{result['name']}/{result['size']}"
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> Dict[str, Any]:
+    """ベースラインとの比較（ratio は今回 / ベースラインの最小値。1より大きいほど遅い）"""
+    comparison = {}
+    for key, result in results.items():
+        base = baseline['results'].get(key)
+        if base is None or not base['min_seconds']:
+            continue
+        ratio = result['min_seconds'] / base['min_seconds']
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "ok"
+        comparison[key] = {'baseline_seconds': base['min_seconds'], 'ratio': ratio, 'status': status}
+    return comparison
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """エントリーポイント"""
+    parser = argparse.ArgumentParser(description="合成コーパスのマイクロベンチマーク")
+    parser.add_argument("--sizes", type=int, nargs='+', default=DEFAULT_SIZES, help="コーパスの記事数")
+    parser.add_argument("--repeat", type=int, default=5, help="ケースごとの最大計測回数")
+    parser.add_argument("--max-seconds", type=float, default=5.0,
+                        help="ケースごとの計測時間の目安（超えたら --repeat 未満でも打ち切る）")
+    parser.add_argument("--baseline", help="比較するベースラインのJSON")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="遅くなったとみなす割合（0.25 = ベースラインの最小値より25%%以上遅い）")
+    parser.add_argument("--save-baseline", help="結果をベースラインとして保存するパス")
+    parser.add_argument("--output", help="結果のJSONを保存するパス")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    args = parser.parse_args(argv)
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="bench_micro_") as tmp:
+        # 設定のスナップショット・履歴DBは一時ディレクトリに作る
+        os.environ['NEWS_PUBLISHER_DATA_DIR'] = tmp
+        with contextlib.redirect_stdout(io.StringIO()):
+            for size in args.sizes:
+                results.extend(bench_corpus(size, Path(tmp), args.repeat, args.max_seconds))
+            results.extend(bench_fixtures(args.repeat, args.max_seconds))
+
+    report: Dict[str, Any] = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'sizes': args.sizes,
+        'results': {result_key(r): r for r in results},
+    }
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        report['baseline'] = {'path': args.baseline, 'created_at': baseline.get('created_at'),
+                              'threshold': args.threshold}
+        report['comparison'] = compare(report['results'], baseline, args.threshold)
+    regressions = [key for key, c in report.get('comparison', {}).items() if c['status'] == "regression"]
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            Path(path).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 1 if regressions else 0
+
+    print(f"📊 マイクロベンチマーク（Python {report['python']}、中央値。ベースラインとの比は最小値）")
+    comparison = report.get('comparison', {})
+    for key, r in report['results'].items():
+        line = f"  {key:32s} {r['median_seconds'] * 1000:10.2f}ms {r['items_per_second']:>14,.0f} 件/秒  ({r['runs']}回)"
+        if key in comparison:
+            c = comparison[key]
+            mark = {"regression": "🔴", "improvement": "🟢", "ok": "  "}[c['status']]
+            line += f"  {mark} x{c['ratio']:.2f}"
+        print(line)
+    if args.baseline:
+        if regressions:
+            print(f"⚠️  ベースラインより{args.threshold:.0%}以上遅いケース: {', '.join(regressions)}")
+        else:
+            print(f"✅ ベースラインより{args.threshold:.0%}以上遅いケースはありません")
+    if args.save_baseline:
+        print(f"💾 ベースラインを保存しました: {args.save_baseline}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+パイプライン全体のベンチマーク
+
+フェイクサーバー（src/devtools/fake_services.py）を起動し、外部サービスに一切接続せずに
+NewsPublisher.run を繰り返し実行して、1回あたりのレイテンシとスループットを計測する。
+
+--mode both では同期モードと非同期モード（NewsPublisher.run(use_async=True)）を同じ条件で計測して比較する。
+
+使い方:
+    python benchmarks/bench_pipeline.py --runs 5 --latency-ms 50
+    python benchmarks/bench_pipeline.py --runs 5 --route-latency gemini=1500 --json
+    python benchmarks/bench_pipeline.py --runs 5 --route-latency feeds=300 --route-latency nitter=300 --mode both
+"""
+
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from devtools.fake_services import FakeServices, build_arg_parser, settings_from_args
+
+def _prepare_env(base_url: str, data_dir: str) -> None:
+    """パイプラインをフェイクサーバーに向ける環境変数を設定"""
+    os.environ.update({
+        'ENDPOINT_PROFILE': 'fake',
+        'FAKE_SERVICES_URL': base_url,
+        'NEWS_PUBLISHER_DATA_DIR': data_dir,
+        'HATENA_USERNAME': 'bench-user',
+        'HATENA_BLOG_ID': 'bench.example.com',
+        'HATENA_API_KEY': 'bench-key',
+        'GEMINI_API_KEY': 'bench-key',
+    })
+    # Issue作成は行わない
+    os.environ.pop('GITHUB_TOKEN', None)
+
+MODES = ("sync", "async")
+
+def run_once(use_llm: bool, use_async: bool = False) -> Dict[str, Any]:
+    """パイプラインを1回実行して所要時間を返す"""
+    from main import NewsPublisher
+
+    start = time.perf_counter()
+    exit_code = 0
+    try:
+        NewsPublisher(use_llm=use_llm).run(use_async=use_async)
+    except SystemExit as e:
+        exit_code = int(e.code or 0)
+    return {'seconds': time.perf_counter() - start, 'exit_code': exit_code}
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """計測結果を集計"""
+    seconds = sorted(r['seconds'] for r in results)
+    total = sum(seconds)
+    return {
+        'runs': len(seconds),
+        'failures': sum(1 for r in results if r['exit_code'] != 0),
+        'mean_seconds': statistics.mean(seconds),
+        'p50_seconds': statistics.median(seconds),
+        'max_seconds': seconds[-1],
+        'min_seconds': seconds[0],
+        'runs_per_minute': 60.0 * len(seconds) / total if total else 0.0,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """エントリーポイント"""
+    parser = build_arg_parser()
+    parser.description = "フェイクサーバーを使ったパイプライン全体のベンチマーク"
+    parser.set_defaults(port=0)
+    parser.add_argument("--runs", type=int, default=3, help="実行回数")
+    parser.add_argument("--no-llm", action="store_true", help="テンプレート生成で計測")
+    parser.add_argument("--json", action="store_true", help="結果をJSONで出力")
+    parser.add_argument("--mode", choices=MODES + ("both",), default="sync",
+                        help="同期 / 非同期モード（both は両方を交互に実行して比較）")
+    args = parser.parse_args(argv)
+
+    modes = MODES if args.mode == "both" else (args.mode,)
+    results: Dict[str, List[Dict[str, Any]]] = {mode: [] for mode in modes}
+    with FakeServices(args.host, args.port, settings_from_args(args)) as services:
+        for i in range(args.runs):
+            for mode in modes:
+                # 毎回空の状態から実行し、重複除外の影響を受けないようにする
+                # JSON出力時はパイプラインの進捗表示を捨てる
+                output = contextlib.redirect_stdout(io.StringIO()) if args.json else contextlib.nullcontext()
+                with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as data_dir, output:
+                    _prepare_env(services.url, data_dir)
+                    result = run_once(use_llm=not args.no_llm, use_async=mode == "async")
+                results[mode].append(result)
+                if not args.json:
+                    print(f"⏱️  run {i + 1}/{args.runs} [{mode}]: {result['seconds']:.3f}秒 "
+                          f"(exit={result['exit_code']})")
+
+        report: Dict[str, Any] = {
+            'mode': args.mode,
+            'requests': services.request_counts,
+            'injected_errors': services.error_counts,
+            'published_entries': len(services.entries),
+        }
+        if args.mode == "both":
+            report['summary'] = {mode: summarize(results[mode]) for mode in modes}
+            report['speedup'] = report['summary']['sync']['p50_seconds'] / report['summary']['async']['p50_seconds']
+        else:
+            report['summary'] = summarize(results[args.mode])
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    summaries = report['summary'] if args.mode == "both" else {args.mode: report['summary']}
+    for mode, summary in summaries.items():
+        print(f"\n📊 [{mode}] {summary['runs']}回実行 / 失敗 {summary['failures']}回")
+        print(f"  平均 {summary['mean_seconds']:.3f}秒 / 中央値 {summary['p50_seconds']:.3f}秒 / "
+              f"最大 {summary['max_seconds']:.3f}秒")
+        print(f"  スループット {summary['runs_per_minute']:.1f} 回/分")
+    if 'speedup' in report:
+        print(f"\n🚀 非同期モードの中央値は同期モードの {report['speedup']:.2f}倍速")
+    print(f"  リクエスト数: {report['requests']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,8 +5,16 @@ set -e  # エラー時に終了
 
 echo "🚀 AI News Publisher を開始します..."
 
+# --no-llm 指定時はGemini APIキー不要
+NO_LLM=false
+for arg in "$@"; do
+    if [ "$arg" = "--no-llm" ]; then
+        NO_LLM=true
+    fi
+done
+
 # 環境変数チェック
-if [ -z "$GEMINI_API_KEY" ]; then
+if [ "$NO_LLM" = false ] && [ -z "$GEMINI_API_KEY" ]; then
     echo "❌ GEMINI_API_KEY が設定されていません"
     echo "   .env ファイルを作成するか、環境変数を設定してください"
     exit 1
@@ -38,6 +46,6 @@ mkdir -p logs
 # メイン処理実行
 echo "🤖 処理を開始..."
 cd src
-python3 main.py
+python3 main.py "$@"
 
 echo "✅ 完了しました！"
\ No newline at end of file
@@ -1,7 +1,18 @@
+import asyncio
+import sys
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import List, Optional, Protocol, TypedDict, Any, Dict
+from typing import AsyncIterator, Callable, List, Optional, Protocol, Sequence, Tuple, TypedDict, Any, Dict
+
+import requests
+
+from utils.constants import DEFAULT_REQUEST_TIMEOUT, USER_AGENT
+from utils.http import get_session
+from utils.retry_policy import RetryPolicy, call_with_retry
+
+# フィード取得のリトライ方針（GETは冪等なのでタイムアウトも再試行）
+COLLECTOR_RETRY_POLICY = RetryPolicy(max_retries=2, base_delay=1.0, max_delay=10.0)
 
 class ConfigProtocol(Protocol):
     """設定オブジェクトのプロトコル定義"""
@@ -12,32 +23,146 @@ class KeywordsConfig(TypedDict):
     include_keywords: List[str]
     exclude_keywords: List[str]
 
+def _slotted(cls: type) -> type:
+    """dataclass を __slots__ 付きで作り直す（Python 3.10 以降の dataclass(slots=True) と同じ）
+    
+    インスタンスごとの __dict__ がなくなり、属性の読み書きも速くなる。
+    メソッドが作り直す前のクラスを参照している場合（frozen の __setattr__・引数なしの super() など）は、
+    作り直したクラスを参照するように置き換える。
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ('__dict__', '__weakref__')}
+    namespace['__slots__'] = names
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    for value in namespace.values():
+        for cell in getattr(getattr(value, '__func__', value), '__closure__', None) or ():
+            if cell.cell_contents is cls:
+                cell.cell_contents = slotted
+    return slotted
+
+def _validate_article(article: Any) -> None:
+    """Article・FrozenArticle の値の検証（型安全性のため）"""
+    if not isinstance(article.title, str) or not article.title.strip():
+        raise ValueError("title must be a non-empty string")
+    if not isinstance(article.url, str) or not article.url.strip():
+        raise ValueError("url must be a non-empty string")
+    if not isinstance(article.score, (int, float)) or article.score < 0:
+        raise ValueError("score must be a non-negative number")
+    if not isinstance(article.source, str) or not isinstance(article.category, str):
+        raise ValueError("source and category must be strings")
+
+@_slotted
 @dataclass
 class Article:
-    """記事データクラス"""
+    """記事データクラス
+    
+    大量に作るため __slots__ を使う（属性の追加はできない）。
+    category は収集元の種類（rss / twitter）。source・category は種類が少ないため、
+    同じ値の文字列を共有する（sys.intern）。
+    """
     title: str
     url: str
     summary: str
     published_date: Optional[datetime] = None
     source: str = ""
     score: float = 0.0
+    category: str = ""
     
     def __post_init__(self) -> None:
         """初期化後処理"""
         if self.published_date is None:
             self.published_date = datetime.now()
+        _validate_article(self)
+        self.source = sys.intern(self.source)
+        self.category = sys.intern(self.category)
+    
+    @classmethod
+    def trusted(cls, title: str, url: str, summary: str, published_date: Optional[datetime] = None,
+                source: str = "", score: float = 0.0, category: str = "") -> "Article":
+        """検証を省略して作成（自前のパーサーが検証済みの値から作る場合。通常の生成の半分以下の時間）
         
-        # 型安全性のための検証
-        if not isinstance(self.title, str) or not self.title.strip():
-            raise ValueError("title must be a non-empty string")
-        if not isinstance(self.url, str) or not self.url.strip():
-            raise ValueError("url must be a non-empty string")
-        if not isinstance(self.score, (int, float)) or self.score < 0:
-            raise ValueError("score must be a non-negative number")
+        title・url が空でない文字列であることは呼び出し側で保証する。
+        published_date が None の場合は現在時刻にする（まとめて作る場合は1度だけ取得した時刻を渡すと速い）。
+        """
+        article = object.__new__(cls)
+        article.title = title
+        article.url = url
+        article.summary = summary
+        article.published_date = published_date if published_date is not None else datetime.now()
+        article.source = sys.intern(source)
+        article.score = score
+        article.category = sys.intern(category)
+        return article
+    
+    def freeze(self) -> "FrozenArticle":
+        """変更できないコピー"""
+        return FrozenArticle.trusted(self.title, self.url, self.summary, self.published_date,
+                                     self.source, self.score, self.category)
+
+@_slotted
+@dataclass(frozen=True)
+class FrozenArticle:
+    """変更できない記事（候補プールなど、長く保持して共有する記事）
+    
+    項目は Article と同じでハッシュ可能。スコアを付ける場合は thaw() で Article に戻す。
+    frozen の検査を避けて値を設定するため、生成は Article より遅い（trusted() はその差が小さい）。
+    """
+    title: str
+    url: str
+    summary: str
+    published_date: Optional[datetime] = None
+    source: str = ""
+    score: float = 0.0
+    category: str = ""
+    
+    def __post_init__(self) -> None:
+        """初期化後処理"""
+        if self.published_date is None:
+            object.__setattr__(self, 'published_date', datetime.now())
+        _validate_article(self)
+        object.__setattr__(self, 'source', sys.intern(self.source))
+        object.__setattr__(self, 'category', sys.intern(self.category))
+    
+    @classmethod
+    def trusted(cls, title: str, url: str, summary: str, published_date: Optional[datetime] = None,
+                source: str = "", score: float = 0.0, category: str = "") -> "FrozenArticle":
+        """検証を省略して作成（Article.trusted と同じ）"""
+        # スロットのデスクリプタに直接設定する（object.__setattr__ の半分程度の時間）
+        set_title, set_url, set_summary, set_date, set_source, set_score, set_category = _FROZEN_SETTERS
+        article = object.__new__(cls)
+        set_title(article, title)
+        set_url(article, url)
+        set_summary(article, summary)
+        set_date(article, published_date if published_date is not None else datetime.now())
+        set_source(article, sys.intern(source))
+        set_score(article, score)
+        set_category(article, sys.intern(category))
+        return article
+    
+    def thaw(self) -> Article:
+        """変更できるコピー"""
+        return Article.trusted(self.title, self.url, self.summary, self.published_date,
+                               self.source, self.score, self.category)
+    
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, f.name) for f in fields(self))
+    
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        # frozen の __setattr__ を通さずに復元する
+        for f, value in zip(fields(self), state):
+            object.__setattr__(self, f.name, value)
+
+# FrozenArticle のスロットへの設定（項目の順）
+_FROZEN_SETTERS = tuple(FrozenArticle.__dict__[f.name].__set__ for f in fields(FrozenArticle))
 
 class BaseCollector(ABC):
     """記事収集の基底クラス"""
     
+    # 収集した記事の category
+    category = ""
+    
     def __init__(self, config: ConfigProtocol) -> None:
         self.config = config
     
@@ -46,6 +171,53 @@ class BaseCollector(ABC):
         """記事を収集する抽象メソッド"""
         pass
     
+    def fetch_jobs(self) -> List[Callable[[], List[Article]]]:
+        """収集単位（フィード・アカウントなど）ごとの取得処理
+        
+        各処理はエラーを自身で処理し、取得できなければ空リストを返す。
+        stream() はこれを並行して実行する（未対応のコレクターは collect() を1つの処理として扱う）。
+        """
+        return [self.collect]
+    
+    async def stream(self, limit: asyncio.Semaphore) -> AsyncIterator[Tuple[int, List[Article]]]:
+        """収集単位ごとの記事を、取得できた順に返す（キーワードフィルタ済み）
+        
+        取得処理は同期のHTTPクライアント（共有セッション）を使うため、スレッドで並行して実行する。
+        
+        Args:
+            limit: 同時に実行する取得処理の上限（複数のコレクターで共有する）
+        
+        Yields:
+            (fetch_jobs() での順番, 記事)
+        """
+        async def run(index: int, job: Callable[[], List[Article]]) -> Tuple[int, List[Article]]:
+            async with limit:
+                return index, await asyncio.to_thread(job)
+        
+        tasks = [asyncio.ensure_future(run(i, job)) for i, job in enumerate(self.fetch_jobs())]
+        try:
+            for future in asyncio.as_completed(tasks):
+                index, articles = await future
+                yield index, self.filter_by_keywords(articles)
+        finally:
+            # 呼び出し側が途中で止めた場合も、未完了の取得を残さない
+            for task in tasks:
+                task.cancel()
+    
+    def _http_get(self, url: str, timeout: float = DEFAULT_REQUEST_TIMEOUT,
+                  policy: Optional[RetryPolicy] = None) -> requests.Response:
+        """User-Agent付きでGETし、一時的な失敗はリトライする
+        
+        Raises:
+            requests.RequestException: リトライ後も取得できない場合
+        """
+        def fetch() -> requests.Response:
+            response = get_session().get(url, headers={'User-Agent': USER_AGENT}, timeout=timeout)
+            response.raise_for_status()
+            return response
+        
+        return call_with_retry(fetch, policy=policy or COLLECTOR_RETRY_POLICY)
+    
     def filter_by_keywords(self, articles: List[Article]) -> List[Article]:
         """キーワードフィルタリング
         
@@ -62,16 +234,10 @@ class BaseCollector(ABC):
             return []
             
         try:
-            keywords_config: Dict[str, Any] = self.config.keywords
-            include_keywords: List[str] = keywords_config.get('include_keywords', [])
-            exclude_keywords: List[str] = keywords_config.get('exclude_keywords', [])
-            
-            # 型チェック
-            if not isinstance(include_keywords, list):
-                raise ValueError("include_keywords must be a list")
-            if not isinstance(exclude_keywords, list):
-                raise ValueError("exclude_keywords must be a list")
-                
+            # 小文字化済みのキーワード（設定ファイルが変わるまで再計算しない）
+            compiled = self.config.compiled
+            include_keywords: Sequence[str] = compiled.include_keywords
+            exclude_keywords: Sequence[str] = compiled.exclude_keywords
         except (AttributeError, KeyError) as e:
             raise ValueError(f"Invalid keywords configuration: {e}")
         
@@ -84,13 +250,11 @@ class BaseCollector(ABC):
             text: str = f"{article.title} {article.summary}".lower()
             
             # 除外キーワードチェック
-            if any(exclude_kw.lower() in text for exclude_kw in exclude_keywords 
-                   if isinstance(exclude_kw, str)):
+            if any(exclude_kw in text for exclude_kw in exclude_keywords):
                 continue
             
             # 含有キーワードチェック
-            if any(include_kw.lower() in text for include_kw in include_keywords 
-                   if isinstance(include_kw, str)):
+            if any(include_kw in text for include_kw in include_keywords):
                 filtered_articles.append(article)
         
         return filtered_articles
\ No newline at end of file
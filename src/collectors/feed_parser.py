@@ -0,0 +1,194 @@
+"""
+フィードの解析
+
+feedparser による解析と要約のHTML除去は GIL を手放さない CPU 処理のため、フィード数が多いと
+取得を並行にしても解析がボトルネックになる。control.yml の feed_parsing.workers を指定すると、
+取得したフィードのバイト列をプロセスプールで解析する。
+
+    - ワーカーには bytes を渡し、記事は値だけのタプル（ParsedEntry）で受け取る
+      （feedparser の結果や Article をプロセス間で受け渡すより pickle が小さい）
+    - プールは最初に使うときに作り、プロセス内で使い回す（常駐モードでも作り直さない）
+    - まとめて解析するときは chunksize 件ずつワーカーに渡す
+    - min_feed_bytes 未満のフィードは、受け渡しの方が解析より高くつくため呼び出し元で解析する
+      （目安は python benchmarks/bench_feed_parsing.py で計測できる）
+
+ワーカーはスレッドを使う非同期モードとも併用するため、fork ではなく spawn で起動する。
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+
+from utils import metrics
+from utils.constants import (
+    FEED_PARSE_CHUNKSIZE, FEED_PARSE_MIN_BYTES, FEED_PARSE_WORKERS,
+    MAX_SUMMARY_LENGTH, RSS_MAX_ENTRIES
+)
+
+# (タイトル, URL, 要約（HTML除去済み）, 公開日時)
+ParsedEntry = Tuple[str, str, str, Optional[datetime]]
+
+@dataclass(frozen=True)
+class FeedParseSettings:
+    """フィード解析の設定（control.yml の feed_parsing）"""
+    workers: int = FEED_PARSE_WORKERS
+    min_feed_bytes: int = FEED_PARSE_MIN_BYTES
+    chunksize: int = FEED_PARSE_CHUNKSIZE
+
+    @property
+    def enabled(self) -> bool:
+        """プロセスプールで解析するか"""
+        return self.workers > 0
+
+    @classmethod
+    def from_control(cls, control: Mapping[str, Any]) -> "FeedParseSettings":
+        """control.yml の内容から作成
+
+        workers: "auto" は CPU 数、0 はプロセスプールを使わない。
+
+        Raises:
+            ValueError: 設定値が不正な場合
+        """
+        settings = control.get('feed_parsing') or {}
+        workers = settings.get('workers', FEED_PARSE_WORKERS)
+        try:
+            return cls(
+                workers=(os.cpu_count() or 1) if workers == 'auto' else max(0, int(workers)),
+                min_feed_bytes=max(0, int(settings.get('min_feed_bytes', FEED_PARSE_MIN_BYTES))),
+                chunksize=max(1, int(settings.get('chunksize', FEED_PARSE_CHUNKSIZE))),
+            )
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"control.ymlのfeed_parsing設定が不正です: {e}")
+
+def clean_html(text: str) -> str:
+    """HTMLタグを除去し、空白をまとめて MAX_SUMMARY_LENGTH 文字までにする"""
+    if not text:
+        return ""
+
+    from bs4 import BeautifulSoup
+    cleaned = BeautifulSoup(text, 'html.parser').get_text().strip()
+
+    # 改行・連続する空白を一つにまとめる
+    cleaned = re.sub(r'\s+', ' ', cleaned)
+    return cleaned[:MAX_SUMMARY_LENGTH]
+
+def parse_feed(content: bytes) -> List[ParsedEntry]:
+    """フィードを解析して最新 RSS_MAX_ENTRIES 件の記事を返す
+
+    ワーカープロセスで実行するため、モジュールの最上位に置く（pickle できる）。
+    解析できない記事と、タイトル・URLが空の記事は飛ばす（呼び出し側は Article.trusted で検証を省略する）。
+    """
+    import feedparser
+
+    try:
+        feed = feedparser.parse(content)
+    except Exception as e:
+        print(f"フィード解析エラー: {e}")
+        return []
+
+    entries: List[ParsedEntry] = []
+    for entry in feed.entries[:RSS_MAX_ENTRIES]:
+        try:
+            # 公開日時の解析
+            published_date = None
+            if getattr(entry, 'published_parsed', None):
+                published_date = datetime(*entry.published_parsed[:6])
+            elif getattr(entry, 'updated_parsed', None):
+                published_date = datetime(*entry.updated_parsed[:6])
+
+            summary = ""
+            if hasattr(entry, 'summary'):
+                summary = entry.summary
+            elif hasattr(entry, 'description'):
+                summary = entry.description
+
+            title, link = entry.title, entry.link
+            if not title.strip() or not link.strip():
+                continue
+            entries.append((title, link, clean_html(summary), published_date))
+        except Exception as e:
+            print(f"記事解析エラー: {e}")
+    return entries
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_lock = threading.Lock()
+
+def get_parse_pool(workers: int) -> ProcessPoolExecutor:
+    """共有のプロセスプールを取得（ワーカー数が変わった場合だけ作り直す）"""
+    global _pool, _pool_workers
+    with _lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            import multiprocessing
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_workers = workers
+        return _pool
+
+def close_parse_pool() -> None:
+    """プロセスプールを終了（次に使うときに作り直す）"""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+def _discard_broken_pool(pool: ProcessPoolExecutor, error: BrokenProcessPool) -> None:
+    """異常終了したプールを捨てる（次に使うときに作り直す）"""
+    global _pool
+    print(f"⚠️  フィード解析プロセスが異常終了したため、このプロセスで解析します: {error}")
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+def parse_feeds(contents: Sequence[bytes], settings: FeedParseSettings) -> List[List[ParsedEntry]]:
+    """複数のフィードを解析（結果は contents と同じ順）
+
+    min_feed_bytes 以上のフィードはプロセスプールに chunksize 件ずつ渡し、
+    ワーカーが解析している間に小さいフィードをこのプロセスで解析する。
+    """
+    results: List[Optional[List[ParsedEntry]]] = [None] * len(contents)
+    offload = [i for i, content in enumerate(contents)
+               if settings.enabled and len(content) >= settings.min_feed_bytes]
+
+    pending = None
+    if offload:
+        pool = get_parse_pool(settings.workers)
+        try:
+            pending = pool.map(parse_feed, [contents[i] for i in offload], chunksize=settings.chunksize)
+        except BrokenProcessPool as e:
+            _discard_broken_pool(pool, e)
+
+    offload_set = set(offload)
+    inline = [i for i in range(len(contents)) if i not in offload_set]
+    if inline:
+        with metrics.span("feed_parse", mode="inline"):
+            for i in inline:
+                results[i] = parse_feed(contents[i])
+    metrics.count("feeds_parsed_total", len(inline), mode="inline")
+    metrics.count("feeds_parsed_total", len(offload), mode="pool")
+
+    if pending is not None:
+        try:
+            for i, entries in zip(offload, pending):
+                results[i] = entries
+        except BrokenProcessPool as e:
+            _discard_broken_pool(pool, e)
+
+    # ワーカーで解析できなかったフィード
+    return [entries if entries is not None else parse_feed(contents[i])
+            for i, entries in enumerate(results)]
+
+def parse_feed_content(content: bytes, settings: FeedParseSettings) -> List[ParsedEntry]:
+    """1つのフィードを解析（大きいフィードはプロセスプールに渡して結果を待つ）
+
+    非同期モードの取得スレッドから呼び出すと、各スレッドの解析が別プロセスで並列に進む。
+    """
+    return parse_feeds([content], settings)[0]
@@ -1,7 +1,7 @@
-import feedparser
-import requests
 from datetime import datetime
-from typing import List
+from functools import partial
+from typing import Callable, List, Optional
+from urllib.parse import quote
 import sys
 import os
 
@@ -9,98 +9,89 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from collectors.base_collector import BaseCollector, Article
+from collectors.feed_parser import FeedParseSettings, ParsedEntry, parse_feed_content, parse_feeds
 
 class RSSCollector(BaseCollector):
+    category = "rss"
+    
     def __init__(self, config):
         super().__init__(config)
         self.sources = config.sources.get('rss_sources', [])
+        # endpoints.yml の rss_base_url が設定されていればフィードの取得先を置き換える
+        self.rss_base_url = config.endpoints.get('rss_base_url')
+        self.parse_settings = FeedParseSettings.from_control(config.control)
     
     def collect(self) -> List[Article]:
         """RSS記事を収集"""
-        all_articles = []
-        
-        for source in self.sources:
-            if not source.get('enabled', True):
-                continue
-                
-            try:
-                articles = self._fetch_rss(source)
-                all_articles.extend(articles)
-            except Exception as e:
-                print(f"RSS収集エラー [{source['name']}]: {e}")
-                continue
+        if self.parse_settings.enabled:
+            all_articles = self._collect_batch()
+        else:
+            all_articles = []
+            for job in self.fetch_jobs():
+                all_articles.extend(job())
         
         # キーワードフィルタリング
         filtered_articles = self.filter_by_keywords(all_articles)
         
         return filtered_articles
     
+    def fetch_jobs(self) -> List[Callable[[], List[Article]]]:
+        """有効なフィードごとの取得処理"""
+        return [partial(self._collect_source, source) for source in self._enabled_sources()]
+    
+    def _enabled_sources(self) -> List[dict]:
+        return [source for source in self.sources if source.get('enabled', True)]
+    
+    def _collect_batch(self) -> List[Article]:
+        """全フィードを取得してからまとめて解析（大きいフィードはプロセスプールで並列に解析）"""
+        fetched = []
+        for source in self._enabled_sources():
+            content = self._fetch_feed(source)
+            if content is not None:
+                fetched.append((source, content))
+        
+        parsed = parse_feeds([content for _, content in fetched], self.parse_settings)
+        
+        articles = []
+        for (source, _), entries in zip(fetched, parsed):
+            articles.extend(self._to_articles(source, entries))
+        return articles
+    
+    def _collect_source(self, source) -> List[Article]:
+        """1つのフィードから記事を取得（失敗時は空リスト）"""
+        try:
+            return self._fetch_rss(source)
+        except Exception as e:
+            print(f"RSS収集エラー [{source['name']}]: {e}")
+            return []
+    
     def _fetch_rss(self, source) -> List[Article]:
         """単一のRSSフィードから記事を取得"""
+        content = self._fetch_feed(source)
+        if content is None:
+            return []
+        return self._to_articles(source, parse_feed_content(content, self.parse_settings))
+    
+    def _fetch_feed(self, source) -> Optional[bytes]:
+        """フィードを取得（失敗時は None）"""
         try:
-            # User-Agentを設定してリクエスト
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(source['url'], headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            # feedparserでパース
-            feed = feedparser.parse(response.content)
-            
-            articles = []
-            for entry in feed.entries[:10]:  # 最新10件まで
-                try:
-                    # 公開日時の解析
-                    published_date = None
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        published_date = datetime(*entry.published_parsed[:6])
-                    elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                        published_date = datetime(*entry.updated_parsed[:6])
-                    
-                    # 要約の取得
-                    summary = ""
-                    if hasattr(entry, 'summary'):
-                        summary = entry.summary
-                    elif hasattr(entry, 'description'):
-                        summary = entry.description
-                    
-                    # HTMLタグの除去
-                    summary = self._clean_html(summary)
-                    
-                    article = Article(
-                        title=entry.title,
-                        url=entry.link,
-                        summary=summary,
-                        published_date=published_date,
-                        source=source['name']
-                    )
-                    
-                    articles.append(article)
-                    
-                except Exception as e:
-                    print(f"記事解析エラー: {e}")
-                    continue
-            
-            return articles
-            
+            # User-Agentを設定してリクエスト（一時的な失敗はリトライ）
+            return self._http_get(self._feed_url(source)).content
         except Exception as e:
             print(f"RSS取得エラー [{source['name']}]: {e}")
-            return []
+            return None
     
-    def _clean_html(self, text):
-        """HTMLタグを除去"""
-        if not text:
-            return ""
-        
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(text, 'html.parser')
-        cleaned = soup.get_text().strip()
-        
-        # 複数の改行を一つにまとめる
-        import re
-        cleaned = re.sub(r'\n+', ' ', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-        
-        return cleaned[:200]  # 200文字まで
\ No newline at end of file
+    def _to_articles(self, source, entries: List[ParsedEntry]) -> List[Article]:
+        """解析した記事を Article に変換（parse_feed が検証済みのため検証を省略する）"""
+        now = datetime.now()
+        name = source['name']
+        return [
+            Article.trusted(title, url, summary, published_date or now, name, category=self.category)
+            for title, url, summary, published_date in entries
+        ]
+    
+    def _feed_url(self, source) -> str:
+        """フィードの取得先URLを決定"""
+        if self.rss_base_url:
+            return f"{self.rss_base_url.rstrip('/')}/{quote(source['name'], safe='')}"
+        return source['url']
@@ -1,7 +1,6 @@
-import requests
-import feedparser
 from datetime import datetime, timedelta
-from typing import List
+from functools import partial
+from typing import Callable, List
 import time
 import sys
 import os
@@ -10,44 +9,55 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from collectors.base_collector import BaseCollector, Article
+from utils.retry_policy import RetryPolicy
 from utils.constants import (
-    NITTER_INSTANCES, USER_AGENT, RSS_MAX_ENTRIES, 
+    NITTER_INSTANCES, NITTER_REQUEST_TIMEOUT, RSS_MAX_ENTRIES, 
     MAX_TITLE_LENGTH, MAX_SUMMARY_LENGTH, AI_RELATED_KEYWORDS,
     HIGH_IMPORTANCE_KEYWORDS, MEDIUM_IMPORTANCE_KEYWORDS,
     BASE_SCORE, HIGH_IMPORTANCE_BONUS, MEDIUM_IMPORTANCE_BONUS, MAX_SCORE
 )
 from utils.logger import get_logger
 
+NITTER_RETRY_POLICY = RetryPolicy(max_retries=1, base_delay=1.0, max_delay=5.0)
+
 class TwitterCollector(BaseCollector):
+    category = "twitter"
+    
     def __init__(self, config):
         super().__init__(config)
         self.logger = get_logger("twitter_collector")
         self.accounts = config.sources.get('twitter_accounts', [])
         self.search_hours_back = config.sources.get('search_time_range', {}).get('hours_back', 20)
-        self.nitter_instances = NITTER_INSTANCES
+        self.nitter_instances = config.endpoints.get('nitter_instances') or NITTER_INSTANCES
     
     def collect(self) -> List[Article]:
         """Twitter情報を収集"""
         all_articles = []
         
-        for account in self.accounts:
-            if not account.get('enabled', True):
-                continue
-            
-            try:
-                articles = self._search_account_posts(account)
-                all_articles.extend(articles)
-            except Exception as e:
-                print(f"Twitter収集エラー [{account['account']}]: {e}")
-                continue
+        for job in self.fetch_jobs():
+            all_articles.extend(job())
         
         # キーワードフィルタリング
         filtered_articles = self.filter_by_keywords(all_articles)
         
         return filtered_articles
     
+    def fetch_jobs(self) -> List[Callable[[], List[Article]]]:
+        """有効なアカウントごとの取得処理"""
+        return [partial(self._collect_account, account) for account in self.accounts if account.get('enabled', True)]
+    
+    def _collect_account(self, account) -> List[Article]:
+        """1つのアカウントの投稿を取得（失敗時は空リスト）"""
+        try:
+            return self._search_account_posts(account)
+        except Exception as e:
+            print(f"Twitter収集エラー [{account['account']}]: {e}")
+            return []
+    
     def _search_account_posts(self, account) -> List[Article]:
         """nitter RSS経由でTwitter投稿を取得"""
+        import feedparser
+        
         account_name = account['account']
         display_name = account.get('display_name', account_name)
         
@@ -56,11 +66,9 @@ class TwitterCollector(BaseCollector):
             try:
                 rss_url = f"{nitter_base}/{account_name}/rss"
                 
-                # User-Agentを設定してリクエスト
-                headers = {'User-Agent': USER_AGENT}
-                
-                response = requests.get(rss_url, headers=headers, timeout=10)
-                response.raise_for_status()
+                # 他のインスタンスへのフォールバックがあるのでリトライは1回まで
+                response = self._http_get(rss_url, timeout=NITTER_REQUEST_TIMEOUT,
+                                          policy=NITTER_RETRY_POLICY)
                 
                 # RSS解析
                 feed = feedparser.parse(response.content)
@@ -120,7 +128,8 @@ class TwitterCollector(BaseCollector):
                     summary=summary[:200],    # 要約を200文字に制限
                     published_date=published_date,
                     source=f"Twitter - {display_name}",
-                    score=score
+                    score=score,
+                    category=self.category
                 )
                 
                 articles.append(article)
@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+外部サービスのローカル代替サーバー
+
+RSS / nitter フィード、はてなブログ AtomPub、Gemini・ollama の生成APIを
+1つのHTTPサーバーで模擬する。遅延とエラー率を設定できるため、
+NewsPublisher.run 全体のスループット・レイテンシをオフラインで再現性よく計測できる。
+
+使い方:
+    python src/devtools/fake_services.py --port 8765 --latency-ms 50 --error-rate 0.05
+    ENDPOINT_PROFILE=fake python src/main.py
+"""
+
+import argparse
+import base64
+import json
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+from xml.etree.ElementTree import fromstring
+from xml.sax.saxutils import escape
+
+import yaml
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+ROUTES = ("feeds", "nitter", "hatena", "gemini", "ollama")
+
+@dataclass
+class FakeServiceSettings:
+    """フェイクサーバーの挙動設定
+
+    Attributes:
+        latency_ms: 全ルート共通の応答遅延（ミリ秒）
+        jitter_ms: 遅延に加える一様乱数の幅（ミリ秒）
+        error_rate: 503 を返す確率（0.0〜1.0）
+        route_latency_ms: ルートごとの遅延（feeds/nitter/hatena/gemini/ollama）
+        route_error_rate: ルートごとのエラー率
+        items_per_feed: 1フィードあたりの記事数
+        unique_urls: Trueなら取得ごとに異なる記事URLを返す（重複除外を回避する負荷試験用）
+        seed: 乱数シード
+    """
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    route_latency_ms: Dict[str, float] = field(default_factory=dict)
+    route_error_rate: Dict[str, float] = field(default_factory=dict)
+    items_per_feed: int = 10
+    unique_urls: bool = False
+    seed: int = 0
+
+    def latency_for(self, route: str) -> float:
+        """ルートの遅延（秒）"""
+        return self.route_latency_ms.get(route, self.latency_ms) / 1000.0
+
+    def error_rate_for(self, route: str) -> float:
+        """ルートのエラー率"""
+        return self.route_error_rate.get(route, self.error_rate)
+
+def load_fixture_items() -> List[Dict[str, str]]:
+    """フィード記事のフィクスチャを読み込み"""
+    with open(FIXTURES_DIR / "feed_items.yml", 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)['items']
+
+def _rfc822(dt: datetime) -> str:
+    """RSS用の日付文字列"""
+    return format_datetime(dt, usegmt=True)
+
+def _atom_date(dt: datetime) -> str:
+    """Atom用の日付文字列"""
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+class FakeServices:
+    """フェイクサーバー本体（スレッドで起動・停止できる）"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765,
+                 settings: Optional[FakeServiceSettings] = None) -> None:
+        self.settings = settings or FakeServiceSettings()
+        self.items = load_fixture_items()
+        self._rng = random.Random(self.settings.seed)
+        self._lock = threading.Lock()
+        self._fetch_counter = 0
+        self.request_counts: Dict[str, int] = {route: 0 for route in ROUTES}
+        self.error_counts: Dict[str, int] = {route: 0 for route in ROUTES}
+        self.entries: List[Dict[str, Any]] = []
+
+        self.httpd = ThreadingHTTPServer((host, port), _FakeServiceHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.services = self  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """サーバーのベースURL"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeServices':
+        """バックグラウンドスレッドで起動"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'FakeServices':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def before_response(self, route: str) -> bool:
+        """遅延を入れ、エラーを返すべきならFalseを返す"""
+        with self._lock:
+            self.request_counts[route] += 1
+            jitter = self._rng.uniform(0, self.settings.jitter_ms / 1000.0)
+            failed = self._rng.random() < self.settings.error_rate_for(route)
+            if failed:
+                self.error_counts[route] += 1
+
+        delay = self.settings.latency_for(route) + jitter
+        if delay > 0:
+            time.sleep(delay)
+        return not failed
+
+    # ---- フィード ----
+
+    def _pick_items(self, key: str) -> List[Tuple[int, Dict[str, str]]]:
+        """パスごとに決まった順序で記事を選ぶ"""
+        order = list(range(len(self.items)))
+        random.Random(f"{self.settings.seed}:{key}").shuffle(order)
+        count = self.settings.items_per_feed
+        return [(order[i % len(order)], self.items[order[i % len(order)]]) for i in range(count)]
+
+    def _next_fetch_id(self) -> int:
+        with self._lock:
+            self._fetch_counter += 1
+            return self._fetch_counter
+
+    def render_feed(self, name: str) -> str:
+        """RSSフィードを生成"""
+        now = datetime.now(timezone.utc)
+        fetch_id = self._next_fetch_id() if self.settings.unique_urls else 0
+        slug = re.sub(r'[^0-9A-Za-z]+', '-', name).strip('-') or 'feed'
+        items = []
+        for i, (index, item) in enumerate(self._pick_items(name)):
+            link = f"{self.url}/articles/{slug}/{index}"
+            if fetch_id:
+                link += f"?fetch={fetch_id}"
+            items.append(f"""    <item>
+      <title>{escape(item['title'])}</title>
+      <link>{escape(link)}</link>
+      <description>{escape('<p>' + item['summary'] + '</p>')}</description>
+      <pubDate>{_rfc822(now - timedelta(minutes=30 * (i + 1)))}</pubDate>
+    </item>""")
+        return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>{escape(name)}</title>
+    <link>{self.url}/feeds/{escape(slug)}</link>
+    <description>fake feed</description>
+{chr(10).join(items)}
+  </channel>
+</rss>"""
+
+    def render_nitter_feed(self, account: str) -> str:
+        """nitter形式のRSSを生成"""
+        now = datetime.now(timezone.utc)
+        fetch_id = self._next_fetch_id() if self.settings.unique_urls else 0
+        items = []
+        for i, (index, item) in enumerate(self._pick_items(f"nitter:{account}")):
+            status_id = 1000000 + index * 100 + i + fetch_id * 10000
+            items.append(f"""    <item>
+      <title>{escape(item['title'])}</title>
+      <link>https://x.com/{escape(account)}/status/{status_id}</link>
+      <description>{escape(item['summary'])}</description>
+      <pubDate>{_rfc822(now - timedelta(minutes=20 * (i + 1)))}</pubDate>
+    </item>""")
+        return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>{escape(account)} / X</title>
+    <link>{self.url}/nitter/{escape(account)}</link>
+    <description>fake nitter feed</description>
+{chr(10).join(items)}
+  </channel>
+</rss>"""
+
+    # ---- はてなブログ AtomPub ----
+
+    def entry_xml(self, base: str, entry: Dict[str, Any], root: bool = True) -> str:
+        """エントリのAtom XMLを生成"""
+        edit_url = f"{base}/atom/entry/{entry['id']}"
+        alternate_url = f"{self.url}/blog/entry/{entry['id']}"
+        xmlns = f' xmlns="{ATOM_NS}"' if root else ""
+        header = '<?xml version="1.0" encoding="utf-8"?>\n' if root else ""
+        return f"""{header}<entry{xmlns}>
+  <id>tag:fake-hatena,{entry['id']}</id>
+  <link rel="edit" href="{escape(edit_url)}"/>
+  <link rel="alternate" type="text/html" href="{escape(alternate_url)}"/>
+  <title>{escape(entry['title'])}</title>
+  <updated>{entry['updated']}</updated>
+  <content type="text/x-markdown">{escape(entry['content'])}</content>
+  <category term="{escape(entry['category'])}"/>
+</entry>"""
+
+    def render_collection(self, base: str) -> str:
+        """エントリ一覧フィードを生成（新しい順）"""
+        with self._lock:
+            entries = list(reversed(self.entries))
+        body = "\n".join(self.entry_xml(base, entry, root=False) for entry in entries[:10])
+        return f"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="{ATOM_NS}">
+  <title>fake hatena blog</title>
+  <link rel="first" href="{escape(base)}/atom/entry"/>
+{body}
+</feed>"""
+
+    def save_entry(self, body: bytes, entry_id: Optional[int] = None) -> Dict[str, Any]:
+        """AtomエントリXMLを解析して保存
+
+        Raises:
+            ValueError: XMLが不正な場合
+        """
+        root = fromstring(body.decode('utf-8'))
+        ns = {'atom': ATOM_NS}
+        title = root.findtext('atom:title', default='', namespaces=ns)
+        content = root.findtext('atom:content', default='', namespaces=ns)
+        category_el = root.find('atom:category', ns)
+        category = category_el.get('term', '') if category_el is not None else ''
+        if not title:
+            raise ValueError("title is required")
+
+        with self._lock:
+            if entry_id is None:
+                entry = {'id': len(self.entries) + 1}
+                self.entries.append(entry)
+            else:
+                matches = [e for e in self.entries if e['id'] == entry_id]
+                if not matches:
+                    raise KeyError(entry_id)
+                entry = matches[0]
+            entry.update({
+                'title': title,
+                'content': content,
+                'category': category,
+                'updated': _atom_date(datetime.now(timezone.utc)),
+            })
+            return dict(entry)
+
+    def find_entry(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        """IDでエントリを取得"""
+        with self._lock:
+            for entry in self.entries:
+                if entry['id'] == entry_id:
+                    return dict(entry)
+        return None
+
+    # ---- 生成API ----
+
+    def generate_text(self, prompt: str) -> str:
+        """プロンプト中の記事タイトルから決定的に記事本文を作る"""
+        titles = re.findall(r'タイトル:\s*(.+)', prompt)
+        if not titles:
+            titles = re.findall(r'^-\s*(.+?):', prompt, flags=re.MULTILINE)
+        urls = re.findall(r'URL:\s*(\S+)', prompt)
+        date_match = re.search(r'(\d{4}/\d{2}/\d{2})', prompt)
+        date = date_match.group(1) if date_match else datetime.now().strftime('%Y/%m/%d')
+
+        sections = []
+        for i, title in enumerate(titles or ["今日のAIニュース"]):
+            url = urls[i] if i < len(urls) else ""
+            sections.append(f"## {title.strip()}\n\n注目のニュースですね。詳しくは元記事をどうぞ。\n\n{url}".rstrip())
+
+        return (
+            f"# 今日のAIニュース（{date}）\n\n"
+            "今日もAI関連で面白いニュースがいくつか出てきたので、気になったものをピックアップしてみました。\n\n"
+            + "\n\n".join(sections)
+            + "\n\n## 個人的に気になったポイント\n\n- 各社のアップデートが続いていますね\n"
+        )
+
+class _FakeServiceHandler(BaseHTTPRequestHandler):
+    """ルーティングを行うリクエストハンドラー"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeServices/1.0"
+    # ヘッダーと本文を別々に送るため、keep-alive接続で遅延ACKを待たないようにする
+    disable_nagle_algorithm = True
+
+    @property
+    def services(self) -> FakeServices:
+        return self.server.services  # type: ignore[attr-defined]
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """アクセスログは出力しない"""
+        pass
+
+    # ---- 共通 ----
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, body: str, content_type: str,
+              headers: Optional[Dict[str, str]] = None) -> None:
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        self._send(status, json.dumps(payload, ensure_ascii=False), 'application/json; charset=utf-8')
+
+    def _send_unavailable(self) -> None:
+        self._send(503, "service unavailable (injected)", 'text/plain; charset=utf-8',
+                   {'Retry-After': '1'})
+
+    def _route(self) -> Tuple[str, List[str]]:
+        path = urlparse(self.path).path
+        parts = [unquote(p) for p in path.strip('/').split('/') if p]
+        if not parts:
+            return "", []
+        if parts[0] == 'v1beta' or ':generateContent' in path:
+            return "gemini", parts
+        if parts[:2] == ['api', 'generate']:
+            return "ollama", parts
+        return parts[0], parts[1:]
+
+    # ---- HTTPメソッド ----
+
+    def do_GET(self) -> None:
+        route, parts = self._route()
+        if route not in ROUTES:
+            self._send(404, "not found", 'text/plain')
+            return
+        if not self.services.before_response(route):
+            self._send_unavailable()
+            return
+
+        if route == "feeds" and parts:
+            self._send(200, self.services.render_feed(parts[0]), 'application/rss+xml; charset=utf-8')
+        elif route == "nitter" and len(parts) >= 2 and parts[1] == 'rss':
+            self._send(200, self.services.render_nitter_feed(parts[0]), 'application/rss+xml; charset=utf-8')
+        elif route == "hatena":
+            self._hatena_get(parts)
+        else:
+            self._send(404, "not found", 'text/plain')
+
+    def do_POST(self) -> None:
+        route, parts = self._route()
+        body = self._read_body()
+        if route not in ROUTES:
+            self._send(404, "not found", 'text/plain')
+            return
+        if not self.services.before_response(route):
+            self._send_unavailable()
+            return
+
+        if route == "hatena":
+            self._hatena_post(parts, body)
+        elif route == "gemini":
+            self._gemini_generate(body)
+        elif route == "ollama":
+            self._ollama_generate(body)
+        else:
+            self._send(405, "method not allowed", 'text/plain')
+
+    def do_PUT(self) -> None:
+        route, parts = self._route()
+        body = self._read_body()
+        if route != "hatena":
+            self._send(405, "method not allowed", 'text/plain')
+            return
+        if not self.services.before_response(route):
+            self._send_unavailable()
+            return
+        self._hatena_put(parts, body)
+
+    # ---- はてなブログ ----
+
+    def _hatena_base(self, parts: List[str]) -> str:
+        return f"{self.services.url}/hatena/{parts[0]}/{parts[1]}"
+
+    def _hatena_authorized(self) -> bool:
+        auth = self.headers.get('Authorization', '')
+        if not auth.startswith('Basic '):
+            return False
+        try:
+            user, _, key = base64.b64decode(auth[6:]).decode('utf-8').partition(':')
+        except Exception:
+            return False
+        return bool(user and key)
+
+    def _hatena_check(self, parts: List[str]) -> bool:
+        """パスと認証を確認し、問題があれば応答してFalseを返す"""
+        if len(parts) < 4 or parts[2:4] != ['atom', 'entry']:
+            self._send(404, "not found", 'text/plain')
+            return False
+        if not self._hatena_authorized():
+            self._send(401, "unauthorized", 'text/plain', {'WWW-Authenticate': 'Basic realm="fake"'})
+            return False
+        return True
+
+    def _hatena_get(self, parts: List[str]) -> None:
+        if not self._hatena_check(parts):
+            return
+        base = self._hatena_base(parts)
+        if len(parts) == 4:
+            self._send(200, self.services.render_collection(base), 'application/atom+xml; charset=utf-8')
+            return
+        entry = self.services.find_entry(int(parts[4])) if parts[4].isdigit() else None
+        if entry is None:
+            self._send(404, "entry not found", 'text/plain')
+            return
+        self._send(200, self.services.entry_xml(base, entry), 'application/atom+xml; charset=utf-8')
+
+    def _hatena_post(self, parts: List[str], body: bytes) -> None:
+        if not self._hatena_check(parts):
+            return
+        if len(parts) != 4:
+            self._send(405, "method not allowed", 'text/plain')
+            return
+        if not self.headers.get('Content-Type', '').startswith('application/atom+xml'):
+            self._send(415, "Content-Type must be application/atom+xml", 'text/plain')
+            return
+        try:
+            entry = self.services.save_entry(body)
+        except Exception as e:
+            self._send(400, f"invalid entry: {e}", 'text/plain')
+            return
+        base = self._hatena_base(parts)
+        self._send(201, self.services.entry_xml(base, entry), 'application/atom+xml; charset=utf-8',
+                   {'Location': f"{base}/atom/entry/{entry['id']}"})
+
+    def _hatena_put(self, parts: List[str], body: bytes) -> None:
+        if not self._hatena_check(parts):
+            return
+        if len(parts) != 5 or not parts[4].isdigit():
+            self._send(405, "method not allowed", 'text/plain')
+            return
+        try:
+            entry = self.services.save_entry(body, int(parts[4]))
+        except KeyError:
+            self._send(404, "entry not found", 'text/plain')
+            return
+        except Exception as e:
+            self._send(400, f"invalid entry: {e}", 'text/plain')
+            return
+        self._send(200, self.services.entry_xml(self._hatena_base(parts), entry),
+                   'application/atom+xml; charset=utf-8')
+
+    # ---- 生成API ----
+
+    def _gemini_generate(self, body: bytes) -> None:
+        try:
+            payload = json.loads(body or b"{}")
+            prompt = "".join(
+                part.get('text', '')
+                for content in payload.get('contents', [])
+                for part in content.get('parts', [])
+            )
+        except (ValueError, AttributeError):
+            self._send_json(400, {'error': {'code': 400, 'message': 'invalid JSON', 'status': 'INVALID_ARGUMENT'}})
+            return
+
+        text = self.services.generate_text(prompt)
+        prompt_tokens = max(1, len(prompt) // 4)
+        output_tokens = max(1, len(text) // 4)
+        self._send_json(200, {
+            'candidates': [{
+                'content': {'parts': [{'text': text}], 'role': 'model'},
+                'finishReason': 'STOP',
+                'index': 0,
+            }],
+            'usageMetadata': {
+                'promptTokenCount': prompt_tokens,
+                'candidatesTokenCount': output_tokens,
+                'totalTokenCount': prompt_tokens + output_tokens,
+            },
+        })
+
+    def _ollama_generate(self, body: bytes) -> None:
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            self._send_json(400, {'error': 'invalid JSON'})
+            return
+
+        prompt = payload.get('prompt', '')
+        text = self.services.generate_text(prompt)
+        self._send_json(200, {
+            'model': payload.get('model', 'llama3.1'),
+            'created_at': _atom_date(datetime.now(timezone.utc)),
+            'response': text,
+            'done': True,
+            'done_reason': 'stop',
+            'prompt_eval_count': max(1, len(prompt) // 4),
+            'eval_count': max(1, len(text) // 4),
+        })
+
+def _parse_route_values(values: List[str], option: str) -> Dict[str, float]:
+    """route=value 形式の引数を解析"""
+    result: Dict[str, float] = {}
+    for value in values:
+        route, sep, number = value.partition('=')
+        if not sep or route not in ROUTES:
+            raise SystemExit(f"{option} は {'/'.join(ROUTES)}=値 の形式で指定してください: {value}")
+        result[route] = float(number)
+    return result
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """コマンドライン引数の定義"""
+    parser = argparse.ArgumentParser(description="外部サービスのローカル代替サーバー")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="全ルート共通の遅延")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="遅延に加える揺らぎの幅")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503を返す確率")
+    parser.add_argument("--route-latency", action="append", default=[], metavar="ROUTE=MS",
+                        help="ルートごとの遅延（例: gemini=1500）")
+    parser.add_argument("--route-error", action="append", default=[], metavar="ROUTE=RATE",
+                        help="ルートごとのエラー率（例: feeds=0.2）")
+    parser.add_argument("--items", type=int, default=10, help="1フィードあたりの記事数")
+    parser.add_argument("--unique-urls", action="store_true", help="取得ごとに異なる記事URLを返す")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+def settings_from_args(args: argparse.Namespace) -> FakeServiceSettings:
+    """引数から設定を作成"""
+    return FakeServiceSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        route_latency_ms=_parse_route_values(args.route_latency, "--route-latency"),
+        route_error_rate=_parse_route_values(args.route_error, "--route-error"),
+        items_per_feed=args.items,
+        unique_urls=args.unique_urls,
+        seed=args.seed,
+    )
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """エントリーポイント"""
+    args = build_arg_parser().parse_args(argv)
+    services = FakeServices(args.host, args.port, settings_from_args(args))
+    print(f"🧪 フェイクサーバー起動: {services.url}")
+    print(f"   ENDPOINT_PROFILE=fake FAKE_SERVICES_URL={services.url} python src/main.py")
+    try:
+        services.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  停止します")
+    finally:
+        services.httpd.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,32 +1,50 @@
-import google.generativeai as genai
 from datetime import datetime
-from typing import List
+from typing import Any, List, Optional
 import random
 import sys
 import os
+import time
 
 # パスの設定
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from collectors.base_collector import Article
-from utils.rate_limiter import rate_limited, retry_with_backoff
+from utils.rate_limiter import rate_limited
+from utils.retry_policy import RetryPolicy, retry_with_policy
 from utils.constants import TARGET_ARTICLE_LENGTH, MAX_ARTICLES_PER_POST, DATE_FORMAT
 from utils.datetime_utils import today_jst_str
 from utils.logger import get_logger
+from utils import metrics
+from generators.template_renderer import TemplateRenderer
 
 class AISummarizer:
     def __init__(self, config):
         self.config = config
         self.logger = get_logger("ai_summarizer")
         self.templates = config.templates
+        self.renderer = TemplateRenderer(self.templates)
         
         # Gemini API設定
         api_key = config.gemini_api_key
         if not api_key:
             raise ValueError("GEMINI_API_KEY環境変数が設定されていません")
         
-        genai.configure(api_key=api_key)
+        # SDKの読み込みは重い（grpc/protobuf）ため、LLMを使う実行でのみ読み込む
+        import google.generativeai as genai
+        
+        # endpoints.yml で接続先を変更した場合はRESTで接続（フェイクサーバー用）
+        endpoints = config.endpoints
+        gemini_endpoint = endpoints.get('gemini_api_endpoint')
+        if gemini_endpoint:
+            genai.configure(
+                api_key=api_key,
+                transport='rest',
+                client_options={'api_endpoint': gemini_endpoint}
+            )
+        else:
+            genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.ollama_host = endpoints.get('ollama_host')
     
     def generate_article(self, articles: List[Article]) -> str:
         """記事一覧からブログ記事を生成"""
@@ -47,13 +65,70 @@ class AISummarizer:
                 print("✅ ollamaで記事生成完了")
                 return content
             except Exception as e2:
-                print(f"❌ ollama生成も失敗: {e2}")
-                raise Exception(f"記事生成に失敗しました。Gemini: {e}, Ollama: {e2}")
+                print(f"⚠️  ollama生成も失敗: {e2}")
+                # 最終フォールバック: テンプレートから生成（LLM不要）
+                try:
+                    content = self._generate_with_template(articles)
+                    print("✅ テンプレートで記事生成完了")
+                    return content
+                except Exception as e3:
+                    print(f"❌ テンプレート生成も失敗: {e3}")
+                    raise Exception(
+                        f"記事生成に失敗しました。Gemini: {e}, Ollama: {e2}, Template: {e3}"
+                    )
+    
+    def _generate_with_template(self, articles: List[Article]) -> str:
+        """templates.ymlから記事生成（LLMを使わない最終フォールバック）"""
+        return self.renderer.render(articles)
     
+    # リトライの各試行もレート制限の枠を消費するよう、リトライを外側に置く
+    @retry_with_policy(RetryPolicy(max_retries=2, base_delay=2.0))
     @rate_limited('gemini_api', max_calls_per_minute=15)
-    @retry_with_backoff(max_retries=2, base_delay=2.0)
     def _generate_with_gemini(self, articles: List[Article]) -> str:
         """Gemini APIで記事生成（レート制限・リトライ付き）"""
+        prompt = self._build_gemini_prompt(articles)
+        
+        start = time.perf_counter()
+        try:
+            response = self.model.generate_content(prompt)
+        except Exception:
+            self.logger.api_call("Gemini", success=False, response_time=time.perf_counter() - start)
+            raise
+        self.logger.api_call("Gemini", response_time=time.perf_counter() - start)
+        
+        usage = getattr(response, 'usage_metadata', None)
+        self._record_tokens("gemini", getattr(usage, 'prompt_token_count', None),
+                            getattr(usage, 'candidates_token_count', None))
+        return response.text
+    
+    def _generate_with_ollama(self, articles: List[Article]) -> str:
+        """ollamaで記事生成（フォールバック）"""
+        try:
+            import ollama
+        except ImportError:
+            raise ImportError("ollamaがインストールされていません")
+        
+        prompt = self._build_ollama_prompt(articles)
+        
+        client = ollama.Client(host=self.ollama_host) if self.ollama_host else ollama
+        start = time.perf_counter()
+        try:
+            response = client.generate(
+                model='llama3.1',
+                prompt=prompt
+            )
+        except Exception:
+            self.logger.api_call("ollama", success=False, response_time=time.perf_counter() - start)
+            raise
+        self.logger.api_call("ollama", response_time=time.perf_counter() - start)
+        
+        self._record_tokens("ollama", self._response_field(response, 'prompt_eval_count'),
+                            self._response_field(response, 'eval_count'))
+        return response['response']
+    
+    @staticmethod
+    def _build_gemini_prompt(articles: List[Article]) -> str:
+        """Gemini に渡すプロンプト（上位 MAX_ARTICLES_PER_POST 件の記事情報を含める）"""
         today = today_jst_str()
         article_count = len(articles)
         
@@ -124,17 +199,11 @@ class AISummarizer:
 - URLはそのまま貼って埋め込み表示にする
 - 技術的な内容も一般読者にわかりやすく説明
 """
-
-        response = self.model.generate_content(prompt)
-        return response.text
+        return prompt
     
-    def _generate_with_ollama(self, articles: List[Article]) -> str:
-        """ollamaで記事生成（フォールバック）"""
-        try:
-            import ollama
-        except ImportError:
-            raise ImportError("ollamaがインストールされていません")
-        
+    @staticmethod
+    def _build_ollama_prompt(articles: List[Article]) -> str:
+        """ollama に渡すプロンプト（Gemini より短い）"""
         today = today_jst_str()
         article_count = len(articles)
         
@@ -160,15 +229,27 @@ class AISummarizer:
 
 自然で読みやすい日本語で書いてください。
 """
-
-        response = ollama.generate(
-            model='llama3.1',
-            prompt=prompt
-        )
-        
-        return response['response']
+        return prompt
+    
+    @staticmethod
+    def _response_field(response: Any, key: str) -> Any:
+        """ollama のレスポンスの項目（バージョンによって dict / オブジェクト）"""
+        try:
+            return response[key]
+        except (KeyError, TypeError):
+            return None
+    
+    @staticmethod
+    def _record_tokens(provider: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+        """LLMのトークン使用量を記録（--metrics 指定時のみ）"""
+        if prompt_tokens:
+            metrics.count("llm_tokens_total", prompt_tokens, provider=provider, kind="prompt")
+        if completion_tokens:
+            metrics.count("llm_tokens_total", completion_tokens, provider=provider, kind="completion")
     
-    def _select_emoji(self) -> str:
-        """ランダムに絵文字を選択"""
+    def _select_emoji(self, index: Optional[int] = None) -> str:
+        """絵文字を選択（indexを指定すると記事順で決定的に選択）"""
+        if index is not None:
+            return self.renderer.select_emoji(index)
         emojis = self.templates.get('emojis', ['🚀', '🤖', '💡', '🔬', '⚡'])
         return random.choice(emojis)
\ No newline at end of file
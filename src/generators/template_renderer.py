@@ -0,0 +1,143 @@
+from string import Formatter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import sys
+import os
+
+# パスの設定
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collectors.base_collector import Article
+from utils.constants import MAX_ARTICLES_PER_POST
+from utils.datetime_utils import today_jst_str
+
+DEFAULT_EMOJIS: Tuple[str, ...] = ('🚀', '🤖', '💡', '🔬', '⚡')
+
+ARTICLE_TEMPLATE_FIELDS = frozenset({'date', 'article_count', 'articles', 'summary_points'})
+SECTION_TEMPLATE_FIELDS = frozenset({'emoji', 'title', 'summary', 'details', 'url', 'source', 'score'})
+
+# (リテラル, フィールド名, 書式指定, 変換指定) の並び
+CompiledTemplate = Tuple[Tuple[str, Optional[str], str, Optional[str]], ...]
+
+
+def compile_template(template: str, allowed_fields: frozenset) -> CompiledTemplate:
+    """str.format形式のテンプレートを事前に分解する
+
+    Args:
+        template: テンプレート文字列
+        allowed_fields: 使用可能なフィールド名
+
+    Returns:
+        レンダリング用に分解済みのテンプレート
+
+    Raises:
+        ValueError: 未知のフィールドや不正な書式が含まれる場合
+    """
+    parts = []
+    try:
+        for literal, field_name, format_spec, conversion in Formatter().parse(template):
+            if field_name is not None and field_name not in allowed_fields:
+                raise ValueError(f"テンプレートに未知のフィールドがあります: {{{field_name}}}")
+            parts.append((literal, field_name, format_spec or "", conversion))
+    except ValueError as e:
+        raise ValueError(f"テンプレート解析エラー: {e}")
+    return tuple(parts)
+
+
+def render_template(compiled: CompiledTemplate, values: Dict[str, Any]) -> str:
+    """分解済みテンプレートに値を埋め込む"""
+    chunks: List[str] = []
+    append = chunks.append
+    for literal, field_name, format_spec, conversion in compiled:
+        if literal:
+            append(literal)
+        if field_name is None:
+            continue
+        value = values[field_name]
+        if conversion == 'r':
+            value = repr(value)
+        elif conversion == 'a':
+            value = ascii(value)
+        append(format(value, format_spec) if format_spec else str(value))
+    return "".join(chunks)
+
+
+class TemplateRenderer:
+    """templates.yml を使ってLLMなしで記事を組み立てるレンダラー
+
+    同じ入力からは常に同じ記事を生成する（絵文字も記事順で決定）。
+    """
+
+    def __init__(self, templates: Dict[str, Any]) -> None:
+        article_template = templates.get('article_template')
+        section_template = templates.get('article_section')
+        if not article_template or not section_template:
+            raise ValueError("templates.ymlにarticle_templateとarticle_sectionが必要です")
+
+        self._article_template: CompiledTemplate = compile_template(
+            article_template, ARTICLE_TEMPLATE_FIELDS
+        )
+        self._section_template: CompiledTemplate = compile_template(
+            section_template, SECTION_TEMPLATE_FIELDS
+        )
+        self._emojis: Tuple[str, ...] = tuple(templates.get('emojis') or DEFAULT_EMOJIS)
+
+    def select_emoji(self, index: int) -> str:
+        """記事の位置に応じた絵文字を選択"""
+        return self._emojis[index % len(self._emojis)]
+
+    def render(self, articles: Sequence[Article], date: Optional[str] = None) -> str:
+        """記事一覧からブログ記事を生成
+
+        Args:
+            articles: スコア順に並んだ記事リスト
+            date: 記事の日付（省略時は今日の日本時間）
+
+        Returns:
+            Markdown形式の記事本文
+
+        Raises:
+            ValueError: 記事が空の場合
+        """
+        if not articles:
+            raise ValueError("記事が空です")
+
+        selected = articles[:MAX_ARTICLES_PER_POST]
+        sections = [
+            render_template(self._section_template, self._section_values(i, article)).rstrip()
+            for i, article in enumerate(selected)
+        ]
+        summary_points = "\n".join(f"- {article.title}" for article in selected[:3])
+
+        return render_template(self._article_template, {
+            'date': date or today_jst_str(),
+            'article_count': len(selected),
+            'articles': "\n\n".join(sections),
+            'summary_points': summary_points,
+        })
+
+    def _section_values(self, index: int, article: Article) -> Dict[str, Any]:
+        """記事セクションの埋め込み値を作成"""
+        summary, details = self._split_summary(article.summary)
+        if not details:
+            details = f"出典: {article.source}" if article.source else "詳細は元記事をご覧ください。"
+
+        return {
+            'emoji': self.select_emoji(index),
+            'title': article.title,
+            'summary': summary,
+            'details': details,
+            'url': article.url,
+            'source': article.source,
+            'score': article.score,
+        }
+
+    @staticmethod
+    def _split_summary(text: str) -> Tuple[str, str]:
+        """要約を最初の一文と残りに分割"""
+        text = text.strip()
+        for delimiter in ('。', '. '):
+            head, sep, tail = text.partition(delimiter)
+            if sep and tail.strip():
+                return head + sep.strip(), tail.strip()
+        return text, ""
+
@@ -4,121 +4,337 @@ AI Tech News Auto Publisher
 メインスクリプト
 """
 
+import argparse
+import asyncio
+import signal
+import sqlite3
 import sys
+import threading
+import time
 import traceback
-import requests
-from datetime import datetime
-from typing import List, Optional, NoReturn
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time as dt_time, timedelta
+from functools import cached_property
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, NoReturn, Tuple, Type
 
+from utils import metrics
 from utils.config import Config
-from utils.database import ArticleHistoryDB
-from utils.github_issues import GitHubIssueCreator
 from utils.logger import get_logger
-from utils.constants import MAX_ARTICLES_PER_POST, MIN_ARTICLES_REQUIRED, DATE_FORMAT
-from utils.datetime_utils import now_jst_str, today_jst_str
-from collectors.base_collector import Article
-from collectors.rss_collector import RSSCollector
-from collectors.twitter_collector import TwitterCollector
-from processors.content_filter import ContentFilter
-from processors.popularity_scorer import PopularityScorer
-from generators.ai_summarizer import AISummarizer
-from publishers.hatena_publisher import HatenaPublisher
+from utils.constants import (
+    MAX_ARTICLES_PER_POST, MIN_ARTICLES_REQUIRED, DATE_FORMAT,
+    HISTORY_RETENTION_DAYS, CLEANUP_MAX_BATCHES_PER_RUN,
+    DAEMON_PUBLISH_TIME, DAEMON_COLLECT_INTERVAL_MINUTES, DAEMON_FINAL_COLLECT_LEAD_MINUTES,
+    CANDIDATE_MAX_AGE_HOURS, CANDIDATE_POOL_MAX_SIZE, ASYNC_FETCH_CONCURRENCY
+)
+from utils.datetime_utils import now_jst, now_jst_str, today_jst_str
+from utils.retry_policy import retry_budget
+from utils.preflight_cache import PreflightCache
+
+# 収集・生成・投稿のモジュールは使うときに読み込む（メンテナンスモードなどで早期終了する実行では
+# google.generativeai / feedparser / requests などを読み込まない）
+if TYPE_CHECKING:
+    from utils.database import ArticleHistoryDB
+    from utils.github_issues import GitHubIssueCreator
+    from collectors.base_collector import Article
+    from collectors.rss_collector import RSSCollector
+    from collectors.twitter_collector import TwitterCollector
+    from processors.content_filter import ContentFilter
+    from processors.popularity_scorer import PopularityScorer
+    from generators.ai_summarizer import AISummarizer
+    from generators.template_renderer import TemplateRenderer
+    from publishers.publish_fanout import PublishFanOut
+    from processors.candidate_pool import CandidatePool
+    from utils.article_io import ArticleSet
+    from utils.checkpoint import RunCheckpoint
+
+def _network_errors() -> Tuple[Type[BaseException], ...]:
+    """ネットワーク関連の例外クラス（requests を読み込んでいなければ発生しないため空）"""
+    requests = sys.modules.get('requests')
+    return (requests.RequestException,) if requests is not None else ()
 
 class NewsPublisher:
     """AIニュース自動投稿システムのメインクラス - 型安全性を強化"""
     
-    def __init__(self) -> None:
+    def __init__(self, use_llm: bool = True) -> None:
         self.logger = get_logger("main")
+        self.use_llm: bool = use_llm
         self.config: Config = Config()
-        self.db: ArticleHistoryDB = ArticleHistoryDB()
-        self.github: GitHubIssueCreator = GitHubIssueCreator()
-        
-        # 各コンポーネントの初期化
-        self.rss_collector: RSSCollector = RSSCollector(self.config)
-        self.twitter_collector: TwitterCollector = TwitterCollector(self.config)
-        self.content_filter: ContentFilter = ContentFilter(self.config)
-        self.popularity_scorer: PopularityScorer = PopularityScorer(self.config)
-        self.ai_summarizer: AISummarizer = AISummarizer(self.config)
-        self.hatena_publisher: HatenaPublisher = HatenaPublisher(self.config)
-    
-    def run(self) -> None:
-        """メイン処理を実行"""
+        
+        # 各コンポーネントは初回アクセス時に初期化する（下記の cached_property）
+        # 投稿先の接続確認（収集と並行して実行し、投稿直前に結果を確認）
+        self._preflight: Optional[Future] = None
+    
+    @cached_property
+    def db(self) -> "ArticleHistoryDB":
+        from utils.database import ArticleHistoryDB
+        return ArticleHistoryDB()
+    
+    @cached_property
+    def github(self) -> "GitHubIssueCreator":
+        from utils.github_issues import GitHubIssueCreator
+        return GitHubIssueCreator()
+    
+    @cached_property
+    def rss_collector(self) -> "RSSCollector":
+        from collectors.rss_collector import RSSCollector
+        return RSSCollector(self.config)
+    
+    @cached_property
+    def twitter_collector(self) -> "TwitterCollector":
+        from collectors.twitter_collector import TwitterCollector
+        return TwitterCollector(self.config)
+    
+    @cached_property
+    def content_filter(self) -> "ContentFilter":
+        from processors.content_filter import ContentFilter
+        return ContentFilter(self.config, db=self.db)
+    
+    @cached_property
+    def popularity_scorer(self) -> "PopularityScorer":
+        from processors.popularity_scorer import PopularityScorer
+        return PopularityScorer(self.config)
+    
+    @cached_property
+    def ai_summarizer(self) -> Optional["AISummarizer"]:
+        # --no-llm モードではGeminiを初期化せずテンプレートのみで生成
+        if not self.use_llm:
+            return None
+        from generators.ai_summarizer import AISummarizer
+        return AISummarizer(self.config)
+    
+    @cached_property
+    def template_renderer(self) -> "TemplateRenderer":
+        from generators.template_renderer import TemplateRenderer
+        return TemplateRenderer(self.config.templates)
+    
+    @cached_property
+    def publish_fanout(self) -> "PublishFanOut":
+        # 記事は1回だけ生成し、publishers.yml の全投稿先へ並行して投稿する
+        from publishers.publish_fanout import PublishFanOut, build_publishers
+        return PublishFanOut(build_publishers(self.config))
+    
+    def run(self, resume: bool = False, use_async: bool = False) -> None:
+        """メイン処理を実行
+        
+        Args:
+            resume: 今日のチェックポイントから再開する（完了している段階は実行しない）
+            use_async: 非同期モードで実行する（フィード・アカウントを並行して取得し、取得できた順に
+                フィルタ・スコアリング。結果は同期モードと同じ）
+        """
         try:
             self.logger.start_process("AI Tech News Auto Publisher")
             self.logger.info("実行開始", timestamp=now_jst_str())
+            retry_budget.reset()
             
-            # 1. 設定チェック
-            self._check_configuration()
-            
-            # 2. メンテナンスモードチェック
-            if self._is_maintenance_mode():
-                self.logger.info("🔧 メンテナンスモードのため処理をスキップ")
+            # 1〜3. 設定・メンテナンスモード・手動スキップのチェック
+            if not self._ready_to_publish():
                 return
             
-            # 3. 手動スキップチェック
-            if self._should_skip():
-                self.logger.info("⏭️ 手動スキップが設定されているため処理をスキップ")
-                self.github.create_skip_issue("手動スキップ", "control.ymlでskip_next_publishがtrueに設定されています")
-                return
-            
-            # 4. 情報収集
-            print("\n📰 情報収集を開始...")
-            articles = self._collect_articles()
-            
-            if len(articles) < self.config.control.get('min_articles_required', MIN_ARTICLES_REQUIRED):
-                error_msg = f"記事数が不足しています（{len(articles)}件 < 最低2件）"
-                print(f"❌ {error_msg}")
-                self.github.create_skip_issue("記事不足", error_msg)
+            checkpoint = self._open_checkpoint(resume)
+            if checkpoint is None:
                 return
             
-            print(f"✅ {len(articles)}件の記事を収集しました")
-            
-            # 5. 記事生成
-            print("\n🤖 記事生成を開始...")
-            blog_content = self.ai_summarizer.generate_article(articles[:MAX_ARTICLES_PER_POST])
-            
-            # 6. はてなブログ投稿
-            print("\n📝 はてなブログ投稿を開始...")
-            title = f"今日のAIニュース（{today_jst_str()}）"
-            
-            success = self.hatena_publisher.publish(title, blog_content)
-            
-            if success:
-                print("✅ 投稿が完了しました！")
-                
-                # 7. 投稿した記事をデータベースに記録
-                for article in articles[:MAX_ARTICLES_PER_POST]:
-                    self.db.add_article(article.url, article.title)
-                
-                # 8. 古いレコードのクリーンアップ
-                deleted_count = self.db.cleanup_old_records(days=30)
-                if deleted_count > 0:
-                    print(f"🧹 {deleted_count}件の古い記録を削除しました")
-                
+            if use_async:
+                asyncio.run(self._run_stages_async(checkpoint))
             else:
-                error_msg = "はてなブログへの投稿に失敗しました"
-                print(f"❌ {error_msg}")
-                self.github.create_error_issue("投稿失敗", error_msg)
+                self._run_stages(checkpoint)
         
         except KeyboardInterrupt:
             print("\n⏹️  処理が中断されました")
             sys.exit(0)
         
-        except ValueError as e:
+        except Exception as e:
+            self._report_error(e)
+            sys.exit(1)
+        
+        finally:
+            # 履歴DBの共有接続を閉じる（WALの内容はここでDB本体に反映される）
+            if 'db' in self.__dict__:
+                self.db.close()
+    
+    def _ready_to_publish(self) -> bool:
+        """設定・メンテナンスモード・手動スキップをチェックし、投稿処理を進めてよければTrue"""
+        # 1. 設定チェック
+        self._check_configuration()
+        
+        # 2. メンテナンスモードチェック
+        if self._is_maintenance_mode():
+            self.logger.info("🔧 メンテナンスモードのため処理をスキップ")
+            return False
+        
+        # 3. 手動スキップチェック
+        if self._should_skip():
+            self.logger.info("⏭️ 手動スキップが設定されているため処理をスキップ")
+            self.github.create_skip_issue("手動スキップ", "control.ymlでskip_next_publishがtrueに設定されています")
+            return False
+        
+        return True
+    
+    def _open_checkpoint(self, resume: bool) -> Optional["RunCheckpoint"]:
+        """今日のチェックポイントを用意する
+        
+        通常の実行では今日の途中結果を消して最初から実行し、--resume では完了している段階を再利用する。
+        
+        Returns:
+            チェックポイント（--resume で今日の投稿が完了済みの場合は None）
+        """
+        from utils.checkpoint import RunCheckpoint, cleanup_checkpoints
+        
+        today = now_jst().date()
+        cleanup_checkpoints(today)
+        checkpoint = RunCheckpoint(today)
+        if not resume:
+            checkpoint.clear()
+            return checkpoint
+        
+        if checkpoint.published_record() is not None:
+            print("✅ 今日の記事は投稿済みです（--resume）")
+            return None
+        
+        completed = checkpoint.completed_stages()
+        if completed:
+            print(f"⏩ チェックポイントから再開します（完了済み: {', '.join(completed)}）")
+        else:
+            print("ℹ️  今日のチェックポイントがないため最初から実行します")
+        return checkpoint
+    
+    def _run_stages(self, checkpoint: "RunCheckpoint") -> None:
+        """収集から投稿までの各段階を実行"""
+        from utils.checkpoint import STAGE_GENERATED
+        
+        # 投稿先の接続確認を収集と並行して開始
+        self._start_preflight()
+        
+        # 4. 情報収集・フィルタリング・スコアリング（各段階の結果をチェックポイントに保存）
+        scored = self._prepare_articles(checkpoint)
+        if not self._has_enough_articles(scored.articles):
+            return
+        
+        # 5. 記事生成（同じ記事から生成済みの本文があれば再利用）
+        blog_content = self._generate_stage(scored, checkpoint.stage_path(STAGE_GENERATED))
+        
+        # 6〜8. 投稿・記録
+        self._publish_content(scored.articles, blog_content, checkpoint)
+    
+    async def _run_stages_async(self, checkpoint: "RunCheckpoint") -> None:
+        """_run_stages の非同期版
+        
+        記事生成（LLM）・投稿はブロッキングのSDK・HTTPクライアントを使うため、スレッドで実行して
+        イベントループを止めない。投稿先の接続確認は従来通り収集と並行して行う。
+        """
+        from utils.checkpoint import STAGE_GENERATED
+        
+        self._start_preflight()
+        
+        scored = await self._prepare_articles_async(checkpoint)
+        if not self._has_enough_articles(scored.articles):
+            return
+        
+        blog_content = await asyncio.to_thread(
+            self._generate_stage, scored, checkpoint.stage_path(STAGE_GENERATED)
+        )
+        await asyncio.to_thread(self._publish_content, scored.articles, blog_content, checkpoint)
+    
+    def _has_enough_articles(self, articles: List["Article"]) -> bool:
+        """投稿に必要な記事数があるかチェック（不足していればスキップのIssueを作成）"""
+        if len(articles) < self.config.control.get('min_articles_required', MIN_ARTICLES_REQUIRED):
+            error_msg = f"記事数が不足しています（{len(articles)}件 < 最低2件）"
+            print(f"❌ {error_msg}")
+            self.github.create_skip_issue("記事不足", error_msg)
+            return False
+        
+        print(f"✅ {len(articles)}件の記事を収集しました")
+        return True
+    
+    def _publish_articles(self, articles: List["Article"]) -> bool:
+        """記事を生成して全投稿先へ投稿し、投稿した記事を記録する（チェックポイントは使わない）
+        
+        Returns:
+            必須の投稿先への投稿が全て成功した場合True
+        """
+        if not self._has_enough_articles(articles):
+            return False
+        
+        # 5. 記事生成
+        print("\n🤖 記事生成を開始...")
+        blog_content = self._generate_article(articles[:MAX_ARTICLES_PER_POST])
+        
+        return self._publish_content(articles, blog_content)
+    
+    @metrics.timed("stage", stage="publish")
+    def _publish_content(self, articles: List["Article"], blog_content: str,
+                         checkpoint: Optional["RunCheckpoint"] = None) -> bool:
+        """生成した記事を全投稿先へ投稿し、投稿した記事を記録する
+        
+        Args:
+            articles: スコア順の記事（上位 MAX_ARTICLES_PER_POST 件を投稿済みとして記録する）
+            blog_content: 記事本文
+            checkpoint: 投稿完了を記録するチェックポイント
+        
+        Returns:
+            必須の投稿先への投稿が全て成功した場合True
+        """
+        # 6. 全投稿先へ投稿（接続確認の結果をここで確認）
+        self._await_preflight()
+        print("\n📝 投稿を開始...")
+        title = f"今日のAIニュース（{today_jst_str()}）"
+        
+        results = self.publish_fanout.publish_all(title, blog_content)
+        self.publish_fanout.print_report(results)
+        success = self.publish_fanout.succeeded(results)
+        
+        if success:
+            print("✅ 投稿が完了しました！")
+            
+            # 7. 投稿した記事をデータベースに記録（1トランザクションでまとめて追加）
+            posted_articles = articles[:MAX_ARTICLES_PER_POST]
+            self.db.add_articles(
+                (article.url, article.title, article.source) for article in posted_articles
+            )
+            self.db.mark_selected(article.url for article in posted_articles)
+            
+            # 8. 古いレコードのクリーンアップ（1回の実行で削除する量に上限を設け、残りは次回）
+            deleted_count = self.db.cleanup_old_records(
+                days=HISTORY_RETENTION_DAYS, max_batches=CLEANUP_MAX_BATCHES_PER_RUN
+            )
+            deleted_count += self.db.cleanup_archive(max_batches=CLEANUP_MAX_BATCHES_PER_RUN)
+            if deleted_count > 0:
+                print(f"🧹 {deleted_count}件の古い記録を削除しました")
+            
+            if checkpoint is not None:
+                checkpoint.mark_published(
+                    title, blog_content, [r.destination for r in results if r.success], now_jst()
+                )
+            
+        else:
+            failed = [r.destination for r in results if r.required and not r.success]
+            error_msg = f"必須の投稿先への投稿に失敗しました: {', '.join(failed)}"
+            print(f"❌ {error_msg}")
+            self.github.create_error_issue(
+                "投稿失敗",
+                error_msg,
+                "\n".join(f"- {r.destination}: {r.error}" for r in results if not r.success)
+            )
+        
+        return success
+    
+    def _report_error(self, e: Exception) -> None:
+        """エラーを表示し、種類に応じたIssueを作成（except節の中で呼び出す）"""
+        if isinstance(e, ValueError):
             # 設定エラーなど回復可能性の低いエラー
             error_msg = f"設定エラー: {str(e)}"
             print(f"❌ {error_msg}")
             self.github.create_error_issue("設定エラー", str(e))
-            sys.exit(1)
         
-        except requests.RequestException as e:
+        elif isinstance(e, _network_errors()):
             # ネットワーク関連エラー
             error_msg = f"ネットワークエラー: {str(e)}"
             print(f"❌ {error_msg}")
             self.github.create_error_issue("ネットワークエラー", str(e))
-            sys.exit(1)
         
-        except Exception as e:
+        else:
             # その他の予期しないエラー
             error_msg = f"予期しないエラーが発生しました: {str(e)}"
             print(f"❌ {error_msg}")
@@ -129,23 +345,61 @@ class NewsPublisher:
                 str(e),
                 f"スタックトレース:\n```\n{traceback.format_exc()}\n```"
             )
-            
-            sys.exit(1)
     
     def _check_configuration(self):
-        """設定の有効性をチェック"""
+        """設定の有効性をチェック（投稿先の接続確認は _start_preflight で並行実行）"""
         print("🔧 設定をチェック中...")
         
         try:
-            self.config.validate_env_vars()
+            from publishers.publish_fanout import requires_default_hatena_credentials
+            self.config.validate_env_vars(
+                require_gemini=self.use_llm,
+                require_hatena=requires_default_hatena_credentials(self.config)
+            )
             print("✅ 環境変数の設定OK")
         except ValueError as e:
             print(f"❌ 設定エラー: {e}")
             raise
+    
+    def _start_preflight(self) -> None:
+        """投稿先の接続確認をバックグラウンドで開始"""
+        # 投稿先の設定エラーは呼び出し元で扱えるよう、生成はここで行う
+        self.publish_fanout
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preflight")
+        self._preflight = executor.submit(self._check_connections)
+        executor.shutdown(wait=False)
+    
+    def _await_preflight(self) -> None:
+        """接続確認の完了を待ち、必須の投稿先が失敗していればエラーにする
+        
+        必須でない投稿先の失敗は、その投稿先を今回の投稿から外して続行する。
+        """
+        if self._preflight is None:
+            self._start_preflight()
         
-        # はてなブログ接続テスト
-        if not self.hatena_publisher.test_connection():
-            raise ValueError("はてなブログAPIへの接続に失敗しました")
+        failed = [name for name, ok in self._preflight.result().items() if not ok]
+        required_failed = [name for name in failed if self.publish_fanout.get(name).required]
+        if required_failed:
+            raise ValueError(f"投稿先APIへの接続に失敗しました: {', '.join(required_failed)}")
+        
+        for name in failed:
+            print(f"⚠️  接続に失敗した投稿先をスキップします: {name}")
+            self.publish_fanout.discard(name)
+    
+    @metrics.timed("stage", stage="preflight")
+    def _check_connections(self) -> Dict[str, bool]:
+        """全投稿先の接続テスト（control.ymlのTTL内に成功していれば省略）"""
+        ttl_minutes = self.config.control.get('preflight_cache_ttl_minutes', 0)
+        return self.publish_fanout.check_connections(PreflightCache(ttl_minutes=ttl_minutes))
+    
+    def _generate_article(self, articles: List["Article"]) -> str:
+        """記事本文を生成（--no-llm 時はテンプレートのみ）"""
+        if self.ai_summarizer is None:
+            content = self.template_renderer.render(articles)
+            print("✅ テンプレートで記事生成完了（LLM未使用）")
+            return content
+        
+        return self.ai_summarizer.generate_article(articles)
     
     def _is_maintenance_mode(self) -> bool:
         """メンテナンスモードかどうかチェック"""
@@ -155,14 +409,251 @@ class NewsPublisher:
         """手動スキップが設定されているかチェック"""
         return self.config.control.get('skip_next_publish', False)
     
-    def _collect_articles(self) -> List[Article]:
-        """全ソースから記事を収集"""
+    def _prepare_articles(self, checkpoint: "RunCheckpoint") -> "ArticleSet":
+        """収集・フィルタリング・スコアリングを実行し、各段階の結果をチェックポイントに保存
+        
+        同じ入力から作った結果がチェックポイントにあれば、その段階は実行せずに再利用する。
+        """
+        from utils.checkpoint import STAGE_COLLECTED, STAGE_FILTERED, STAGE_SCORED
+        
+        collected = self._collect_stage(checkpoint.stage_path(STAGE_COLLECTED))
+        filtered = self._filter_stage(collected, checkpoint.stage_path(STAGE_FILTERED))
+        return self._score_stage(filtered, checkpoint.stage_path(STAGE_SCORED))
+    
+    def _article_stage(self, stage: str, output: Path, key: str,
+                       compute: Callable[[], List["Article"]], reuse: bool = True) -> "ArticleSet":
+        """記事リストを出力する段階を実行（reuse なら同じフィンガープリントの出力を再利用）"""
+        from utils.article_io import write_articles
+        from utils.checkpoint import load_current_articles
+        
+        if reuse:
+            previous = load_current_articles(output, key)
+            metrics.cache("checkpoint", hit=previous is not None)
+            if previous is not None:
+                print(f"\n⏩ {stage}: 入力が変わっていないため前回の結果を使います（{len(previous.articles)}件）")
+                return previous
+        
+        with self.logger.span("stage", stage=stage):
+            articles = compute()
+            metrics.count("articles_total", len(articles), stage=stage)
+            return write_articles(output, articles, meta={
+                'stage': stage, 'fingerprint': key, 'created_at': now_jst_str()
+            })
+    
+    def _collect_key(self) -> str:
+        """収集段階のフィンガープリント（同じ日・同じ設定で収集済みの結果を再利用できる）"""
+        from utils.checkpoint import config_digest, fingerprint
+        return fingerprint(today_jst_str(), config_digest(self.config, 'sources.yml', 'keywords.yml'))
+    
+    def _filter_key(self, collected: "ArticleSet") -> str:
+        """フィルタ段階のフィンガープリント（投稿履歴・日付が変わるとやり直す）"""
+        from utils.checkpoint import fingerprint
+        return fingerprint(collected.digest, self.db.history_fingerprint(), today_jst_str())
+    
+    def _score_key(self, filtered: "ArticleSet") -> str:
+        """スコアリング段階のフィンガープリント（sources.yml・keywords.yml が変わるとやり直す）"""
+        from utils.checkpoint import config_digest, fingerprint
+        return fingerprint(filtered.digest, config_digest(self.config, 'sources.yml', 'keywords.yml'))
+    
+    def _collect_stage(self, output: Path, reuse: bool = True) -> "ArticleSet":
+        """収集段階"""
+        def collect() -> List["Article"]:
+            print("\n📰 情報収集を開始...")
+            return self._gather_articles()
+        
+        return self._article_stage("collect", output, self._collect_key(), collect, reuse)
+    
+    def _filter_stage(self, collected: "ArticleSet", output: Path, reuse: bool = True) -> "ArticleSet":
+        """フィルタ段階"""
+        return self._article_stage("filter", output, self._filter_key(collected),
+                                   lambda: self._filter_articles(collected.articles), reuse)
+    
+    def _score_stage(self, filtered: "ArticleSet", output: Path, reuse: bool = True) -> "ArticleSet":
+        """スコアリング段階"""
+        return self._article_stage("score", output, self._score_key(filtered),
+                                   lambda: self._score_articles(filtered.articles), reuse)
+    
+    @metrics.timed("stage", stage="prepare_async")
+    async def _prepare_articles_async(self, checkpoint: "RunCheckpoint") -> "ArticleSet":
+        """_prepare_articles の非同期版
+        
+        全コレクターのフィード・アカウントを ASYNC_FETCH_CONCURRENCY 件ずつ並行して取得し、
+        取得できた分から重複（履歴DB）・日付・品質フィルタとスコアリングを進める。
+        最後に収集単位の順番で並べ直し、同期モードと同じ結果・チェックポイントを作る。
+        """
+        from utils.article_io import write_articles
+        from utils.checkpoint import STAGE_COLLECTED, STAGE_FILTERED, STAGE_SCORED, load_current_articles
+        
+        if load_current_articles(checkpoint.stage_path(STAGE_COLLECTED), self._collect_key()) is not None:
+            # --resume で収集済みなら取得するものがないため同期モードと同じ
+            return self._prepare_articles(checkpoint)
+        
+        print("\n📰 情報収集を開始...（非同期モード）")
+        collectors = (("RSS", self.rss_collector), ("Twitter", self.twitter_collector))
+        limit = asyncio.Semaphore(ASYNC_FETCH_CONCURRENCY)
+        # (コレクターの順番, 収集単位の順番) -> 収集した記事 / フィルタ後の記事 / スコアを付けた複製
+        gathered: Dict[Tuple[int, int], List["Article"]] = {}
+        kept: Dict[Tuple[int, int], List["Article"]] = {}
+        scored: Dict[int, "Article"] = {}
+        
+        async def consume(order: int, name: str, collector) -> None:
+            count = 0
+            try:
+                with self.logger.span("collector", collector=name.lower()):
+                    async for index, articles in collector.stream(limit):
+                        gathered[(order, index)] = articles
+                        batch = self.content_filter.filter_articles(articles)
+                        kept[(order, index)] = batch
+                        # 収集・フィルタ後の記事はスコアを付ける前の値で保存するため、複製にスコアを付ける
+                        copies = [replace(article) for article in batch]
+                        self.popularity_scorer.score_articles(list(copies))
+                        scored.update(zip(map(id, batch), copies))
+                        count += len(articles)
+                metrics.count("collected_articles_total", count, collector=name.lower())
+                print(f"  ✅ {name}: {count}件")
+            except Exception as e:
+                print(f"  ⚠️  {name}収集エラー: {e}")
+        
+        await asyncio.gather(*(consume(order, name, collector)
+                               for order, (name, collector) in enumerate(collectors)))
+        
+        keys = sorted(gathered)
+        all_articles = [article for key in keys for article in gathered[key]]
+        # 収集単位をまたいだURLの重複は、同期モードと同じく最初に収集した記事を残す
+        first_seen: Dict[str, int] = {}
+        for article in all_articles:
+            first_seen.setdefault(article.url, id(article))
+        filtered_articles = [
+            article for key in keys for article in kept[key] if first_seen[article.url] == id(article)
+        ]
+        print(f"  ✅ フィルタ後: {len(filtered_articles)}件")
+        
+        scored_articles = [scored[id(article)] for article in filtered_articles]
+        scored_articles.sort(key=lambda article: article.score, reverse=True)
+        metrics.count("articles_total", len(all_articles), stage="collect")
+        metrics.count("articles_total", len(filtered_articles), stage="filter")
+        metrics.count("articles_total", len(scored_articles), stage="score")
+        self._archive_articles(all_articles)
+        self._archive_articles(scored_articles)
+        self._print_top_articles(scored_articles)
+        
+        collected = write_articles(checkpoint.stage_path(STAGE_COLLECTED), all_articles, meta={
+            'stage': "collect", 'fingerprint': self._collect_key(), 'created_at': now_jst_str()
+        })
+        filtered = write_articles(checkpoint.stage_path(STAGE_FILTERED), filtered_articles, meta={
+            'stage': "filter", 'fingerprint': self._filter_key(collected), 'created_at': now_jst_str()
+        })
+        return write_articles(checkpoint.stage_path(STAGE_SCORED), scored_articles, meta={
+            'stage': "score", 'fingerprint': self._score_key(filtered), 'created_at': now_jst_str()
+        })
+    
+    def _generate_stage(self, scored: "ArticleSet", output: Path, reuse: bool = True) -> str:
+        """記事生成段階（同じ記事・生成方法・テンプレートから生成済みの本文を再利用できる）"""
+        from utils.article_io import write_document
+        from utils.checkpoint import config_digest, fingerprint, load_current_document
+        
+        key = fingerprint(scored.digest, "llm" if self.use_llm else "template",
+                          config_digest(self.config, 'templates.yml'), today_jst_str())
+        if reuse:
+            content = load_current_document(output, key)
+            metrics.cache("checkpoint", hit=content is not None)
+            if content is not None:
+                print("\n⏩ generate: 入力が変わっていないため生成済みの記事本文を使います")
+                return content
+        
+        print("\n🤖 記事生成を開始...")
+        with self.logger.span("stage", stage="generate"):
+            content = self._generate_article(scored.articles[:MAX_ARTICLES_PER_POST])
+            write_document(output, content, meta={
+                'stage': "generate", 'fingerprint': key, 'created_at': now_jst_str()
+            })
+        return content
+    
+    def run_stage(self, stage: str, input_path: Optional[str] = None, output_path: Optional[str] = None,
+                  articles_path: Optional[str] = None, force: bool = False) -> int:
+        """1つの段階だけを実行（collect / filter / score / generate / publish サブコマンド）
+        
+        入出力を省略した場合は今日のチェックポイントを使う。filter / score / generate は
+        同じ入力から作った出力があれば実行せず、publish は同じ記事を今日投稿済みなら投稿しない
+        （いずれも force で実行）。collect は毎回収集する。
+        
+        Returns:
+            終了コード
+        """
+        from utils.article_io import read_articles
+        from utils.checkpoint import (
+            RunCheckpoint, STAGE_COLLECTED, STAGE_FILTERED, STAGE_SCORED, STAGE_GENERATED
+        )
+        
+        checkpoint = RunCheckpoint(now_jst().date())
+        
+        def resolve(path: Optional[str], default_stage: str) -> Path:
+            return Path(path) if path else checkpoint.stage_path(default_stage)
+        
+        start = time.perf_counter()
+        result: Optional["ArticleSet"] = None
+        try:
+            retry_budget.reset()
+            if stage == "collect":
+                output = resolve(output_path, STAGE_COLLECTED)
+                result = self._collect_stage(output, reuse=False)
+            
+            elif stage == "filter":
+                output = resolve(output_path, STAGE_FILTERED)
+                collected = read_articles(resolve(input_path, STAGE_COLLECTED))
+                result = self._filter_stage(collected, output, reuse=not force)
+            
+            elif stage == "score":
+                output = resolve(output_path, STAGE_SCORED)
+                filtered = read_articles(resolve(input_path, STAGE_FILTERED))
+                result = self._score_stage(filtered, output, reuse=not force)
+            
+            elif stage == "generate":
+                output = resolve(output_path, STAGE_GENERATED)
+                scored = read_articles(resolve(input_path, STAGE_SCORED))
+                if not self._has_enough_articles(scored.articles):
+                    return 1
+                self._generate_stage(scored, output, reuse=not force)
+            
+            else:
+                output = resolve(input_path, STAGE_GENERATED)
+                blog_content = output.read_text(encoding='utf-8')
+                scored = read_articles(resolve(articles_path, STAGE_SCORED))
+                if not force and checkpoint.is_published(blog_content):
+                    print("✅ 同じ記事は今日すでに投稿済みです（--force で再投稿）")
+                    return 0
+                if not self._ready_to_publish():
+                    return 0
+                if not self._publish_content(scored.articles, blog_content, checkpoint):
+                    return 1
+        
+        except FileNotFoundError as e:
+            print(f"❌ 入力ファイルがありません: {e.filename}（前の段階を先に実行してください）")
+            return 1
+        
+        except Exception as e:
+            self._report_error(e)
+            return 1
+        
+        finally:
+            if 'db' in self.__dict__:
+                self.db.close()
+        
+        elapsed = time.perf_counter() - start
+        count = f"{len(result.articles)}件 → " if result is not None else ""
+        print(f"✅ {stage}: {count}{output} ({elapsed:.2f}秒)")
+        return 0
+    
+    def _gather_articles(self) -> List["Article"]:
+        """RSS・Twitterから記事を収集（キーワードフィルタ済み）"""
         all_articles = []
         
         # RSS記事の収集
         print("📡 RSS記事を収集中...")
         try:
-            rss_articles = self.rss_collector.collect()
+            with self.logger.span("collector", collector="rss"):
+                rss_articles = self.rss_collector.collect()
+            metrics.count("collected_articles_total", len(rss_articles), collector="rss")
             all_articles.extend(rss_articles)
             print(f"  ✅ RSS: {len(rss_articles)}件")
         except Exception as e:
@@ -171,32 +662,395 @@ class NewsPublisher:
         # Twitter記事の収集
         print("🐦 Twitter記事を収集中...")
         try:
-            twitter_articles = self.twitter_collector.collect()
+            with self.logger.span("collector", collector="twitter"):
+                twitter_articles = self.twitter_collector.collect()
+            metrics.count("collected_articles_total", len(twitter_articles), collector="twitter")
             all_articles.extend(twitter_articles)
             print(f"  ✅ Twitter: {len(twitter_articles)}件")
         except Exception as e:
             print(f"  ⚠️  Twitter収集エラー: {e}")
         
-        # フィルタリング
+        return all_articles
+    
+    def _select_articles(self, all_articles: List["Article"]) -> List["Article"]:
+        """重複・品質でフィルタしてスコア順に並べ、全記事をアーカイブする"""
+        return self._score_articles(self._filter_articles(all_articles))
+    
+    def _filter_articles(self, all_articles: List["Article"]) -> List["Article"]:
+        """重複・日付・品質でフィルタし、全記事をアーカイブする"""
         print("🔍 記事をフィルタリング中...")
         filtered_articles = self.content_filter.filter_articles(all_articles)
         print(f"  ✅ フィルタ後: {len(filtered_articles)}件")
         
-        # スコアリング
+        # 投稿しなかった記事も含めて全てアーカイブ（話題の重複確認・検索用）
+        self._archive_articles(all_articles)
+        return filtered_articles
+    
+    def _score_articles(self, filtered_articles: List["Article"]) -> List["Article"]:
+        """スコアを付けてスコア順に並べる（アーカイブのスコアも更新）"""
         print("📊 記事をスコアリング中...")
         scored_articles = self.popularity_scorer.score_articles(filtered_articles)
-        
-        # 上位記事の表示
+        self._archive_articles(scored_articles)
+        self._print_top_articles(scored_articles)
+        return scored_articles
+    
+    def _print_top_articles(self, scored_articles: List["Article"]) -> None:
+        """上位記事の表示"""
         print("\n📈 上位記事:")
         for i, article in enumerate(scored_articles[:5], 1):
             print(f"  {i}. {article.title[:50]}... (スコア: {article.score:.1f})")
+
+    def _archive_articles(self, articles: List["Article"]) -> None:
+        """記事をアーカイブ（失敗しても処理は続ける）"""
+        try:
+            archived = self.db.archive_articles(articles)
+            print(f"  🗃️  アーカイブ: {archived}件")
+        except sqlite3.Error as e:
+            print(f"  ⚠️  アーカイブ保存エラー: {e}")
+
+@dataclass(frozen=True)
+class DaemonSettings:
+    """常駐モードの設定（control.yml の daemon）"""
+    publish_time: dt_time
+    collect_interval: timedelta
+    final_collect_lead: timedelta
+    candidate_max_age: timedelta
+    candidate_pool_max_size: int
+    
+    @classmethod
+    def from_control(cls, control: Mapping[str, Any]) -> "DaemonSettings":
+        """control.yml の内容から作成
         
-        return scored_articles
+        Raises:
+            ValueError: 設定値が不正な場合
+        """
+        settings = control.get('daemon') or {}
+        publish_time = str(settings.get('publish_time', DAEMON_PUBLISH_TIME))
+        try:
+            hour, minute = (int(part) for part in publish_time.split(':'))
+            return cls(
+                publish_time=dt_time(hour, minute),
+                collect_interval=timedelta(minutes=float(
+                    settings.get('collect_interval_minutes', DAEMON_COLLECT_INTERVAL_MINUTES))),
+                final_collect_lead=timedelta(minutes=float(
+                    settings.get('final_collect_lead_minutes', DAEMON_FINAL_COLLECT_LEAD_MINUTES))),
+                candidate_max_age=timedelta(hours=float(
+                    settings.get('candidate_max_age_hours', CANDIDATE_MAX_AGE_HOURS))),
+                candidate_pool_max_size=int(settings.get('candidate_pool_max_size', CANDIDATE_POOL_MAX_SIZE)),
+            )
+        except ValueError as e:
+            raise ValueError(f"control.ymlのdaemon設定が不正です（publish_timeは\"HH:MM\"）: {e}")
+
+class NewsDaemon(NewsPublisher):
+    """常駐モード
+    
+    プロセスを起動したまま設定・HTTP接続・SDKを温めておき、collect_interval ごとに記事を収集して
+    候補プールに溜める。スコアリング・記事生成・投稿は publish_time（JST）にだけ行うため、
+    投稿時刻の処理は記事生成と投稿だけになる。投稿時刻の final_collect_lead 前にも1回収集する。
+    """
+    
+    # 設定ファイルの変更時に作り直すコンポーネント（履歴DB・GitHub Issueは設定に依存しない）
+    CONFIG_COMPONENTS = (
+        'rss_collector', 'twitter_collector', 'content_filter', 'popularity_scorer',
+        'ai_summarizer', 'template_renderer', 'publish_fanout',
+    )
+    
+    def __init__(self, use_llm: bool = True) -> None:
+        super().__init__(use_llm=use_llm)
+        self._wake = threading.Event()
+        self._stopping = False
+        self._config_changed = False
+        # 当日の投稿枠を処理済みの日付（起動時に投稿時刻を過ぎていれば翌日から）
+        self._handled_date: Optional[date] = None
+    
+    @cached_property
+    def pool(self) -> "CandidatePool":
+        from processors.candidate_pool import CandidatePool
+        settings = self.settings
+        return CandidatePool(settings.candidate_max_age, settings.candidate_pool_max_size)
+    
+    @property
+    def settings(self) -> DaemonSettings:
+        return DaemonSettings.from_control(self.config.control)
+    
+    def stop(self) -> None:
+        """常駐を終了（シグナルハンドラ・別スレッドから呼び出せる）"""
+        self._stopping = True
+        self._wake.set()
+    
+    def _on_config_changed(self, filename: str, data: Mapping[str, Any]) -> None:
+        # 監視スレッドから呼ばれるため、コンポーネントの作り直しはメインループで行う
+        self._config_changed = True
+        self._wake.set()
+    
+    def _publish_slot(self, now: datetime, settings: DaemonSettings) -> datetime:
+        """now の日付の投稿時刻"""
+        return now.replace(hour=settings.publish_time.hour, minute=settings.publish_time.minute,
+                           second=0, microsecond=0)
+    
+    def serve(self) -> None:
+        """シグナル（SIGINT/SIGTERM）または stop() まで常駐する"""
+        handlers = {sig: signal.signal(sig, lambda *_: self.stop()) for sig in (signal.SIGINT, signal.SIGTERM)}
+        self.config.add_change_listener(self._on_config_changed)
+        self.config.start_watching()
+        
+        settings = self.settings
+        now = now_jst()
+        if now >= self._publish_slot(now, settings):
+            self._handled_date = now.date()
+        print(f"🕒 常駐モードを開始しました（投稿 {settings.publish_time:%H:%M} JST / "
+              f"収集 {settings.collect_interval.total_seconds() / 60:.0f}分ごと）")
+        
+        next_collect = now
+        try:
+            while not self._stopping:
+                if self._config_changed:
+                    self._config_changed = False
+                    for name in self.CONFIG_COMPONENTS:
+                        self.__dict__.pop(name, None)
+                    try:
+                        settings = self.settings
+                    except ValueError as e:
+                        print(f"⚠️  {e}（変更前の設定で続行します）")
+                    self.pool.max_age = settings.candidate_max_age
+                    self.pool.max_size = settings.candidate_pool_max_size
+                now = now_jst()
+                
+                slot = self._publish_slot(now, settings)
+                if now >= slot and self._handled_date != now.date():
+                    self._handled_date = now.date()
+                    self._publish_cycle()
+                    continue
+                
+                if now >= next_collect:
+                    self._collect_cycle(now)
+                    next_collect = now_jst() + settings.collect_interval
+                
+                # 次の投稿時刻（今日の分を処理済みなら翌日）の直前にも収集して最新の記事を取り込む
+                next_slot = slot if self._handled_date != now.date() else slot + timedelta(days=1)
+                final_collect = next_slot - settings.final_collect_lead
+                if now_jst() < final_collect < next_collect:
+                    next_collect = final_collect
+                
+                wait = min(next_collect, next_slot) - now_jst()
+                self._wake.wait(max(0.0, wait.total_seconds()))
+                self._wake.clear()
+        finally:
+            print("\n⏹️  常駐モードを終了します")
+            self.config.stop_watching()
+            self.config.remove_change_listener(self._on_config_changed)
+            for sig, handler in handlers.items():
+                signal.signal(sig, handler)
+            from utils.http import close_session
+            close_session()
+            if 'collectors.feed_parser' in sys.modules:
+                from collectors.feed_parser import close_parse_pool
+                close_parse_pool()
+            if 'db' in self.__dict__:
+                self.db.close()
+    
+    def _collect_cycle(self, now: datetime) -> None:
+        """記事を収集し、重複・品質フィルタを通ったものを候補プールに追加"""
+        print(f"\n📰 定期収集を開始... ({now:%H:%M})")
+        try:
+            with self.logger.span("daemon_cycle", kind="collect"):
+                gathered = self._gather_articles()
+            candidates = self.content_filter.filter_articles(gathered)
+            added = self.pool.add(candidates, now)
+            expired = self.pool.prune(now)
+            self._archive_articles(gathered)
+            print(f"📥 候補プール: 新規 {added}件 / 期限切れ {expired}件 / 合計 {len(self.pool)}件")
+        except Exception as e:
+            # 収集の失敗は次回の収集で取り返せるため、Issueは作らない
+            print(f"⚠️  定期収集エラー: {e}")
+    
+    def _publish_cycle(self) -> None:
+        """候補プールから記事を選んで生成・投稿"""
+        self.logger.start_process("AI Tech News Auto Publisher (常駐モード)")
+        self.logger.info("投稿開始", timestamp=now_jst_str())
+        retry_budget.reset()
+        # 前回の接続確認で外した投稿先を戻すため、投稿先は毎回作り直す
+        self.__dict__.pop('publish_fanout', None)
+        self._preflight = None
+        
+        try:
+            if not self._ready_to_publish():
+                return
+            self._start_preflight()
+            
+            print(f"\n📰 候補プールから記事を選択（{len(self.pool)}件）...")
+            with self.logger.span("stage", stage="select"):
+                articles = self._select_articles(self.pool.articles())
+            if self._publish_articles(articles):
+                self.pool.remove(article.url for article in articles[:MAX_ARTICLES_PER_POST])
+        except Exception as e:
+            # 常駐は続け、翌日の投稿時刻に再実行する
+            self._report_error(e)
+        finally:
+            # 前回の投稿からの収集・今回の投稿を1回分のメトリクス・プロファイルとして書き出す
+            write_metrics(restart=True)
+            write_profile(restart=True)
+
+# 段階ごとのサブコマンド（出力は data/checkpoints/YYYYMMDD/ に保存し、次の段階の入力になる）
+STAGE_COMMANDS = {
+    "collect": "記事を収集する（→ collected.jsonl.gz）",
+    "filter": "重複・日付・品質でフィルタする（collected → filtered.jsonl.gz）",
+    "score": "スコアを付けて並べる（filtered → scored.jsonl.gz）",
+    "generate": "記事本文を生成する（scored → generated.md）",
+    "publish": "生成した記事を投稿する（generated.md・scored）",
+}
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="AI Tech News Auto Publisher")
+    parser.add_argument(
+        "--no-llm",
+        action="store_true",
+        help="LLMを使わずtemplates.ymlから記事を生成する",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="フィード・アカウントを並行して取得する非同期モードで実行する",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="今日のチェックポイントから再開する（収集・選定・生成が完了していれば再利用）",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="段階・外部呼び出しの所要時間などを計測し、data/metrics/ に書き出す（JSON・Prometheus形式）",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="段階ごとに cProfile・tracemalloc で計測し、logs/profile/ に書き出す",
+    )
+    
+    subparsers = parser.add_subparsers(dest="command")
+    for name, help_text in STAGE_COMMANDS.items():
+        stage_parser = subparsers.add_parser(name, help=help_text)
+        if name != "collect":
+            stage_parser.add_argument("--input", help="入力ファイル（省略時は今日のチェックポイント）")
+            stage_parser.add_argument("--force", action="store_true", help="入力が変わっていなくても実行する")
+        if name == "publish":
+            stage_parser.add_argument("--articles", help="投稿する記事のファイル（省略時は今日の scored.jsonl.gz）")
+        else:
+            stage_parser.add_argument("--output", help="出力ファイル（省略時は今日のチェックポイント）")
+    subparsers.add_parser("daemon", help="常駐して定期的に収集し、control.ymlの時刻に投稿する")
+    state_parser = subparsers.add_parser("state", help="状態ファイル（履歴DBなど）のスナップショット")
+    state_parser.add_argument("action", choices=["export", "import"], help="書き出し / 読み込み")
+    state_parser.add_argument("path", help="スナップショットファイルのパス")
+    return parser.parse_args(argv)
+
+def run_state_command(action: str, path: str) -> int:
+    """状態スナップショットの書き出し・読み込み"""
+    from utils.state_snapshot import export_state, import_state
+    
+    start = time.perf_counter()
+    try:
+        if action == "export":
+            manifest = export_state(path)
+        else:
+            manifest = import_state(path)
+    except FileNotFoundError as e:
+        print(f"❌ スナップショットが見つかりません: {e.filename}")
+        return 1
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    
+    label = "書き出し" if action == "export" else "読み込み"
+    elapsed = time.perf_counter() - start
+    print(f"✅ 状態スナップショットを{label}ました: {path} ({elapsed:.2f}秒)")
+    for entry in manifest['entries']:
+        print(f"  - {entry['name']}: {entry['size']:,} bytes (圧縮後 {entry['compressed_size']:,} bytes)")
+    return 0
+
+def write_metrics(restart: bool = False) -> None:
+    """--metrics で計測したメトリクスを data/metrics/ に書き出す（計測していなければ何もしない）
+    
+    Args:
+        restart: 書き出した後、同じ実行情報で計測をやり直す（常駐モードの投稿ごと）
+    """
+    run = metrics.disable()
+    if run is None:
+        return
+    if restart:
+        metrics.enable(**run.info)
+    try:
+        json_path, prom_path = run.write()
+        metrics.cleanup_metrics()
+        print(f"📏 メトリクスを書き出しました: {json_path} / {prom_path.name}")
+    except OSError as e:
+        print(f"⚠️  メトリクスを書き出せません: {e}")
+
+def write_profile(restart: bool = False) -> None:
+    """--profile の結果を logs/profile/ に書き出す（プロファイルしていなければ何もしない）
+    
+    Args:
+        restart: 書き出した後、同じ実行情報でプロファイルをやり直す（常駐モードの投稿ごと）
+    """
+    if 'utils.profiling' not in sys.modules:
+        # --profile なし（cProfile・tracemalloc は読み込まない）
+        return
+    from utils import profiling
+    
+    profiler = profiling.disable()
+    if profiler is None:
+        return
+    if restart:
+        profiling.enable(**profiler.info)
+    try:
+        directory = profiler.write()
+        profiling.cleanup_profiles()
+    except OSError as e:
+        print(f"⚠️  プロファイルを書き出せません: {e}")
+        return
+    print(f"🔬 プロファイルを書き出しました: {directory}")
+    profiling.print_summary(profiler.summary())
+    print(f"  python -m pstats {directory / '<段階>.pstats'} で関数ごとの時間を確認できます")
+
+def main(argv: Optional[List[str]] = None):
     """エントリーポイント"""
-    publisher = NewsPublisher()
-    publisher.run()
+    args = parse_args(argv)
+    if args.command == "state":
+        sys.exit(run_state_command(args.action, args.path))
+    
+    info = dict(command=args.command or "run", use_llm=not args.no_llm,
+                use_async=args.use_async, resume=args.resume)
+    if args.metrics:
+        metrics.enable(**info)
+    if args.profile:
+        from utils import profiling
+        profiling.enable(**info)
+    try:
+        dispatch(args)
+    finally:
+        write_metrics()
+        write_profile()
+
+def dispatch(args: argparse.Namespace) -> None:
+    """サブコマンドを実行"""
+    if args.command in STAGE_COMMANDS:
+        publisher = NewsPublisher(use_llm=not args.no_llm)
+        sys.exit(publisher.run_stage(
+            args.command,
+            input_path=getattr(args, 'input', None),
+            output_path=getattr(args, 'output', None),
+            articles_path=getattr(args, 'articles', None),
+            force=getattr(args, 'force', False),
+        ))
+    
+    if args.command == "daemon":
+        NewsDaemon(use_llm=not args.no_llm).serve()
+        return
+    
+    publisher = NewsPublisher(use_llm=not args.no_llm)
+    publisher.run(resume=args.resume, use_async=args.use_async)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
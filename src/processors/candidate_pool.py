@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from collectors.base_collector import Article, FrozenArticle
+
+class CandidatePool:
+    """常駐モードで定期的に収集した記事の候補プール
+
+    URLで重複を除き、最初に収集してから max_age を過ぎた記事と、
+    max_size を超えた分の古い記事を捨てる。
+    記事は変更できない FrozenArticle で保持し、取り出すときに Article のコピーを返す
+    （取り出した記事にスコアを付けてもプールの記事は変わらない）。
+    """
+
+    def __init__(self, max_age: timedelta, max_size: int) -> None:
+        self.max_age = max_age
+        self.max_size = max_size
+        # URL -> (最初に収集した日時, 記事)。挿入順 = 収集順
+        self._articles: Dict[str, Tuple[datetime, FrozenArticle]] = {}
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    def add(self, articles: Iterable[Article], now: datetime) -> int:
+        """記事を追加（収集済みのURLは内容だけ最新にする）
+
+        Returns:
+            新しく追加した件数
+        """
+        added = 0
+        for article in articles:
+            if not isinstance(article, FrozenArticle):
+                article = article.freeze()
+            entry = self._articles.get(article.url)
+            if entry is None:
+                added += 1
+                self._articles[article.url] = (now, article)
+            else:
+                self._articles[article.url] = (entry[0], article)
+
+        while len(self._articles) > self.max_size:
+            del self._articles[next(iter(self._articles))]
+        return added
+
+    def prune(self, now: datetime) -> int:
+        """期限切れの記事を削除
+
+        Returns:
+            削除した件数
+        """
+        cutoff = now - self.max_age
+        expired = [url for url, (collected_at, _) in self._articles.items() if collected_at < cutoff]
+        for url in expired:
+            del self._articles[url]
+        return len(expired)
+
+    def remove(self, urls: Iterable[str]) -> None:
+        """投稿した記事などをプールから外す"""
+        for url in urls:
+            self._articles.pop(url, None)
+
+    def articles(self) -> List[Article]:
+        """プール内の記事のコピー（収集順）"""
+        return [article.thaw() for _, article in self._articles.values()]
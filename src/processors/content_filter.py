@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
 # 相対importをabsoluteに変更
 import sys
@@ -8,9 +8,10 @@ from collectors.base_collector import Article
 from utils.database import ArticleHistoryDB
 
 class ContentFilter:
-    def __init__(self, config):
+    def __init__(self, config, db: Optional[ArticleHistoryDB] = None):
         self.config = config
-        self.db = ArticleHistoryDB()
+        # NewsPublisher から渡された場合は同じ接続を共有する
+        self.db = db if db is not None else ArticleHistoryDB()
     
     def filter_articles(self, articles: List[Article]) -> List[Article]:
         """記事をフィルタリング"""
@@ -6,6 +6,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from collectors.base_collector import Article
+from utils.compiled_config import CompiledConfig
+from utils.constants import HIGH_IMPORTANCE_BONUS, MEDIUM_IMPORTANCE_BONUS
 
 class PopularityScorer:
     def __init__(self, config):
@@ -13,8 +15,10 @@ class PopularityScorer:
     
     def score_articles(self, articles: List[Article]) -> List[Article]:
         """記事に人気度スコアを付与"""
+        # スコア表とキーワードは sources.yml / keywords.yml から導出済みのものを使う
+        compiled = self.config.compiled
         for article in articles:
-            score = self._calculate_score(article)
+            score = self._calculate_score(article, compiled)
             article.score = score
         
         # スコア順にソート（降順）
@@ -22,22 +26,12 @@ class PopularityScorer:
         
         return articles
     
-    def _calculate_score(self, article: Article) -> float:
+    def _calculate_score(self, article: Article, compiled: CompiledConfig) -> float:
         """記事の人気度スコアを計算"""
         score = 0.0
         
-        # 1. ソース別の基本スコア
-        source_scores = {
-            'ITmedia AI+': 7.0,
-            'はてなブックマーク テクノロジー': 6.0,
-            'Zenn AI': 5.0,
-            'Twitter - ChatGPT研究所': 8.0,
-            'Twitter - ぬこぬこ': 7.0,
-            'Twitter - usutaku': 7.0,
-            'Twitter - みのるん': 7.5
-        }
-        
-        score += source_scores.get(article.source, 5.0)
+        # 1. ソース別の基本スコア（sources.yml の score）
+        score += compiled.source_score(article.source)
         
         # 2. キーワードによる重み付け
         title_lower = article.title.lower()
@@ -45,24 +39,14 @@ class PopularityScorer:
         text = f"{title_lower} {summary_lower}"
         
         # 高重要度キーワード
-        high_importance_keywords = [
-            'openai', 'chatgpt', 'gpt-4', 'claude', 'gemini',
-            '新機能', '発表', 'リリース', '発売', 'beta'
-        ]
-        
-        # 中重要度キーワード
-        medium_importance_keywords = [
-            'ai', '人工知能', '機械学習', 'llm', 'aiエージェント',
-            '改善', '更新', 'アップデート'
-        ]
-        
-        for keyword in high_importance_keywords:
+        for keyword in compiled.high_importance_keywords:
             if keyword in text:
-                score += 2.0
+                score += HIGH_IMPORTANCE_BONUS
         
-        for keyword in medium_importance_keywords:
+        # 中重要度キーワード
+        for keyword in compiled.medium_importance_keywords:
             if keyword in text:
-                score += 1.0
+                score += MEDIUM_IMPORTANCE_BONUS
         
         # 3. タイトルの長さによる調整（適度な長さが好ましい）
         title_length = len(article.title)
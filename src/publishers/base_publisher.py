@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+
+from utils.constants import DEFAULT_PUBLISH_TIMEOUT
+
+@dataclass
+class PublishResult:
+    """投稿先ごとの投稿結果"""
+    destination: str
+    success: bool
+    required: bool = True
+    url: Optional[str] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+class BasePublisher(ABC):
+    """投稿先の基底クラス
+
+    Attributes:
+        name: 投稿先の名前（publishers.yml の name）
+        required: Trueの場合、この投稿先の失敗を投稿全体の失敗とみなす
+        timeout_seconds: 投稿の完了を待つ上限（秒）
+        last_url: 直近に投稿した記事のURL（ない場合None）
+    """
+
+    def __init__(self, name: str, required: bool = True,
+                 timeout_seconds: float = DEFAULT_PUBLISH_TIMEOUT) -> None:
+        self.name = name
+        self.required = required
+        self.timeout_seconds = timeout_seconds
+        self.last_url: Optional[str] = None
+
+    @abstractmethod
+    def publish(self, title: str, content: str, category: str = "AI") -> bool:
+        """記事を投稿する抽象メソッド"""
+        pass
+
+    def test_connection(self) -> bool:
+        """投稿前の接続確認（確認が不要な投稿先は常にTrue）"""
+        return True
+
+    def preflight_key(self) -> Optional[str]:
+        """接続確認結果のキャッシュキー（キャッシュしない場合None）"""
+        return None
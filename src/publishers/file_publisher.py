@@ -0,0 +1,194 @@
+import hashlib
+import html
+import os
+import re
+from pathlib import Path
+from typing import List, Union
+from xml.etree.ElementTree import Element, SubElement, fromstring, register_namespace, tostring
+
+from publishers.base_publisher import BasePublisher
+from utils.config import get_data_dir
+from utils.constants import DEFAULT_PUBLISH_TIMEOUT
+from utils.datetime_utils import now_jst
+
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+# 出力時に ns0: などの接頭辞が付かないよう、Atomを既定の名前空間として登録
+register_namespace('', ATOM_NAMESPACE)
+
+_HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*)$')
+_LIST_PATTERN = re.compile(r'^[-*]\s+(.*)$')
+_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\((https?://[^)\s]+)\)')
+_BOLD_PATTERN = re.compile(r'\*\*(.+?)\*\*')
+
+def resolve_output_path(path: Union[str, Path]) -> Path:
+    """出力先のパスを解決（相対パスはデータディレクトリ基準）"""
+    path = Path(path)
+    return path if path.is_absolute() else get_data_dir() / path
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """一時ファイル経由で書き込み、読み手が書きかけのファイルを見ないようにする"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def _link_to_html(match) -> str:
+    # エスケープ済みの文字列に対して置換するため、URLは引用符だけを追加でエスケープする
+    href = match.group(2).replace('"', '&quot;')
+    return f'<a href="{href}">{match.group(1)}</a>'
+
+def _inline_markdown_to_html(text: str) -> str:
+    """行内のMarkdown（リンク・太字）をHTMLに変換"""
+    text = html.escape(text, quote=False)
+    text = _LINK_PATTERN.sub(_link_to_html, text)
+    return _BOLD_PATTERN.sub(r'<strong>\1</strong>', text)
+
+def markdown_to_html(markdown: str) -> str:
+    """生成記事で使う範囲のMarkdown（見出し・箇条書き・リンク・太字・段落）をHTMLに変換"""
+    blocks: List[str] = []
+    paragraph: List[str] = []
+    items: List[str] = []
+
+    def flush() -> None:
+        if paragraph:
+            blocks.append(f"<p>{'<br>'.join(paragraph)}</p>")
+            paragraph.clear()
+        if items:
+            blocks.append("<ul>\n" + "\n".join(f"<li>{item}</li>" for item in items) + "\n</ul>")
+            items.clear()
+
+    for line in markdown.splitlines():
+        line = line.strip()
+        heading = _HEADING_PATTERN.match(line)
+        list_item = _LIST_PATTERN.match(line)
+        if not line:
+            flush()
+        elif heading:
+            flush()
+            level = len(heading.group(1))
+            blocks.append(f"<h{level}>{_inline_markdown_to_html(heading.group(2))}</h{level}>")
+        elif list_item:
+            if paragraph:
+                flush()
+            items.append(_inline_markdown_to_html(list_item.group(1)))
+        else:
+            if items:
+                flush()
+            paragraph.append(_inline_markdown_to_html(line))
+    flush()
+
+    return "\n".join(blocks)
+
+class MarkdownFilePublisher(BasePublisher):
+    """記事をMarkdownまたはHTMLファイルとして出力する投稿先
+
+    ファイル名は日付（YYYY-MM-DD）で、同じ日に再実行した場合は上書きする。
+    """
+
+    def __init__(self, name: str, output_dir: Union[str, Path], output_format: str = "markdown",
+                 required: bool = False, timeout_seconds: float = DEFAULT_PUBLISH_TIMEOUT) -> None:
+        super().__init__(name, required, timeout_seconds)
+        if output_format not in ("markdown", "html"):
+            raise ValueError(f"未対応の出力形式です: {output_format}")
+        self.output_dir = resolve_output_path(output_dir)
+        self.output_format = output_format
+
+    def publish(self, title: str, content: str, category: str = "AI") -> bool:
+        """記事をファイルに書き出す"""
+        self.last_url = None
+        suffix = ".md" if self.output_format == "markdown" else ".html"
+        path = self.output_dir / f"{now_jst().strftime('%Y-%m-%d')}{suffix}"
+
+        if self.output_format == "markdown":
+            text = f"# {title}\n\n{content.rstrip()}\n"
+        else:
+            text = (
+                '<!DOCTYPE html>\n<html lang="ja">\n<head>\n<meta charset="utf-8">\n'
+                f'<title>{html.escape(title)}</title>\n</head>\n<body>\n<article>\n'
+                f'<h1>{html.escape(title)}</h1>\n{markdown_to_html(content)}\n'
+                '</article>\n</body>\n</html>\n'
+            )
+
+        try:
+            write_text_atomic(path, text)
+        except OSError as e:
+            print(f"❌ ファイル出力エラー ({self.name}): {e}")
+            return False
+
+        self.last_url = path.as_uri()
+        print(f"✅ ファイルに出力しました ({self.name}): {path}")
+        return True
+
+class AtomFeedPublisher(BasePublisher):
+    """記事をAtomフィードファイルに追記する投稿先
+
+    同じタイトルのエントリは置き換え、新しい順に max_entries 件まで保持する。
+    """
+
+    def __init__(self, name: str, path: Union[str, Path], feed_title: str = "AIニュース",
+                 site_url: str = "", max_entries: int = 20, required: bool = False,
+                 timeout_seconds: float = DEFAULT_PUBLISH_TIMEOUT) -> None:
+        super().__init__(name, required, timeout_seconds)
+        self.path = resolve_output_path(path)
+        self.feed_title = feed_title
+        self.site_url = site_url
+        self.max_entries = max_entries
+
+    def _entry_id(self, title: str) -> str:
+        """タイトルから安定したエントリIDを作成"""
+        digest = hashlib.sha256(title.encode('utf-8')).hexdigest()[:16]
+        return f"urn:sha256:{digest}"
+
+    def _load_entries(self) -> List[Element]:
+        """既存フィードのエントリを読み込み（壊れている場合は作り直す）"""
+        if not self.path.exists():
+            return []
+        try:
+            root = fromstring(self.path.read_bytes())
+        except Exception as e:
+            print(f"⚠️  既存フィードを読み込めないため作り直します ({self.name}): {e}")
+            return []
+        return root.findall(f"{{{ATOM_NAMESPACE}}}entry")
+
+    def _build_entry(self, title: str, content: str, category: str, updated: str) -> Element:
+        """Atomエントリ要素を作成"""
+        entry = Element(f"{{{ATOM_NAMESPACE}}}entry")
+        SubElement(entry, f"{{{ATOM_NAMESPACE}}}id").text = self._entry_id(title)
+        SubElement(entry, f"{{{ATOM_NAMESPACE}}}title").text = title
+        SubElement(entry, f"{{{ATOM_NAMESPACE}}}updated").text = updated
+        SubElement(entry, f"{{{ATOM_NAMESPACE}}}category", term=category)
+        content_element = SubElement(entry, f"{{{ATOM_NAMESPACE}}}content", type="html")
+        content_element.text = markdown_to_html(content)
+        return entry
+
+    def publish(self, title: str, content: str, category: str = "AI") -> bool:
+        """フィードにエントリを追加して書き出す"""
+        self.last_url = None
+        updated = now_jst().isoformat(timespec='seconds')
+        entry_id = self._entry_id(title)
+
+        entries = [
+            e for e in self._load_entries()
+            if e.findtext(f"{{{ATOM_NAMESPACE}}}id") != entry_id
+        ]
+        entries.insert(0, self._build_entry(title, content, category, updated))
+
+        feed = Element(f"{{{ATOM_NAMESPACE}}}feed")
+        SubElement(feed, f"{{{ATOM_NAMESPACE}}}title").text = self.feed_title
+        SubElement(feed, f"{{{ATOM_NAMESPACE}}}id").text = self.site_url or self.path.as_uri()
+        SubElement(feed, f"{{{ATOM_NAMESPACE}}}updated").text = updated
+        if self.site_url:
+            SubElement(feed, f"{{{ATOM_NAMESPACE}}}link", rel="alternate", href=self.site_url)
+        feed.extend(entries[:self.max_entries])
+
+        try:
+            xml = tostring(feed, encoding='unicode')
+            write_text_atomic(self.path, f'<?xml version="1.0" encoding="utf-8"?>\n{xml}\n')
+        except OSError as e:
+            print(f"❌ フィード出力エラー ({self.name}): {e}")
+            return False
+
+        self.last_url = self.path.as_uri()
+        print(f"✅ Atomフィードを更新しました ({self.name}): {self.path}")
+        return True
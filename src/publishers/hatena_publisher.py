@@ -1,22 +1,53 @@
 import requests
 import base64
 from datetime import datetime
-from xml.etree.ElementTree import Element, SubElement, tostring
+from typing import Optional, Tuple
+from xml.etree.ElementTree import Element, SubElement, fromstring, tostring
 
-class HatenaPublisher:
-    def __init__(self, config):
+from publishers.base_publisher import BasePublisher
+from publishers.publish_journal import PublishJournal, STATUS_PUBLISHED
+from utils.constants import DEFAULT_PUBLISH_TIMEOUT, HISTORY_RETENTION_DAYS
+from utils.http import get_session
+from utils.preflight_cache import PreflightCache
+from utils.retry_policy import RetryPolicy, call_with_retry
+
+# POSTは冪等ではないため、接続前の失敗と Retry-After 付きの 429・503 だけ再試行する
+# （送信後の失敗は再送せず、_create_entry が投稿済みか確認して更新に切り替える）
+HATENA_POST_RETRY_POLICY = RetryPolicy(max_retries=2, base_delay=2.0, idempotent=False)
+HATENA_PUT_RETRY_POLICY = RetryPolicy(max_retries=2, base_delay=2.0)
+HATENA_GET_RETRY_POLICY = RetryPolicy(max_retries=2, base_delay=1.0)
+
+HATENA_API_BASE = "https://blog.hatena.ne.jp"
+ATOM_NS = {'atom': 'http://www.w3.org/2005/Atom'}
+
+# 二重投稿チェックでエントリ一覧から確認する最大件数（1ページ目のみ）
+HATENA_SCAN_MAX_ENTRIES = 10
+
+class HatenaPublisher(BasePublisher):
+    def __init__(self, config, user_id: Optional[str] = None, blog_id: Optional[str] = None,
+                 api_key: Optional[str] = None, name: str = "hatena", required: bool = True,
+                 timeout_seconds: float = DEFAULT_PUBLISH_TIMEOUT):
+        super().__init__(name, required, timeout_seconds)
         self.config = config
-        self.user_id = config.hatena_username
-        self.blog_id = config.hatena_blog_id
-        self.api_key = config.hatena_api_key
+        # 認証情報の指定がなければ HATENA_* 環境変数を使う
+        self.user_id = user_id or config.hatena_username
+        self.blog_id = blog_id or config.hatena_blog_id
+        self.api_key = api_key or config.hatena_api_key
         
         if not all([self.user_id, self.blog_id, self.api_key]):
-            raise ValueError("はてなブログの認証情報が不足しています")
+            raise ValueError(f"はてなブログの認証情報が不足しています: {name}")
         
-        self.api_url = f"https://blog.hatena.ne.jp/{self.user_id}/{self.blog_id}/atom/entry"
+        # endpoints.yml でローカルのフェイクサーバーなどに切り替え可能
+        api_base = (config.endpoints.get('hatena_api_base') or HATENA_API_BASE).rstrip('/')
+        self.api_url = f"{api_base}/{self.user_id}/{self.blog_id}/atom/entry"
+        
+        # 二重投稿防止のための投稿記録
+        self.blog_key = f"{self.user_id}/{self.blog_id}"
+        self.journal = PublishJournal()
     
     def publish(self, title: str, content: str, category: str = "AI") -> bool:
-        """はてなブログに記事を投稿"""
+        """はてなブログに記事を投稿（同じタイトルの記事が既にあれば更新）"""
+        self.last_url = None
         try:
             # AtomPub形式のXMLを作成
             entry_xml = self._create_entry_xml(title, content, category)
@@ -26,36 +57,159 @@ class HatenaPublisher:
             print(entry_xml)
             print("🔍 XML終了")
             
-            # Basic認証のヘッダー作成
-            headers = self._create_auth_headers()
-            headers['Content-Type'] = 'application/atom+xml; charset=utf-8'
+            # 1. 投稿記録を確認（同じ内容なら何もしない）
+            content_hash = PublishJournal.hash_content(title, content, category)
+            record = self.journal.get(self.blog_key, title)
+            if record and record.status == STATUS_PUBLISHED and record.content_hash == content_hash:
+                print("✅ 同じ内容の記事は投稿済みです（投稿記録）")
+                self.last_url = record.entry_url
+                if record.entry_url:
+                    print(f"📝 投稿URL: {record.entry_url}")
+                return True
+            
+            # 2. 既存エントリの編集URIを探す（記録がなければ一覧の1ページ目を確認）
+            entry_url = record.entry_url if record else None
+            edit_url = record.edit_url if record else None
+            if not edit_url:
+                existing = self._find_existing_entry(title)
+                if existing:
+                    entry_url, edit_url = existing
             
+            # 3. 既存エントリがあれば更新、なければ新規投稿
+            if edit_url:
+                success = self._update_entry(edit_url, title, entry_xml, content_hash, entry_url)
+            else:
+                success = self._create_entry(title, entry_xml, content_hash)
+            
+            if success:
+                self.journal.cleanup_old_records(days=HISTORY_RETENTION_DAYS)
+            return success
+        
+        except requests.HTTPError as e:
+            print(f"❌ はてなブログ投稿失敗: {e.response.status_code}")
+            print(f"レスポンス: {e.response.text}")
+            return False
+        
+        except Exception as e:
+            print(f"❌ はてなブログ投稿エラー: {e}")
+            return False
+    
+    def _create_entry(self, title: str, entry_xml: str, content_hash: str) -> bool:
+        """エントリを新規投稿（送信後に失敗した場合は投稿済みか確認して更新に切り替える）"""
+        # 送信前に記録しておき、応答を受け取れなかった場合の目印にする
+        self.journal.mark_pending(self.blog_key, title, content_hash)
+        
+        # Basic認証のヘッダー作成
+        headers = self._create_auth_headers()
+        headers['Content-Type'] = 'application/atom+xml; charset=utf-8'
+        
+        try:
             # はてなブログAPIに投稿（UTF-8バイト文字列として送信）
-            response = requests.post(
-                self.api_url,
+            response = call_with_retry(
+                self._request, 'POST', self.api_url,
                 data=entry_xml.encode('utf-8'),
                 headers=headers,
-                timeout=30
+                timeout=30,
+                policy=HATENA_POST_RETRY_POLICY
             )
-            
-            if response.status_code == 201:
-                print(f"✅ はてなブログ投稿成功: {response.status_code}")
-                
-                # 投稿されたエントリのURLを取得
-                entry_url = self._extract_entry_url(response.text)
-                if entry_url:
-                    print(f"📝 投稿URL: {entry_url}")
-                
-                return True
-            else:
-                print(f"❌ はてなブログ投稿失敗: {response.status_code}")
-                print(f"レスポンス: {response.text}")
+        except requests.RequestException as e:
+            if not self._may_have_been_processed(e):
+                raise
+            # POSTは受理されている可能性があるため、新規投稿せず既存エントリを探して更新する
+            print(f"⚠️  投稿の応答を確認できませんでした（{e}）。投稿済みか確認します...")
+            existing = self._find_existing_entry(title)
+            if existing is None:
+                print("❌ 投稿を確認できませんでした（次回実行時に再確認します）")
                 return False
+            entry_url, edit_url = existing
+            return self._update_entry(edit_url, title, entry_xml, content_hash, entry_url)
         
-        except Exception as e:
-            print(f"❌ はてなブログ投稿エラー: {e}")
+        if response.status_code == 201:
+            print(f"✅ はてなブログ投稿成功: {response.status_code}")
+            
+            # 投稿されたエントリのURLを取得
+            entry_url = self._extract_entry_url(response.text)
+            edit_url = self._extract_link(response.text, 'edit') or response.headers.get('Location')
+            if entry_url:
+                print(f"📝 投稿URL: {entry_url}")
+            
+            self.journal.mark_published(self.blog_key, title, content_hash, entry_url, edit_url)
+            self.last_url = entry_url
+            return True
+        else:
+            print(f"❌ はてなブログ投稿失敗: {response.status_code}")
+            print(f"レスポンス: {response.text}")
             return False
     
+    @staticmethod
+    def _may_have_been_processed(error: requests.RequestException) -> bool:
+        """送信したPOSTがサーバーで処理された可能性があるか（タイムアウト・通信エラー・408・5xx）"""
+        if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+            return True
+        response = getattr(error, 'response', None)
+        return response is not None and (response.status_code == 408 or response.status_code >= 500)
+    
+    def _update_entry(self, edit_url: str, title: str, entry_xml: str, content_hash: str,
+                      entry_url: Optional[str] = None) -> bool:
+        """編集URIへのPUTで既存エントリを更新"""
+        headers = self._create_auth_headers()
+        headers['Content-Type'] = 'application/atom+xml; charset=utf-8'
+        
+        response = call_with_retry(
+            self._request, 'PUT', edit_url,
+            data=entry_xml.encode('utf-8'),
+            headers=headers,
+            timeout=30,
+            policy=HATENA_PUT_RETRY_POLICY
+        )
+        
+        if response.status_code == 200:
+            entry_url = self._extract_entry_url(response.text) or entry_url
+            print("✅ 既存の記事を更新しました（二重投稿を回避）")
+            if entry_url:
+                print(f"📝 投稿URL: {entry_url}")
+            
+            self.journal.mark_published(self.blog_key, title, content_hash, entry_url, edit_url)
+            self.last_url = entry_url
+            return True
+        else:
+            print(f"❌ はてなブログ更新失敗: {response.status_code}")
+            print(f"レスポンス: {response.text}")
+            return False
+    
+    def _find_existing_entry(self, title: str) -> Optional[Tuple[Optional[str], str]]:
+        """エントリ一覧の1ページ目から同じタイトルのエントリを探す
+        
+        Returns:
+            (エントリURL, 編集URI)。見つからない・確認できない場合None
+        """
+        try:
+            response = call_with_retry(
+                self._request, 'GET', self.api_url,
+                headers=self._create_auth_headers(), timeout=10,
+                policy=HATENA_GET_RETRY_POLICY
+            )
+            root = fromstring(response.content)
+        except Exception as e:
+            print(f"⚠️  既存エントリの確認に失敗: {e}")
+            return None
+        
+        for entry in root.findall('atom:entry', ATOM_NS)[:HATENA_SCAN_MAX_ENTRIES]:
+            if (entry.findtext('atom:title', default='', namespaces=ATOM_NS) or '').strip() != title:
+                continue
+            edit_url = self._find_link(entry, 'edit')
+            if edit_url:
+                print("🔍 同じタイトルの投稿済みエントリが見つかりました")
+                return self._find_link(entry, 'alternate'), edit_url
+        
+        return None
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """HTTPリクエストを送信し、4xx/5xxは例外として送出（リトライ判定用）"""
+        response = get_session().request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+    
     def _create_entry_xml(self, title: str, content: str, category: str) -> str:
         """AtomPub形式のXMLエントリを作成（最もシンプルな形式）"""
         # 最もシンプルなAtomエントリ
@@ -89,43 +243,63 @@ class HatenaPublisher:
             'User-Agent': 'AI-News-Publisher/1.0'
         }
     
-    def _extract_entry_url(self, response_text: str) -> str:
+    def _extract_entry_url(self, response_text: str) -> Optional[str]:
         """レスポンスからエントリURLを抽出"""
+        return self._extract_link(response_text, 'alternate')
+    
+    def _extract_link(self, response_text: str, rel: str) -> Optional[str]:
+        """レスポンスのエントリから指定relのlink要素のURLを抽出"""
         try:
-            from xml.etree.ElementTree import fromstring
-            
             root = fromstring(response_text)
-            
-            # 名前空間を考慮してlink要素を探す
-            ns = {'atom': 'http://www.w3.org/2005/Atom'}
-            
-            for link in root.findall('.//atom:link', ns):
-                if link.get('rel') == 'alternate':
-                    return link.get('href')
-            
-            return None
+            return self._find_link(root, rel)
         
         except Exception as e:
             print(f"URL抽出エラー: {e}")
             return None
     
+    @staticmethod
+    def _find_link(element, rel: str) -> Optional[str]:
+        """要素配下から指定relのlink要素を探す（名前空間を考慮）"""
+        for link in element.findall('.//atom:link', ATOM_NS):
+            if link.get('rel') == rel:
+                return link.get('href')
+        return None
+    
+    def preflight_key(self) -> Optional[str]:
+        """接続確認結果のキャッシュキー（認証情報はハッシュ化される）"""
+        return PreflightCache.make_key('hatena', self.api_url, self.user_id, self.api_key)
+    
     def test_connection(self) -> bool:
         """はてなブログAPI接続テスト"""
         try:
             headers = self._create_auth_headers()
             
             # エントリ一覧を取得してテスト（公式ドキュメント準拠）
-            blog_url = f"https://blog.hatena.ne.jp/{self.user_id}/{self.blog_id}/atom/entry"
-            response = requests.get(blog_url, headers=headers, timeout=10)
+            # 認証とステータスだけ確認できればよいので本文はダウンロードしない
+            blog_url = self.api_url
+            response = call_with_retry(
+                self._request, 'GET', blog_url,
+                headers=headers, timeout=10, stream=True,
+                policy=HATENA_GET_RETRY_POLICY
+            )
             
-            if response.status_code == 200:
-                print("✅ はてなブログAPI接続成功")
-                return True
-            else:
-                print(f"❌ はてなブログAPI接続失敗: {response.status_code}")
-                print(f"🔍 接続先URL: {blog_url}")
-                print(f"🔍 レスポンス: {response.text[:200]}")
-                return False
+            try:
+                if response.status_code == 200:
+                    print("✅ はてなブログAPI接続成功")
+                    return True
+                else:
+                    print(f"❌ はてなブログAPI接続失敗: {response.status_code}")
+                    print(f"🔍 接続先URL: {blog_url}")
+                    print(f"🔍 レスポンス: {response.text[:200]}")
+                    return False
+            finally:
+                response.close()
+        
+        except requests.HTTPError as e:
+            print(f"❌ はてなブログAPI接続失敗: {e.response.status_code}")
+            print(f"🔍 接続先URL: {blog_url}")
+            print(f"🔍 レスポンス: {e.response.text[:200]}")
+            return False
         
         except Exception as e:
             print(f"❌ はてなブログAPI接続エラー: {e}")
@@ -0,0 +1,221 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Any, Dict, List, Optional
+
+from publishers.base_publisher import BasePublisher, PublishResult
+from publishers.file_publisher import AtomFeedPublisher, MarkdownFilePublisher
+from publishers.hatena_publisher import HatenaPublisher
+from publishers.webhook_publisher import WebhookPublisher
+from utils import metrics
+from utils.constants import DEFAULT_PUBLISH_TIMEOUT
+from utils.preflight_cache import PreflightCache
+
+# publishers.yml がない場合の投稿先（従来どおり HATENA_* のブログのみ）
+DEFAULT_DESTINATIONS: List[Dict[str, Any]] = [
+    {'name': 'hatena', 'type': 'hatena', 'required': True},
+]
+
+def _env(settings: Dict[str, Any], key: str) -> Optional[str]:
+    """設定で指定された環境変数名から値を取得"""
+    env_name = settings.get(key)
+    return os.environ.get(env_name) if env_name else None
+
+def create_publisher(config, settings: Dict[str, Any]) -> BasePublisher:
+    """publishers.yml の1項目から投稿先を作成
+
+    Raises:
+        ValueError: 未対応のタイプ・必要な設定の不足
+    """
+    kind = settings.get('type')
+    name = settings.get('name') or kind
+    required = bool(settings.get('required', False))
+    timeout_seconds = float(settings.get('timeout_seconds', DEFAULT_PUBLISH_TIMEOUT))
+
+    if kind == 'hatena':
+        # 環境変数名を指定した場合は既定の HATENA_* にフォールバックしない
+        for key in ('username_env', 'blog_id_env', 'api_key_env'):
+            if settings.get(key) and not _env(settings, key):
+                raise ValueError(f"環境変数が設定されていません: {settings[key]}")
+        return HatenaPublisher(
+            config,
+            user_id=_env(settings, 'username_env'),
+            blog_id=_env(settings, 'blog_id_env'),
+            api_key=_env(settings, 'api_key_env'),
+            name=name, required=required, timeout_seconds=timeout_seconds
+        )
+    if kind in ('markdown', 'html'):
+        return MarkdownFilePublisher(
+            name, settings.get('output_dir', 'public'), kind,
+            required=required, timeout_seconds=timeout_seconds
+        )
+    if kind == 'atom':
+        return AtomFeedPublisher(
+            name, settings.get('path', 'public/feed.xml'),
+            feed_title=settings.get('feed_title', 'AIニュース'),
+            site_url=settings.get('site_url', ''),
+            max_entries=int(settings.get('max_entries', 20)),
+            required=required, timeout_seconds=timeout_seconds
+        )
+    if kind == 'webhook':
+        return WebhookPublisher(
+            name, settings.get('url') or _env(settings, 'url_env'),
+            required=required, timeout_seconds=timeout_seconds
+        )
+    raise ValueError(f"未対応の投稿先タイプです: {kind}")
+
+def enabled_destinations(config) -> List[Dict[str, Any]]:
+    """publishers.yml の有効な投稿先の設定（publishers.yml がなければ既定の投稿先）"""
+    destinations = config.publishers.get('destinations') or DEFAULT_DESTINATIONS
+    return [settings for settings in destinations if settings.get('enabled', True)]
+
+def requires_default_hatena_credentials(config) -> bool:
+    """既定の HATENA_* 環境変数を使う必須の投稿先があるか
+
+    環境変数名を個別に指定した投稿先・必須でない投稿先の設定不足は build_publishers で扱う。
+    """
+    return any(
+        settings.get('type') == 'hatena' and settings.get('required', False)
+        and not all(settings.get(key) for key in ('username_env', 'blog_id_env', 'api_key_env'))
+        for settings in enabled_destinations(config)
+    )
+
+def build_publishers(config) -> List[BasePublisher]:
+    """publishers.yml の有効な投稿先を作成
+
+    必須でない投稿先は設定不足でもスキップして続行する。
+
+    Raises:
+        ValueError: 必須の投稿先を作成できない・投稿先がない・名前が重複している場合
+    """
+    publishers: List[BasePublisher] = []
+    for settings in enabled_destinations(config):
+        try:
+            publishers.append(create_publisher(config, settings))
+        except ValueError as e:
+            if settings.get('required', False):
+                raise
+            print(f"⚠️  投稿先をスキップします ({settings.get('name')}): {e}")
+
+    names = [p.name for p in publishers]
+    if len(names) != len(set(names)):
+        raise ValueError(f"publishers.ymlの投稿先の名前が重複しています: {names}")
+    if not publishers:
+        raise ValueError("有効な投稿先がありません")
+    return publishers
+
+class PublishFanOut:
+    """1回生成した記事を全ての投稿先へ並行して投稿する
+
+    投稿先ごとに timeout_seconds まで待つ。超えた場合、必須でない投稿先は失敗として報告し
+    （実行中の投稿は中断できないため、バックグラウンドで完了させる）、必須の投稿先は完了まで待つ。
+    必須の投稿先を失敗と報告したあとに投稿が成功すると、履歴・チェックポイントに記録されず
+    次の実行で同じ記事を投稿し直してしまうため。
+    """
+
+    def __init__(self, publishers: List[BasePublisher]) -> None:
+        self.publishers = list(publishers)
+
+    def get(self, name: str) -> BasePublisher:
+        """名前で投稿先を取得"""
+        for publisher in self.publishers:
+            if publisher.name == name:
+                return publisher
+        raise KeyError(name)
+
+    def discard(self, name: str) -> None:
+        """投稿先を今回の投稿対象から外す"""
+        self.publishers = [p for p in self.publishers if p.name != name]
+
+    def check_connections(self, cache: Optional[PreflightCache] = None) -> Dict[str, bool]:
+        """全投稿先の接続確認を並行して実行（キャッシュのTTL内に成功していれば省略）
+
+        Returns:
+            投稿先名 -> 接続確認の成否
+        """
+        def check(publisher: BasePublisher) -> bool:
+            key = publisher.preflight_key()
+            if cache is not None and key is not None and cache.enabled:
+                cached = cache.is_valid(key)
+                metrics.cache("preflight", hit=cached)
+                if cached:
+                    print(f"✅ {publisher.name}: 接続確認済み（キャッシュ）")
+                    return True
+            if not publisher.test_connection():
+                return False
+            if cache is not None and key is not None:
+                cache.record_success(key)
+            return True
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.publishers)),
+                                thread_name_prefix="preflight") as executor:
+            return dict(zip(
+                (p.name for p in self.publishers),
+                executor.map(check, self.publishers)
+            ))
+
+    @staticmethod
+    def _publish_one(publisher: BasePublisher, title: str, content: str, category: str) -> PublishResult:
+        """1つの投稿先に投稿して結果を返す"""
+        start = time.monotonic()
+        try:
+            success = publisher.publish(title, content, category)
+            error = None if success else "投稿に失敗しました"
+        except Exception as e:
+            success, error = False, str(e)
+        return PublishResult(
+            publisher.name, success, publisher.required,
+            url=publisher.last_url if success else None,
+            error=error, seconds=time.monotonic() - start
+        )
+
+    def publish_all(self, title: str, content: str, category: str = "AI") -> List[PublishResult]:
+        """全投稿先に並行して投稿"""
+        start = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=max(1, len(self.publishers)),
+                                      thread_name_prefix="publish")
+        futures = [
+            (publisher, executor.submit(self._publish_one, publisher, title, content, category))
+            for publisher in self.publishers
+        ]
+
+        results: List[PublishResult] = []
+        try:
+            for publisher, future in futures:
+                # 全投稿先を同時に開始しているので、期限は開始時刻からの経過で判定する
+                remaining = publisher.timeout_seconds - (time.monotonic() - start)
+                try:
+                    results.append(future.result(timeout=max(0.0, remaining)))
+                except FuturesTimeoutError:
+                    if publisher.required:
+                        # 投稿自体のHTTPリクエストにはタイムアウトがあるため、待てば必ず結果が出る
+                        print(f"⏳ {publisher.name}: {publisher.timeout_seconds:.0f}秒を超えました。"
+                              "必須の投稿先のため完了を待ちます...")
+                        results.append(future.result())
+                        continue
+                    results.append(PublishResult(
+                        publisher.name, False, publisher.required,
+                        error=f"{publisher.timeout_seconds:.0f}秒以内に完了しませんでした",
+                        seconds=time.monotonic() - start
+                    ))
+        finally:
+            executor.shutdown(wait=False)
+
+        for r in results:
+            metrics.observe("publish", r.seconds, error=not r.success, destination=r.destination)
+        return results
+
+    @staticmethod
+    def succeeded(results: List[PublishResult]) -> bool:
+        """必須の投稿先が全て成功したか"""
+        return bool(results) and all(r.success for r in results if r.required)
+
+    @staticmethod
+    def print_report(results: List[PublishResult]) -> None:
+        """投稿先ごとの結果を表示"""
+        print("\n📋 投稿結果:")
+        for r in results:
+            mark = "✅" if r.success else ("❌" if r.required else "⚠️ ")
+            label = "必須" if r.required else "任意"
+            detail = r.url if r.success else r.error
+            print(f"  {mark} {r.destination} [{label}] {r.seconds:.1f}秒" + (f" - {detail}" if detail else ""))
@@ -0,0 +1,127 @@
+import hashlib
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from utils.config import get_data_dir
+
+STATUS_PENDING = "pending"
+STATUS_PUBLISHED = "published"
+
+def _timestamp(value: datetime) -> str:
+    """updated_at に保存する文字列（sqlite3 の既定のアダプタと同じ "YYYY-MM-DD HH:MM:SS.ffffff"）
+
+    既定のアダプタは Python 3.12 で非推奨のため、文字列にしてから渡す。
+    既存の記録と同じ形式なので、文字列の比較で古い記録を判定できる。
+    """
+    return value.isoformat(sep=' ')
+
+@dataclass
+class JournalRecord:
+    """投稿記録"""
+    blog_key: str
+    title: str
+    content_hash: str
+    status: str
+    entry_url: Optional[str] = None
+    edit_url: Optional[str] = None
+
+class PublishJournal:
+    """ブログへの投稿記録
+
+    POSTの前に pending、成功後に published とエントリURLを記録しておくことで、
+    タイムアウト後の再実行でも同じタイトルの記事を二重投稿せずに済む。
+    """
+
+    def __init__(self, db_path=None):
+        if db_path is None:
+            db_path = get_data_dir() / "publish_journal.db"
+
+        self.db_path = Path(db_path)
+        self.init_database()
+
+    def init_database(self):
+        """データベース初期化"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS publish_journal (
+                    blog_key TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    entry_url TEXT,
+                    edit_url TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (blog_key, title)
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def hash_content(title: str, content: str, category: str = "") -> str:
+        """投稿内容のハッシュを計算"""
+        digest = hashlib.sha256()
+        for part in (title, category, content):
+            digest.update(part.encode('utf-8'))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, blog_key: str, title: str) -> Optional[JournalRecord]:
+        """投稿記録を取得"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute('''
+                SELECT blog_key, title, content_hash, status, entry_url, edit_url
+                FROM publish_journal WHERE blog_key = ? AND title = ?
+            ''', (blog_key, title)).fetchone()
+        finally:
+            conn.close()
+
+        return JournalRecord(*row) if row else None
+
+    def _upsert(self, record: JournalRecord) -> None:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('''
+                INSERT INTO publish_journal
+                    (blog_key, title, content_hash, status, entry_url, edit_url, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(blog_key, title) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    status = excluded.status,
+                    entry_url = COALESCE(excluded.entry_url, publish_journal.entry_url),
+                    edit_url = COALESCE(excluded.edit_url, publish_journal.edit_url),
+                    updated_at = excluded.updated_at
+            ''', (record.blog_key, record.title, record.content_hash, record.status,
+                  record.entry_url, record.edit_url, _timestamp(datetime.now())))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def mark_pending(self, blog_key: str, title: str, content_hash: str) -> None:
+        """投稿リクエスト送信前の記録"""
+        self._upsert(JournalRecord(blog_key, title, content_hash, STATUS_PENDING))
+
+    def mark_published(self, blog_key: str, title: str, content_hash: str,
+                       entry_url: Optional[str], edit_url: Optional[str]) -> None:
+        """投稿成功の記録"""
+        self._upsert(JournalRecord(blog_key, title, content_hash, STATUS_PUBLISHED, entry_url, edit_url))
+
+    def cleanup_old_records(self, days: int = 30) -> int:
+        """古い記録を削除"""
+        cutoff_date = datetime.now() - timedelta(days=days)
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute('DELETE FROM publish_journal WHERE updated_at < ?', (_timestamp(cutoff_date),))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
@@ -0,0 +1,49 @@
+import requests
+
+from publishers.base_publisher import BasePublisher
+from utils.constants import DEFAULT_PUBLISH_TIMEOUT, USER_AGENT
+from utils.http import get_session
+from utils.retry_policy import RetryPolicy, call_with_retry
+
+# 受信側で重複排除できるとは限らないため、送信済みの可能性があるタイムアウトは再試行しない
+WEBHOOK_RETRY_POLICY = RetryPolicy(max_retries=2, base_delay=2.0, idempotent=False)
+
+class WebhookPublisher(BasePublisher):
+    """記事をJSONでWebhookにPOSTする投稿先
+
+    送信する本文: {"title": ..., "content": ..., "category": ...}
+    """
+
+    def __init__(self, name: str, url: str, required: bool = False,
+                 timeout_seconds: float = DEFAULT_PUBLISH_TIMEOUT) -> None:
+        super().__init__(name, required, timeout_seconds)
+        if not url:
+            raise ValueError(f"WebhookのURLが設定されていません: {name}")
+        self.url = url
+
+    def _post(self, payload: dict) -> requests.Response:
+        response = get_session().post(
+            self.url, json=payload, headers={'User-Agent': USER_AGENT},
+            # 1回の送信が投稿先全体のタイムアウトを使い切らないようにする
+            timeout=min(30, self.timeout_seconds)
+        )
+        response.raise_for_status()
+        return response
+
+    def publish(self, title: str, content: str, category: str = "AI") -> bool:
+        """WebhookにPOST"""
+        self.last_url = None
+        payload = {'title': title, 'content': content, 'category': category}
+        try:
+            response = call_with_retry(self._post, payload, policy=WEBHOOK_RETRY_POLICY)
+        except requests.HTTPError as e:
+            print(f"❌ Webhook送信失敗 ({self.name}): {e.response.status_code}")
+            return False
+        except Exception as e:
+            print(f"❌ Webhook送信エラー ({self.name}): {e}")
+            return False
+
+        # 受信側が投稿先URLを返す場合は Location ヘッダーから取得
+        self.last_url = response.headers.get('Location')
+        print(f"✅ Webhook送信成功 ({self.name}): {response.status_code}")
+        return True
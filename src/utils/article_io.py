@@ -0,0 +1,190 @@
+"""
+記事ファイルの入出力
+
+段階（収集・フィルタ・スコアリング）の間で受け渡す記事リストを、スキーマ付きの
+JSON Lines（gzip圧縮）で読み書きする。
+
+    1行目:  ヘッダ {"schema": "news-publisher/articles", "version": 1, "fields": [...],
+                    "count": 件数, "digest": 記事行のSHA-256, "meta": {...}}
+    2行目〜: 記事1件を fields の順に並べたJSON配列
+
+digest は記事の内容だけから計算するため、同じ記事リストからは同じ値になる。
+次の段階はヘッダだけを読んで入力が変わったかどうかを判定できる。
+生成した記事本文（Markdown）は本文をそのまま書き出し、メタデータは <ファイル名>.meta.json に置く。
+
+書き出しは一時ファイルを経由するため、途中で失敗しても不完全なファイルは残らない。
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from collectors.base_collector import Article
+
+SCHEMA = "news-publisher/articles"
+SCHEMA_VERSION = 1
+ARTICLE_FIELDS: Tuple[str, ...] = ('title', 'url', 'summary', 'published_date', 'source', 'score', 'category')
+COMPRESSION_LEVEL = 6
+
+class ArticleSet(NamedTuple):
+    """記事ファイルの内容"""
+    header: Dict[str, Any]
+    articles: List[Article]
+
+    @property
+    def digest(self) -> str:
+        """記事の内容のダイジェスト"""
+        return self.header['digest']
+
+def article_to_row(article: Article) -> List[Any]:
+    """記事を ARTICLE_FIELDS の順の値にする"""
+    return [
+        article.title,
+        article.url,
+        article.summary,
+        article.published_date.isoformat() if article.published_date else None,
+        article.source,
+        article.score,
+        article.category,
+    ]
+
+def article_from_dict(data: Mapping[str, Any]) -> Article:
+    """項目名 -> 値 から記事を復元（知らない項目は無視し、ない項目は既定値にする）
+
+    Raises:
+        ValueError: 必須項目がない・値が不正な場合
+    """
+    try:
+        published_date = data.get('published_date')
+        return Article(
+            title=data['title'],
+            url=data['url'],
+            summary=data.get('summary') or "",
+            published_date=datetime.fromisoformat(published_date) if published_date else None,
+            source=data.get('source') or "",
+            score=data.get('score', 0.0),
+            category=data.get('category') or "",
+        )
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"記事データが不正です: {e}")
+
+def content_digest(text: str) -> str:
+    """記事本文などのテキストのダイジェスト"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+def write_articles(path, articles: Iterable[Article],
+                   meta: Optional[Mapping[str, Any]] = None) -> ArticleSet:
+    """記事をスキーマ付きの JSON Lines（gzip圧縮）で書き出す
+
+    gzip ヘッダの時刻は0に固定し、同じ内容からは同じバイト列を出力する。
+
+    Returns:
+        書き出したヘッダと記事
+    """
+    articles = list(articles)
+    rows = [json.dumps(article_to_row(article), ensure_ascii=False) for article in articles]
+    body = "".join(f"{row}\n" for row in rows)
+    header = {
+        'schema': SCHEMA,
+        'version': SCHEMA_VERSION,
+        'fields': list(ARTICLE_FIELDS),
+        'count': len(rows),
+        'digest': content_digest(body),
+        'meta': dict(meta or {}),
+    }
+
+    buffer = io.BytesIO()
+    with gzip.GzipFile(filename="", mode='wb', fileobj=buffer,
+                       compresslevel=COMPRESSION_LEVEL, mtime=0) as gz:
+        gz.write(json.dumps(header, ensure_ascii=False).encode('utf-8'))
+        gz.write(b"\n")
+        gz.write(body.encode('utf-8'))
+    _atomic_write(Path(path), buffer.getvalue())
+    return ArticleSet(header, articles)
+
+def _parse_header(line: str, path) -> Dict[str, Any]:
+    try:
+        header = json.loads(line)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get('schema') != SCHEMA:
+        raise ValueError(f"記事ファイルではありません: {path}")
+    if header.get('version') != SCHEMA_VERSION:
+        raise ValueError(f"未対応の記事ファイル形式です: version={header.get('version')} ({path})")
+    return header
+
+def read_header(path) -> Dict[str, Any]:
+    """記事ファイルのヘッダだけを読み込む
+
+    Raises:
+        FileNotFoundError: ファイルがない場合
+        ValueError: 記事ファイルでない・壊れている場合
+    """
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return _parse_header(f.readline(), path)
+    except FileNotFoundError:
+        raise
+    except (OSError, EOFError, UnicodeDecodeError) as e:
+        raise ValueError(f"記事ファイルが壊れています: {path}: {e}")
+
+def read_articles(path) -> ArticleSet:
+    """write_articles() で書き出したファイルを読み込む
+
+    Raises:
+        FileNotFoundError: ファイルがない場合
+        ValueError: 記事ファイルでない・壊れている場合
+    """
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            header = _parse_header(f.readline(), path)
+            fields = header['fields']
+            articles = [
+                article_from_dict(dict(zip(fields, json.loads(line))))
+                for line in f if line.strip()
+            ]
+    except FileNotFoundError:
+        raise
+    except (OSError, EOFError, UnicodeDecodeError, TypeError) as e:
+        raise ValueError(f"記事ファイルが壊れています: {path}: {e}")
+
+    if len(articles) != header.get('count'):
+        raise ValueError(f"記事ファイルの件数が一致しません: {path}")
+    return ArticleSet(header, articles)
+
+def _meta_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.meta.json")
+
+def write_document(path, content: str, meta: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """生成した記事本文を書き出し、メタデータ（digest など）を隣に保存する
+
+    Returns:
+        書き出したメタデータ
+    """
+    path = Path(path)
+    document_meta = {'digest': content_digest(content), 'meta': dict(meta or {})}
+    _atomic_write(path, content.encode('utf-8'))
+    _atomic_write(_meta_path(path), json.dumps(document_meta, ensure_ascii=False, indent=2).encode('utf-8'))
+    return document_meta
+
+def read_document_meta(path) -> Optional[Dict[str, Any]]:
+    """write_document() のメタデータ（ない・読み込めない場合は None）"""
+    try:
+        return json.loads(_meta_path(Path(path)).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
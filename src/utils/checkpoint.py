@@ -0,0 +1,161 @@
+"""
+段階別チェックポイント
+
+1回の実行の途中結果を data/checkpoints/YYYYMMDD/ に段階ごとに保存する。
+collect / filter / score / generate / publish サブコマンドも、入出力を省略したときはここを使う。
+
+    collected.jsonl.gz  収集した全記事（キーワードフィルタ済み）
+    filtered.jsonl.gz   重複・日付・品質フィルタを通った記事
+    scored.jsonl.gz     スコアを付けてスコア順に並べた記事
+    generated.md        生成した記事本文（Markdown。再開前に手で修正してもよい）
+    published.json      投稿が完了した記録
+
+各段階の出力には入力から計算したフィンガープリント（前段の digest・設定ファイル・実行日など）を
+記録しておき、同じフィンガープリントの出力があればその段階は実行せずに再利用する。
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .article_io import ArticleSet, content_digest, read_articles, read_document_meta, read_header
+from .config import get_data_dir
+from .constants import CHECKPOINT_DATE_FORMAT, CHECKPOINT_DIR_NAME, CHECKPOINT_RETENTION_DAYS
+
+STAGE_COLLECTED = "collected"
+STAGE_FILTERED = "filtered"
+STAGE_SCORED = "scored"
+STAGE_GENERATED = "generated"
+STAGE_PUBLISHED = "published"
+
+# 実行順
+STAGES = (STAGE_COLLECTED, STAGE_FILTERED, STAGE_SCORED, STAGE_GENERATED, STAGE_PUBLISHED)
+
+_FILENAMES = {
+    STAGE_COLLECTED: "collected.jsonl.gz",
+    STAGE_FILTERED: "filtered.jsonl.gz",
+    STAGE_SCORED: "scored.jsonl.gz",
+    STAGE_GENERATED: "generated.md",
+    STAGE_PUBLISHED: "published.json",
+}
+
+def checkpoint_root() -> Path:
+    """チェックポイントの保存先"""
+    return get_data_dir() / CHECKPOINT_DIR_NAME
+
+def fingerprint(*parts: Any) -> str:
+    """段階の入力を表す値からフィンガープリントを作成"""
+    return hashlib.sha256("\0".join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+def config_digest(config, *filenames: str) -> str:
+    """設定ファイルの内容のダイジェスト（存在しないファイルは空として扱う）"""
+    digest = hashlib.sha256()
+    for name in filenames:
+        digest.update(name.encode('utf-8') + b"\0")
+        try:
+            digest.update(Path(config.config_path(name)).read_bytes())
+        except FileNotFoundError:
+            pass
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def load_current_articles(path: Path, key: str) -> Optional[ArticleSet]:
+    """path が同じフィンガープリントの入力から作られていれば読み込む（それ以外は None）"""
+    try:
+        if read_header(path)['meta'].get('fingerprint') != key:
+            return None
+        return read_articles(path)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        print(f"⚠️  前回の出力を読み込めないためやり直します: {e}")
+        return None
+
+def load_current_document(path: Path, key: str) -> Optional[str]:
+    """生成した記事本文が同じフィンガープリントの入力から作られていれば読み込む（それ以外は None）
+
+    本文を手で修正した場合も、入力が同じであれば修正後の本文を使う。
+    """
+    meta = read_document_meta(path)
+    if meta is None or meta.get('meta', {}).get('fingerprint') != key:
+        return None
+    try:
+        content = Path(path).read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
+    return content if content.strip() else None
+
+class RunCheckpoint:
+    """実行日ごとのチェックポイント"""
+
+    def __init__(self, run_date: date, root: Optional[Path] = None) -> None:
+        self.run_date = run_date
+        self.path = (root or checkpoint_root()) / run_date.strftime(CHECKPOINT_DATE_FORMAT)
+
+    def stage_path(self, stage: str) -> Path:
+        """段階の出力ファイル"""
+        return self.path / _FILENAMES[stage]
+
+    def completed_stages(self) -> List[str]:
+        """出力がある段階（実行順）"""
+        return [stage for stage in STAGES if self.stage_path(stage).exists()]
+
+    def clear(self) -> None:
+        """この実行日のチェックポイントを全て削除"""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def published_record(self) -> Optional[Dict[str, Any]]:
+        """投稿完了の記録（未投稿の場合は None）"""
+        try:
+            return json.loads(self.stage_path(STAGE_PUBLISHED).read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # 記録が壊れていても投稿自体は完了している
+            return {}
+
+    def is_published(self, content: str) -> bool:
+        """同じ本文の記事を今日すでに投稿したか"""
+        record = self.published_record()
+        return record is not None and record.get('digest') in (None, content_digest(content))
+
+    def mark_published(self, title: str, content: str, destinations: List[str], published_at: datetime) -> None:
+        """投稿完了を記録"""
+        record = {
+            'title': title,
+            'digest': content_digest(content),
+            'destinations': destinations,
+            'published_at': published_at.isoformat(timespec='seconds'),
+        }
+        path = self.stage_path(STAGE_PUBLISHED)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(record, ensure_ascii=False, indent=2), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+def cleanup_checkpoints(today: date, days: int = CHECKPOINT_RETENTION_DAYS,
+                        root: Optional[Path] = None) -> int:
+    """保存期間を過ぎたチェックポイントを削除
+
+    Returns:
+        削除した実行日の数
+    """
+    root = root or checkpoint_root()
+    if not root.is_dir():
+        return 0
+
+    cutoff = today - timedelta(days=days)
+    deleted = 0
+    for path in root.iterdir():
+        try:
+            run_date = datetime.strptime(path.name, CHECKPOINT_DATE_FORMAT).date()
+        except ValueError:
+            continue
+        if run_date < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+            deleted += 1
+    return deleted
@@ -0,0 +1,203 @@
+"""
+コンパイル済み設定
+
+YAML設定ファイルの解析結果と、各コンポーネントが使う派生データ（小文字化したキーワード、
+ソース別スコア表など）を data/compiled_config.pickle に保存し、次回の起動では YAML を解析せずに読み込む。
+元の設定ファイルの更新時刻・サイズが1つでも変わっていれば作り直す。
+
+スナップショットは pickle 形式のため、このモジュールが書き出したローカルファイル以外は読み込まないこと。
+"""
+
+import os
+import pickle
+import threading
+from dataclasses import dataclass, fields
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from . import metrics
+from .config import CacheEntry, config_cache, freeze, get_data_dir, thaw
+from .constants import BASE_SCORE, HIGH_IMPORTANCE_KEYWORDS, MEDIUM_IMPORTANCE_KEYWORDS
+
+SNAPSHOT_FILENAME = "compiled_config.pickle"
+FORMAT_VERSION = 2
+
+# スナップショットに含める設定ファイル（起動時に必ず読むもの）
+COMPILED_FILES: Tuple[str, ...] = ("sources.yml", "keywords.yml", "control.yml", "templates.yml")
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    """設定から導出したデータ（キーワードは全て小文字化済み）"""
+    include_keywords: Tuple[str, ...]
+    exclude_keywords: Tuple[str, ...]
+    high_importance_keywords: Tuple[str, ...]
+    medium_importance_keywords: Tuple[str, ...]
+    source_scores: Mapping[str, float]
+    default_source_score: float
+
+    def source_score(self, source: str) -> float:
+        """ソース別の基本スコアを取得"""
+        return self.source_scores.get(source, self.default_source_score)
+
+def _lowercase_keywords(settings: Mapping[str, Any], key: str, default=()) -> Tuple[str, ...]:
+    """キーワードのリストを小文字化（文字列以外は無視）
+
+    Raises:
+        ValueError: リストでない場合
+    """
+    values = settings.get(key, default)
+    if not isinstance(values, (list, tuple)):
+        raise ValueError(f"{key} must be a list")
+    return tuple(value.lower() for value in values if isinstance(value, str))
+
+def compile_config(data: Mapping[str, Mapping[str, Any]]) -> CompiledConfig:
+    """設定ファイル名 -> 内容 から派生データを作成
+
+    Raises:
+        ValueError: キーワード・スコアの設定が不正な場合
+    """
+    sources = data.get("sources.yml") or _EMPTY
+    keywords = data.get("keywords.yml") or _EMPTY
+
+    scores: Dict[str, float] = {}
+    try:
+        for source in sources.get('rss_sources') or ():
+            if 'score' in source:
+                scores[source['name']] = float(source['score'])
+        for account in sources.get('twitter_accounts') or ():
+            if 'score' in account:
+                display_name = account.get('display_name', account['account'])
+                scores[f"Twitter - {display_name}"] = float(account['score'])
+        default_score = float(sources.get('default_source_score', BASE_SCORE))
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"sources.ymlのスコア設定が不正です: {e}")
+
+    return CompiledConfig(
+        include_keywords=_lowercase_keywords(keywords, 'include_keywords'),
+        exclude_keywords=_lowercase_keywords(keywords, 'exclude_keywords'),
+        high_importance_keywords=_lowercase_keywords(keywords, 'high_importance_keywords', HIGH_IMPORTANCE_KEYWORDS),
+        medium_importance_keywords=_lowercase_keywords(keywords, 'medium_importance_keywords', MEDIUM_IMPORTANCE_KEYWORDS),
+        source_scores=MappingProxyType(scores),
+        default_source_score=default_score,
+    )
+
+def snapshot_path() -> Path:
+    """スナップショットの保存先"""
+    return get_data_dir() / SNAPSHOT_FILENAME
+
+def _current_entries(config) -> Dict[str, CacheEntry]:
+    """対象の設定ファイルを（キャッシュ経由で）読み込む。存在しないファイルは含めない"""
+    entries: Dict[str, CacheEntry] = {}
+    for name in COMPILED_FILES:
+        try:
+            entries[name] = config_cache.get_entry(config.config_path(name))
+        except FileNotFoundError:
+            continue
+    return entries
+
+def load_snapshot(config, path: Optional[Path] = None) -> Optional[CompiledConfig]:
+    """スナップショットを読み込み、解析済みの設定を設定キャッシュに登録する
+
+    Returns:
+        設定ファイルが書き出し時から変わっていなければ CompiledConfig、それ以外は None
+    """
+    path = path or snapshot_path()
+    try:
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠️  コンパイル済み設定を読み込めないため作り直します: {e}")
+        return None
+
+    if (not isinstance(snapshot, dict)
+            or snapshot.get('format_version') != FORMAT_VERSION
+            or snapshot.get('config_dir') != str(config.config_dir)):
+        return None
+
+    files: Dict[str, Tuple[int, int, Any]] = snapshot['files']
+    for name in COMPILED_FILES:
+        entry = files.get(name)
+        try:
+            stat = os.stat(config.config_path(name))
+        except FileNotFoundError:
+            if entry is None:
+                continue
+            return None
+        if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            return None
+
+    # 設定値は通常の dict / list で保存しているため、変更不可に戻してから登録する
+    for name, (mtime_ns, size, data) in files.items():
+        config_cache.prime(config.config_path(name), CacheEntry(mtime_ns, size, freeze(data)))
+    return CompiledConfig(**{name: freeze(value) for name, value in snapshot['compiled'].items()})
+
+def save_snapshot(config, entries: Mapping[str, CacheEntry], compiled: CompiledConfig,
+                  path: Optional[Path] = None) -> None:
+    """スナップショットを書き出す（失敗しても実行は続ける）
+
+    MappingProxyType は pickle できないため、設定値は thaw() で通常の dict / list にして保存する。
+    """
+    path = path or snapshot_path()
+    snapshot = {
+        'format_version': FORMAT_VERSION,
+        'config_dir': str(config.config_dir),
+        'files': {name: (entry.mtime_ns, entry.size, thaw(entry.data)) for name, entry in entries.items()},
+        'compiled': {f.name: thaw(getattr(compiled, f.name)) for f in fields(CompiledConfig)},
+    }
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except (OSError, pickle.PicklingError) as e:
+        print(f"⚠️  コンパイル済み設定を保存できません: {e}")
+
+# 設定ディレクトリ -> (元にした設定ファイルのエントリ, CompiledConfig)
+_compiled: Dict[str, Tuple[Dict[str, CacheEntry], CompiledConfig]] = {}
+_lock = threading.Lock()
+
+def _is_current(cached: Dict[str, CacheEntry], entries: Dict[str, CacheEntry]) -> bool:
+    """設定キャッシュの内容が作成時と同じオブジェクトか（ファイルが変わると別オブジェクトになる）"""
+    return cached.keys() == entries.keys() and all(
+        cached[name].data is entry.data for name, entry in entries.items()
+    )
+
+def get_compiled_config(config) -> CompiledConfig:
+    """CompiledConfig を取得
+
+    プロセスで初めて呼ばれたときはスナップショットを読み込み、設定ファイルが変わっていれば
+    作り直してスナップショットも更新する。
+    """
+    key = str(config.config_dir)
+    if key not in _compiled:
+        with _lock:
+            if key not in _compiled:
+                compiled = load_snapshot(config)
+                metrics.cache("config_snapshot", hit=compiled is not None)
+                if compiled is not None:
+                    _compiled[key] = (_current_entries(config), compiled)
+
+    entries = _current_entries(config)
+    cached = _compiled.get(key)
+    if cached is not None and _is_current(cached[0], entries):
+        return cached[1]
+
+    with _lock:
+        cached = _compiled.get(key)
+        if cached is not None and _is_current(cached[0], entries):
+            return cached[1]
+        compiled = compile_config({name: entry.data for name, entry in entries.items()})
+        _compiled[key] = (entries, compiled)
+        save_snapshot(config, entries, compiled)
+    return compiled
+
+def clear_compiled_cache() -> None:
+    """メモリ上の CompiledConfig を破棄（次回はスナップショットから読み込む）"""
+    with _lock:
+        _compiled.clear()
@@ -1,85 +1,358 @@
 import os
+import threading
+import time
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union
-from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, NamedTuple, Optional
+
+from .constants import CONFIG_STAT_INTERVAL_SECONDS, CONFIG_WATCH_INTERVAL_SECONDS
+
+if TYPE_CHECKING:
+    from .compiled_config import CompiledConfig
+
+# LibYAML が使える環境では C 実装のローダーで解析する（純Python版の数十倍速い）
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+ConfigListener = Callable[[str, Mapping[str, Any]], None]
+
+def get_base_dir() -> Path:
+    """リポジトリのルートディレクトリを取得"""
+    return Path(__file__).parent.parent.parent
+
+def get_data_dir() -> Path:
+    """状態ファイル（履歴DBなど）の保存先を取得
+
+    環境変数 NEWS_PUBLISHER_DATA_DIR で変更できる（ベンチマーク・検証用）。
+    """
+    data_dir = os.environ.get('NEWS_PUBLISHER_DATA_DIR')
+    if data_dir:
+        return Path(data_dir)
+    return get_base_dir() / "data"
+
+def freeze(value: Any) -> Any:
+    """設定値を変更不可にする（dict → MappingProxyType, list → tuple）"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(v) for key, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+def thaw(value: Any) -> Any:
+    """freeze() した設定値を通常の dict / list に戻す（pickle などに渡す場合）"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(v) for key, v in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+class CacheEntry(NamedTuple):
+    mtime_ns: int
+    size: int
+    data: Mapping[str, Any]
+
+class ConfigCache:
+    """YAML設定ファイルのプロセス内共有キャッシュ
+
+    ファイルの更新時刻（ナノ秒）とサイズが変わったときだけ再解析し、変更不可のビューを返す。
+    更新の確認（stat）はファイルごとに CONFIG_STAT_INTERVAL_SECONDS に1回まで。
+    監視スレッドの起動中はアクセス時の確認を行わず、監視スレッドが変更を検知して
+    再読み込みとリスナーへの通知を行う。
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, CacheEntry] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        self._listeners: List[ConfigListener] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def _parse(path: str) -> CacheEntry:
+        """ファイルを解析（stat は開いたファイルから取り、読み込み中の書き換えを取りこぼさない）
+
+        Raises:
+            FileNotFoundError: ファイルが見つからない場合
+            ValueError: YAML解析エラー・辞書形式でない場合
+        """
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            try:
+                data = yaml.load(f, Loader=_YAML_LOADER) or {}
+            except yaml.YAMLError as e:
+                raise ValueError(f"YAML解析エラー: {e}")
+        if not isinstance(data, dict):
+            raise ValueError(f"設定ファイルは辞書形式である必要があります: {os.path.basename(path)}")
+        return CacheEntry(stat.st_mtime_ns, stat.st_size, freeze(data))
+
+    def get(self, path: str) -> Mapping[str, Any]:
+        """設定ファイルの内容を取得（変更されていればキャッシュを更新）
+
+        Raises:
+            FileNotFoundError: ファイルが見つからない場合
+            ValueError: YAML解析エラー・辞書形式でない場合
+        """
+        return self.get_entry(path).data
+
+    def get_entry(self, path: str) -> CacheEntry:
+        """get() と同じく読み込み、更新時刻・サイズ付きのエントリを返す"""
+        entry = self._entries.get(path)
+        if entry is not None:
+            if self._watcher is not None:
+                return entry
+            now = time.monotonic()
+            if now - self._checked_at.get(path, 0.0) < CONFIG_STAT_INTERVAL_SECONDS:
+                return entry
+            stat = os.stat(path)
+            if entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                self._checked_at[path] = now
+                return entry
+
+        with self._lock:
+            entry = self._parse(path)
+            self._entries[path] = entry
+            self._checked_at[path] = time.monotonic()
+        return entry
+
+    def prime(self, path: str, entry: CacheEntry) -> None:
+        """解析済みの内容を登録（呼び出し側で更新時刻・サイズが一致することを確認済みであること）"""
+        with self._lock:
+            self._entries[path] = entry
+            self._checked_at[path] = time.monotonic()
+
+    def clear(self) -> None:
+        """キャッシュをクリア"""
+        with self._lock:
+            self._entries.clear()
+            self._checked_at.clear()
+
+    def add_listener(self, callback: ConfigListener) -> None:
+        """設定ファイルの変更時に呼ばれるコールバック (ファイル名, 新しい内容) を登録"""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def remove_listener(self, callback: ConfigListener) -> None:
+        """登録したコールバックを解除"""
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def check_for_changes(self) -> List[str]:
+        """読み込み済みのファイルの変更を確認し、再読み込みしてリスナーに通知する
+
+        解析できない内容に書き換えられた場合は警告を出し、前回の内容を使い続ける。
+
+        Returns:
+            変更されたファイル名のリスト
+        """
+        changed: List[CacheEntry] = []
+        names: List[str] = []
+        for path, entry in list(self._entries.items()):
+            name = os.path.basename(path)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                # 次のアクセスで FileNotFoundError になるようキャッシュから外す
+                with self._lock:
+                    self._entries.pop(path, None)
+                continue
+            if entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                continue
+
+            try:
+                new_entry = self._parse(path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  設定ファイルを再読み込みできません。前回の設定を使い続けます ({name}): {e}")
+                new_entry = CacheEntry(stat.st_mtime_ns, stat.st_size, entry.data)
+                with self._lock:
+                    self._entries[path] = new_entry
+                continue
+
+            with self._lock:
+                self._entries[path] = new_entry
+            changed.append(new_entry)
+            names.append(name)
+
+        with self._lock:
+            listeners = list(self._listeners)
+        for name, entry in zip(names, changed):
+            print(f"🔄 設定ファイルを再読み込みしました: {name}")
+            for callback in listeners:
+                try:
+                    callback(name, entry.data)
+                except Exception as e:
+                    print(f"⚠️  設定変更の通知でエラーが発生しました ({name}): {e}")
+        return names
+
+    @property
+    def watching(self) -> bool:
+        """監視スレッドが起動中か"""
+        return self._watcher is not None
+
+    def start_watching(self, interval: float = CONFIG_WATCH_INTERVAL_SECONDS) -> None:
+        """設定ファイルの監視スレッドを起動（起動済みの場合は何もしない）"""
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._stop_event.clear()
+            self._watcher = threading.Thread(
+                target=self._watch_loop, args=(interval,), name="config-watcher", daemon=True
+            )
+            self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """監視スレッドを停止"""
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            self._stop_event.set()
+            watcher.join()
+
+    def _watch_loop(self, interval: float) -> None:
+        while not self._stop_event.wait(interval):
+            self.check_for_changes()
+
+# 全ての Config インスタンスで共有するキャッシュ
+config_cache = ConfigCache()
 
 class Config:
     """設定管理クラス - 型安全性を強化"""
     
     def __init__(self) -> None:
-        self.base_dir: Path = Path(__file__).parent.parent.parent
+        self.base_dir: Path = get_base_dir()
         self.config_dir: Path = self.base_dir / "config"
+        self._paths: Dict[str, str] = {}
         
-        # キャッシュ機能
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_timestamps: Dict[str, datetime] = {}
-        self._cache_ttl: timedelta = timedelta(minutes=5)  # 5分間キャッシュ
-        
-    def load_yaml(self, filename: str) -> Dict[str, Any]:
+    def load_yaml(self, filename: str) -> Mapping[str, Any]:
         """YAML設定ファイルを読み込み（キャッシュ付き）
         
+        ファイルの更新時刻とサイズが変わるまでは解析済みの内容を返す。
+        返す値は変更不可（辞書は MappingProxyType、リストは tuple）。
+        
         Args:
             filename: 読み込むYAMLファイル名
             
         Returns:
-            設定データ辞書
+            設定データ
             
         Raises:
             FileNotFoundError: ファイルが見つからない場合
             ValueError: YAML解析エラーの場合
         """
-        # キャッシュチェック
-        now = datetime.now()
-        if (filename in self._cache and 
-            filename in self._cache_timestamps and
-            now - self._cache_timestamps[filename] < self._cache_ttl):
-            return self._cache[filename]
-        
-        file_path: Path = self.config_dir / filename
+        file_path = self.config_path(filename)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data: Dict[str, Any] = yaml.safe_load(f) or {}
-                
-                # 型チェック
-                if not isinstance(data, dict):
-                    raise ValueError(f"設定ファイルは辞書形式である必要があります: {filename}")
-                
-                # キャッシュに保存
-                self._cache[filename] = data
-                self._cache_timestamps[filename] = now
-                
-                return data
+            return config_cache.get(file_path)
         except FileNotFoundError:
             raise FileNotFoundError(f"設定ファイルが見つかりません: {file_path}")
-        except yaml.YAMLError as e:
-            raise ValueError(f"YAML解析エラー: {e}")
+    
+    def config_path(self, filename: str) -> str:
+        """設定ファイルのパスを取得"""
+        file_path = self._paths.get(filename)
+        if file_path is None:
+            file_path = self._paths[filename] = str(self.config_dir / filename)
+        return file_path
     
     def clear_cache(self) -> None:
         """キャッシュをクリア"""
-        self._cache.clear()
-        self._cache_timestamps.clear()
+        config_cache.clear()
+    
+    def add_change_listener(self, callback: ConfigListener) -> None:
+        """設定ファイルの変更時に呼ばれるコールバック (ファイル名, 新しい内容) を登録
+        
+        通知は start_watching() の監視スレッド、または check_for_changes() の呼び出し時に行われる。
+        """
+        config_cache.add_listener(callback)
+    
+    def remove_change_listener(self, callback: ConfigListener) -> None:
+        """登録したコールバックを解除"""
+        config_cache.remove_listener(callback)
+    
+    def check_for_changes(self) -> List[str]:
+        """設定ファイルの変更を確認して反映（変更されたファイル名を返す）"""
+        return config_cache.check_for_changes()
+    
+    def start_watching(self, interval: float = CONFIG_WATCH_INTERVAL_SECONDS) -> None:
+        """設定ファイルの監視を開始（常駐プロセス向け。監視中はアクセスごとの確認を省略する）"""
+        config_cache.start_watching(interval)
+    
+    def stop_watching(self) -> None:
+        """設定ファイルの監視を停止"""
+        config_cache.stop_watching()
     
     @property
-    def sources(self) -> Dict[str, Any]:
+    def sources(self) -> Mapping[str, Any]:
         """ソース設定を取得"""
         return self.load_yaml("sources.yml")
     
     @property 
-    def keywords(self) -> Dict[str, List[str]]:
+    def keywords(self) -> Mapping[str, Any]:
         """キーワード設定を取得"""
         return self.load_yaml("keywords.yml")
     
     @property
-    def control(self) -> Dict[str, Union[bool, int]]:
+    def control(self) -> Mapping[str, Any]:
         """制御設定を取得"""
         return self.load_yaml("control.yml")
     
     @property
-    def templates(self) -> Dict[str, Any]:
+    def templates(self) -> Mapping[str, Any]:
         """テンプレート設定を取得"""
         return self.load_yaml("templates.yml")
     
+    @property
+    def rate_limits(self) -> Mapping[str, Any]:
+        """レート制限設定を取得"""
+        return self.load_yaml("rate_limits.yml")
+    
+    @property
+    def publishers(self) -> Mapping[str, Any]:
+        """投稿先設定を取得（ファイルがない場合ははてなブログのみ）"""
+        try:
+            return self.load_yaml("publishers.yml")
+        except FileNotFoundError:
+            return {}
+    
+    @property
+    def compiled(self) -> "CompiledConfig":
+        """キーワード・スコア表などの派生データを取得（設定ファイルが変わると作り直す）"""
+        from .compiled_config import get_compiled_config
+        return get_compiled_config(self)
+    
+    @property
+    def endpoints(self) -> Dict[str, Any]:
+        """外部サービスの接続先を取得
+        
+        endpoints.yml の profile（環境変数 ENDPOINT_PROFILE で上書き可）に対応する設定を、
+        production の設定に重ねて返す。"{base_url}" はプロファイルの base_url
+        （環境変数 FAKE_SERVICES_URL で上書き可）に置換される。
+        """
+        try:
+            data = self.load_yaml("endpoints.yml")
+        except FileNotFoundError:
+            return {}
+        
+        profiles: Mapping[str, Mapping[str, Any]] = data.get('profiles') or {}
+        profile_name = os.environ.get('ENDPOINT_PROFILE') or data.get('profile', 'production')
+        if profile_name not in profiles:
+            raise ValueError(f"endpoints.ymlに存在しないプロファイルです: {profile_name}")
+        
+        endpoints: Dict[str, Any] = dict(profiles.get('production') or {})
+        endpoints.update(profiles[profile_name])
+        
+        base_url = os.environ.get('FAKE_SERVICES_URL') or endpoints.get('base_url') or ""
+        base_url = base_url.rstrip('/')
+        for key, value in endpoints.items():
+            if isinstance(value, str):
+                endpoints[key] = value.replace('{base_url}', base_url)
+            elif isinstance(value, (list, tuple)):
+                endpoints[key] = [
+                    v.replace('{base_url}', base_url) if isinstance(v, str) else v for v in value
+                ]
+        endpoints['profile'] = profile_name
+        return endpoints
+    
     @property
     def hatena_api_key(self) -> Optional[str]:
         """はてなAPIキーを取得"""
@@ -101,21 +374,24 @@ class Config:
         """Gemini APIキーを取得"""
         return os.environ.get('GEMINI_API_KEY')
     
-    def validate_env_vars(self) -> bool:
+    def validate_env_vars(self, require_gemini: bool = True, require_hatena: bool = True) -> bool:
         """必要な環境変数が設定されているかチェック
         
+        Args:
+            require_gemini: GEMINI_API_KEYを必須とするか（--no-llm 時はFalse）
+            require_hatena: HATENA_* を必須とするか（既定のはてなブログに投稿しない場合はFalse）
+            
         Returns:
             全ての必要な環境変数が設定されている場合True
             
         Raises:
             ValueError: 必要な環境変数が不足している場合
         """
-        required_vars: List[str] = [
-            'HATENA_API_KEY',
-            'HATENA_USERNAME',
-            'HATENA_BLOG_ID',
-            'GEMINI_API_KEY'
-        ]
+        required_vars: List[str] = []
+        if require_hatena:
+            required_vars.extend(['HATENA_API_KEY', 'HATENA_USERNAME', 'HATENA_BLOG_ID'])
+        if require_gemini:
+            required_vars.append('GEMINI_API_KEY')
         
         missing_vars: List[str] = []
         for var in required_vars:
@@ -16,17 +16,51 @@ MIN_SUMMARY_LENGTH = 20
 
 # 時間設定
 HISTORY_RETENTION_DAYS = 30
-CONFIG_CACHE_TTL_MINUTES = 5
+ARCHIVE_RETENTION_DAYS = 90
+CLEANUP_BATCH_SIZE = 1000
+CLEANUP_MAX_BATCHES_PER_RUN = 50
+CONFIG_STAT_INTERVAL_SECONDS = 1.0
+CONFIG_WATCH_INTERVAL_SECONDS = 2.0
 DEFAULT_SEARCH_HOURS_BACK = 20
 
+# 常駐モード（control.yml の daemon で上書き可）
+DAEMON_PUBLISH_TIME = "08:30"  # JST
+DAEMON_COLLECT_INTERVAL_MINUTES = 60
+DAEMON_FINAL_COLLECT_LEAD_MINUTES = 15
+CANDIDATE_MAX_AGE_HOURS = 24
+CANDIDATE_POOL_MAX_SIZE = 300
+
+# チェックポイント（段階ごとの途中結果）
+CHECKPOINT_DIR_NAME = "checkpoints"
+CHECKPOINT_RETENTION_DAYS = 7
+
+# 実行メトリクス（--metrics）
+METRICS_DIR_NAME = "metrics"
+METRICS_RETENTION_DAYS = 7
+
+# プロファイル（--profile、logs/ の下に書き出す）
+PROFILE_DIR_NAME = "profile"
+PROFILE_RETENTION_DAYS = 7
+PROFILE_TOP_ALLOCATIONS = 10  # 段階ごとに書き出すメモリ確保の多い箇所の数
+
 # API制限
 GEMINI_MAX_CALLS_PER_MINUTE = 15
 DEFAULT_REQUEST_TIMEOUT = 10
 RETRY_MAX_ATTEMPTS = 3
 RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+DEFAULT_PUBLISH_TIMEOUT = 120
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 10
+ASYNC_FETCH_CONCURRENCY = 8  # 非同期モードで同時に取得するフィード・アカウント数（HTTP_POOL_MAXSIZE 以下）
 
 # RSS取得
 RSS_MAX_ENTRIES = 10
+
+# フィード解析のプロセスプール（control.yml の feed_parsing で上書き可）
+FEED_PARSE_WORKERS = 0  # 0 でプロセスプールを使わない
+FEED_PARSE_MIN_BYTES = 16 * 1024  # これより小さいフィードは呼び出し元のプロセスで解析する
+FEED_PARSE_CHUNKSIZE = 4
 NITTER_REQUEST_TIMEOUT = 10
 
 # スコアリング
@@ -71,6 +105,7 @@ NITTER_INSTANCES = [
 DATE_FORMAT = '%Y/%m/%d'
 DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
 LOG_DATE_FORMAT = '%Y%m%d'
+CHECKPOINT_DATE_FORMAT = '%Y%m%d'
 
 # タイムゾーン設定
 TIMEZONE_JST = 'Asia/Tokyo'
\ No newline at end of file
@@ -1,118 +1,543 @@
 import sqlite3
 import hashlib
-from datetime import datetime, timedelta
+import threading
+import time
+import warnings
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .config import get_data_dir
+from .constants import ARCHIVE_RETENTION_DAYS, CLEANUP_BATCH_SIZE
+
+# PRAGMA user_version で管理するスキーマバージョン
+#   0: 旧スキーマ（URL・MD5文字列・UNIQUE制約と2つのインデックス）またはテーブルなし
+#   2: 64bit整数キーの WITHOUT ROWID テーブル + ソースID + epoch秒（URL・タイトルは保持しない）
+#   3: 収集した全記事のアーカイブ（article_archive）と全文検索インデックス（FTS5）を追加
+SCHEMA_VERSION = 3
+
+# trigram トークナイザは3文字未満の語を検索できないため、短い語は LIKE で絞り込む
+TRIGRAM_MIN_LENGTH = 3
+
+def url_key(url: str) -> int:
+    """URLから64bit整数キーを生成（SQLiteのINTEGERに収まる符号付き）
+    
+    100万件で衝突する確率は約3e-8。衝突した場合は既存記事として扱われる。
+    """
+    digest = hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+def _to_epoch(value) -> int:
+    """date / datetime をepoch秒に変換（dateはローカル時刻の0時）"""
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, date):
+        return int(datetime(value.year, value.month, value.day).timestamp())
+    return int(value)
+
+@dataclass
+class ArchivedArticle:
+    """アーカイブされた記事"""
+    url: str
+    title: str
+    summary: str
+    source: str
+    score: float
+    selected: bool
+    collected_at: datetime
+    published_at: Optional[datetime] = None
 
 class ArticleHistoryDB:
+    """投稿済み記事の履歴DB
+    
+    接続は最初の利用時に1本だけ開いて使い回す（WALモード・synchronous=NORMAL）。
+    NewsPublisher と ContentFilter は同じインスタンスを共有する。
+    with 文で使うと抜けるときに接続を閉じる（close 後に使うと自動で開き直す）。
+    """
+    
     def __init__(self, db_path=None):
         if db_path is None:
-            base_dir = Path(__file__).parent.parent.parent
-            db_path = base_dir / "data" / "history.db"
+            db_path = get_data_dir() / "history.db"
         
-        self.db_path = db_path
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        # 接続はスレッド間で共有するため、利用はロックで直列化する
+        self._lock = threading.RLock()
+        # ソース名 -> ソースID
+        self._source_ids: Dict[str, int] = {}
         self.init_database()
     
+    def __enter__(self) -> "ArticleHistoryDB":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """共有接続を取得（未接続なら開く）"""
+        with self._lock:
+            if self._conn is None:
+                # データディレクトリが存在しない場合は作成
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                
+                conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+                # WALでは読み取りが書き込みを待たず、NORMALでもコミット済みデータは電源断以外で失われない
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                self._conn = conn
+            return self._conn
+    
+    def close(self) -> None:
+        """接続を閉じる"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    @property
+    def schema_version(self) -> int:
+        """現在のスキーマバージョン"""
+        with self._lock:
+            return self.connection.execute('PRAGMA user_version').fetchone()[0]
+    
     def init_database(self):
-        """データベース初期化"""
-        # データディレクトリが存在しない場合は作成
-        self.db_path.parent.mkdir(exist_ok=True)
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS article_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                url TEXT UNIQUE NOT NULL,
+        """データベース初期化（古いスキーマの場合は順に移行する）"""
+        with self._lock:
+            conn = self.connection
+            if self.schema_version == SCHEMA_VERSION:
+                return
+            
+            # 別のプロセス（常駐モードとサブコマンドなど）が同時に移行しないよう、
+            # 書き込みロックを取ってからバージョンと旧テーブルの有無を確認する
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                version = self.schema_version
+                if version > SCHEMA_VERSION:
+                    raise ValueError(f"未対応のスキーマバージョンです: {version} ({self.db_path})")
+                if version == SCHEMA_VERSION:
+                    # 待っている間に別のプロセスが移行を終えた
+                    conn.commit()
+                    return
+                
+                legacy = version == 0 and conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'article_history'"
+                ).fetchone() is not None
+                
+                if version < 2:
+                    self._create_schema(conn, 'article_history_v2' if legacy else 'article_history')
+                    if legacy:
+                        migrated = self._migrate_legacy(conn)
+                    self._create_indexes(conn)
+                if version < 3:
+                    self._create_archive_schema(conn)
+                conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            
+            if legacy:
+                # 旧テーブル・インデックスの空きページを解放
+                conn.execute('VACUUM')
+                print(f"🗃️  履歴DBを新しいスキーマに移行しました（{migrated}件）")
+    
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection, table: str) -> None:
+        """現行スキーマのテーブルを作成"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS history_sources (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE NOT NULL
+            )
+        ''')
+        # 重複チェックに必要なのはキーだけなので、1行20バイト程度の固定長に近い行を
+        # 主キーのB-treeに直接格納する（URL・ハッシュ用の別インデックスを持たない）
+        conn.execute(f'''
+            CREATE TABLE {table} (
+                url_key INTEGER PRIMARY KEY,
+                source_id INTEGER NOT NULL DEFAULT 0,
+                published_at INTEGER NOT NULL,
+                created_at INTEGER NOT NULL
+            ) WITHOUT ROWID
+        ''')
+    
+    @staticmethod
+    def _migrate_legacy(conn: sqlite3.Connection) -> int:
+        """旧スキーマの article_history を移行（トランザクション内で呼ぶ。URL・タイトルは破棄）"""
+        conn.create_function('url_key', 1, url_key, deterministic=True)
+        # 旧スキーマの created_at はUTC（CURRENT_TIMESTAMP）、published_date はローカル日付
+        cursor = conn.execute('''
+            INSERT OR IGNORE INTO article_history_v2
+                (url_key, source_id, published_at, created_at)
+            SELECT url_key(url), 0,
+                   CAST(strftime('%s', published_date, 'utc') AS INTEGER),
+                   CAST(strftime('%s', created_at) AS INTEGER)
+            FROM article_history
+        ''')
+        conn.execute('DROP TABLE article_history')
+        conn.execute('ALTER TABLE article_history_v2 RENAME TO article_history')
+        return cursor.rowcount
+    
+    @staticmethod
+    def _create_indexes(conn: sqlite3.Connection) -> None:
+        """インデックスを作成（クリーンアップ用の登録日時のみ）"""
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_history_created_at ON article_history(created_at)')
+    
+    @staticmethod
+    def _create_archive_schema(conn: sqlite3.Connection) -> None:
+        """記事アーカイブと全文検索インデックスを作成"""
+        # url_key は rowid の別名になり、FTS5 の content_rowid として使う
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS article_archive (
+                url_key INTEGER PRIMARY KEY,
+                source_id INTEGER NOT NULL DEFAULT 0,
+                collected_at INTEGER NOT NULL,
+                published_at INTEGER,
+                score REAL NOT NULL DEFAULT 0,
+                selected INTEGER NOT NULL DEFAULT 0,
+                url TEXT NOT NULL,
                 title TEXT NOT NULL,
-                url_hash TEXT NOT NULL,
-                published_date DATE NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                summary TEXT NOT NULL DEFAULT ''
             )
         ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_archive_collected_at ON article_archive(collected_at)')
         
-        # インデックス作成
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_url_hash ON article_history(url_hash)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON article_history(created_at)')
+        # 日本語は単語の区切りがないため trigram を使う（古いSQLiteでは unicode61）
+        for tokenizer in ('trigram', 'unicode61'):
+            try:
+                conn.execute(f'''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS article_archive_fts USING fts5(
+                        title, summary,
+                        content='article_archive', content_rowid='url_key',
+                        tokenize='{tokenizer}'
+                    )
+                ''')
+                break
+            except sqlite3.OperationalError:
+                if tokenizer == 'unicode61':
+                    raise
         
-        conn.commit()
-        conn.close()
+        # 外部コンテンツ方式のFTSをアーカイブと同期（スコア・選択フラグの更新では索引を触らない）
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS article_archive_ai AFTER INSERT ON article_archive BEGIN
+                INSERT INTO article_archive_fts (rowid, title, summary)
+                VALUES (new.url_key, new.title, new.summary);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS article_archive_ad AFTER DELETE ON article_archive BEGIN
+                INSERT INTO article_archive_fts (article_archive_fts, rowid, title, summary)
+                VALUES ('delete', old.url_key, old.title, old.summary);
+            END
+        ''')
+        conn.execute('''
+            CREATE TRIGGER IF NOT EXISTS article_archive_au AFTER UPDATE OF title, summary ON article_archive BEGIN
+                INSERT INTO article_archive_fts (article_archive_fts, rowid, title, summary)
+                VALUES ('delete', old.url_key, old.title, old.summary);
+                INSERT INTO article_archive_fts (rowid, title, summary)
+                VALUES (new.url_key, new.title, new.summary);
+            END
+        ''')
+    
+    @property
+    def uses_trigram(self) -> bool:
+        """全文検索インデックスが trigram トークナイザかどうか"""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'article_archive_fts'"
+            ).fetchone()
+        return row is not None and 'trigram' in row[0]
     
     def generate_url_hash(self, url):
-        """URLのハッシュ値を生成"""
-        return hashlib.md5(url.encode('utf-8')).hexdigest()
+        """URLのハッシュ値（履歴DBの主キー）を生成"""
+        return url_key(url)
+    
+    def _source_id(self, conn: sqlite3.Connection, source: str) -> int:
+        """ソース名をIDに変換（未登録なら登録、空は0）"""
+        if not source:
+            return 0
+        source_id = self._source_ids.get(source)
+        if source_id is None:
+            conn.execute('INSERT OR IGNORE INTO history_sources (name) VALUES (?)', (source,))
+            source_id = conn.execute(
+                'SELECT id FROM history_sources WHERE name = ?', (source,)
+            ).fetchone()[0]
+            self._source_ids[source] = source_id
+        return source_id
     
     def is_duplicate(self, url):
         """URLが重複しているかチェック"""
-        url_hash = self.generate_url_hash(url)
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT 1 FROM article_history WHERE url_key = ?',
+                (url_key(url),)
+            ).fetchone()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return row is not None
+    
+    def history_fingerprint(self) -> str:
+        """投稿履歴の状態（記事の追加・削除で変わる。重複チェックの結果を再利用できるかの判定用）"""
+        with self._lock:
+            count, latest = self.connection.execute(
+                'SELECT COUNT(*), MAX(created_at) FROM article_history'
+            ).fetchone()
+        return f"{count}:{latest or 0}"
+    
+    def add_article(self, url, title, published_date=None, source=""):
+        """記事をデータベースに追加"""
+        return self.add_articles([(url, title, source)], published_date) == 1
+    
+    def add_articles(self, articles: Iterable[Sequence[str]], published_date=None) -> int:
+        """複数の記事を1トランザクションでまとめて追加
         
-        cursor.execute(
-            'SELECT COUNT(*) FROM article_history WHERE url_hash = ?',
-            (url_hash,)
-        )
-        count = cursor.fetchone()[0]
-        conn.close()
+        Args:
+            articles: (URL, タイトル) または (URL, タイトル, ソース名) のイテラブル（タイトルは記録しない）
+            published_date: 公開日（省略時は今日）
         
-        return count > 0
+        Returns:
+            新たに追加した件数（既存のURLは無視）
+        """
+        published_at = _to_epoch(published_date if published_date is not None else datetime.now().date())
+        created_at = int(time.time())
+        
+        with self._lock:
+            try:
+                with self.connection as conn:
+                    rows = [
+                        (url_key(url), self._source_id(conn, source[0] if source else ""),
+                         published_at, created_at)
+                        for url, _title, *source in articles
+                    ]
+                    if not rows:
+                        return 0
+                    
+                    before = conn.total_changes
+                    conn.executemany('''
+                        INSERT OR IGNORE INTO article_history
+                            (url_key, source_id, published_at, created_at)
+                        VALUES (?, ?, ?, ?)
+                    ''', rows)
+                    return conn.total_changes - before
+            except Exception:
+                # ロールバックで登録が取り消されたソースIDを使わないようにする
+                self._source_ids.clear()
+                raise
     
-    def add_article(self, url, title, published_date=None):
-        """記事をデータベースに追加"""
-        if published_date is None:
-            published_date = datetime.now().date()
-        
-        url_hash = self.generate_url_hash(url)
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute('''
-                INSERT INTO article_history (url, title, url_hash, published_date)
-                VALUES (?, ?, ?, ?)
-            ''', (url, title, url_hash, published_date))
-            conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            # 既に存在する場合
-            return False
-        finally:
-            conn.close()
-    
-    def cleanup_old_records(self, days=30):
+    def _delete_in_batches(self, table: str, column: str, cutoff: int,
+                           batch_size: int, max_batches: Optional[int]) -> int:
+        """cutoff 以前の行を batch_size 件ずつ別トランザクションで削除
+        
+        1回のトランザクションを短く保ち、バッチの合間に他の処理が接続を使えるようにする。
+        max_batches に達した場合は残りを次回に回す。
+        """
+        deleted = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            with self._lock, self.connection as conn:
+                cursor = conn.execute(f'''
+                    DELETE FROM {table} WHERE url_key IN (
+                        SELECT url_key FROM {table} WHERE {column} <= ? LIMIT ?
+                    )
+                ''', (cutoff, batch_size))
+            deleted += cursor.rowcount
+            batches += 1
+            if cursor.rowcount < batch_size:
+                break
+        return deleted
+    
+    def cleanup_old_records(self, days=30, batch_size: int = CLEANUP_BATCH_SIZE,
+                            max_batches: Optional[int] = None):
         """古いレコードを削除（デフォルト30日）"""
-        cutoff_date = datetime.now() - timedelta(days=days)
+        cutoff = int((datetime.now() - timedelta(days=days)).timestamp())
+        return self._delete_in_batches('article_history', 'created_at', cutoff, batch_size, max_batches)
+    
+    def cleanup_archive(self, days: int = ARCHIVE_RETENTION_DAYS, batch_size: int = CLEANUP_BATCH_SIZE,
+                        max_batches: Optional[int] = None) -> int:
+        """古いアーカイブを削除（全文検索インデックスはトリガーで同期）"""
+        cutoff = int((datetime.now() - timedelta(days=days)).timestamp())
+        return self._delete_in_batches('article_archive', 'collected_at', cutoff, batch_size, max_batches)
+    
+    def archive_articles(self, articles: Iterable[Any]) -> int:
+        """収集した記事をアーカイブに保存（既存の記事は収集日時・スコア・タイトル・要約を更新）
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        collected_at は最後に収集した日時。収集され続けている記事は保存期間・days の絞り込みで
+        古い記事として扱われない。
         
-        cursor.execute(
-            'DELETE FROM article_history WHERE created_at < ?',
-            (cutoff_date,)
-        )
-        deleted_count = cursor.rowcount
-        conn.commit()
-        conn.close()
+        Args:
+            articles: url / title / summary / source / score / published_date 属性を持つ記事
+        
+        Returns:
+            保存・更新した件数
+        """
+        collected_at = int(time.time())
         
-        return deleted_count
+        with self._lock:
+            try:
+                with self.connection as conn:
+                    rows = [
+                        (url_key(a.url), self._source_id(conn, a.source or ""), collected_at,
+                         _to_epoch(a.published_date) if a.published_date else None,
+                         float(a.score), a.url, a.title, a.summary or "")
+                        for a in articles
+                    ]
+                    if not rows:
+                        return 0
+                    
+                    # タイトル・要約は別に更新する（SET に含めると値が同じでもFTSの再索引トリガーが動く）
+                    cursor = conn.executemany('''
+                        INSERT INTO article_archive
+                            (url_key, source_id, collected_at, published_at, score, url, title, summary)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(url_key) DO UPDATE SET
+                            collected_at = excluded.collected_at,
+                            score = excluded.score
+                        WHERE article_archive.collected_at != excluded.collected_at
+                           OR article_archive.score != excluded.score
+                           OR article_archive.title != excluded.title
+                           OR article_archive.summary != excluded.summary
+                    ''', rows)
+                    # total_changes はトリガーによるFTSの変更も数えるため rowcount を使う
+                    changed = cursor.rowcount
+                    
+                    # 内容が変わった記事だけ再索引する
+                    conn.executemany('''
+                        UPDATE article_archive SET title = ?, summary = ?
+                        WHERE url_key = ? AND (title != ? OR summary != ?)
+                    ''', [(title, summary, key, title, summary)
+                          for key, _, _, _, _, _, title, summary in rows])
+                    return changed
+            except Exception:
+                self._source_ids.clear()
+                raise
+    
+    def mark_selected(self, urls: Iterable[str]) -> int:
+        """アーカイブの記事を投稿に採用済みにする"""
+        with self._lock, self.connection as conn:
+            cursor = conn.executemany(
+                'UPDATE article_archive SET selected = 1 WHERE url_key = ? AND selected = 0',
+                [(url_key(url),) for url in urls]
+            )
+            return cursor.rowcount
+    
+    def search_archive(self, query: str, days: Optional[int] = None, limit: int = 20,
+                       selected_only: bool = False) -> List[ArchivedArticle]:
+        """アーカイブを全文検索（空白区切りの語を全て含む記事を関連度順に返す）
+        
+        Args:
+            query: 検索語（空白区切りでAND検索）
+            days: 指定した場合、直近days日に収集した記事に限定
+            limit: 最大件数
+            selected_only: Trueの場合、投稿に採用した記事に限定
+        """
+        terms = query.split()
+        if not terms:
+            return []
+        
+        min_length = TRIGRAM_MIN_LENGTH if self.uses_trigram else 1
+        match_terms = [t for t in terms if len(t) >= min_length]
+        like_terms = [t for t in terms if len(t) < min_length]
+        
+        conditions: List[str] = []
+        params: List[Any] = []
+        if match_terms:
+            conditions.append('article_archive_fts MATCH ?')
+            params.append(' '.join('"' + t.replace('"', '""') + '"' for t in match_terms))
+        for term in like_terms:
+            conditions.append('(a.title LIKE ? OR a.summary LIKE ?)')
+            params.extend([f'%{term}%', f'%{term}%'])
+        if days is not None:
+            conditions.append('a.collected_at >= ?')
+            params.append(int((datetime.now() - timedelta(days=days)).timestamp()))
+        if selected_only:
+            conditions.append('a.selected = 1')
+        
+        if match_terms:
+            source = 'article_archive_fts JOIN article_archive a ON a.url_key = article_archive_fts.rowid'
+            order = 'article_archive_fts.rank'
+        else:
+            source = 'article_archive a'
+            order = 'a.collected_at DESC'
+        
+        with self._lock:
+            rows = self.connection.execute(f'''
+                SELECT a.url, a.title, a.summary, COALESCE(s.name, ''), a.score, a.selected,
+                       a.collected_at, a.published_at
+                FROM {source}
+                LEFT JOIN history_sources s ON s.id = a.source_id
+                WHERE {' AND '.join(conditions)}
+                ORDER BY {order}
+                LIMIT ?
+            ''', (*params, limit)).fetchall()
+        
+        return [
+            ArchivedArticle(
+                url, title, summary, source_name, score, bool(selected),
+                datetime.fromtimestamp(collected_at),
+                datetime.fromtimestamp(published_at) if published_at is not None else None
+            )
+            for url, title, summary, source_name, score, selected, collected_at, published_at in rows
+        ]
+    
+    def has_recent_coverage(self, query: str, days: int = 3, selected_only: bool = True) -> bool:
+        """直近days日に同じ話題を扱ったか（既定では投稿に採用した記事のみ）"""
+        return bool(self.search_archive(query, days=days, limit=1, selected_only=selected_only))
+    
+    def get_recent_keys(self, days=7):
+        """最近登録した記事のキー一覧を取得
+        
+        履歴にはURL・タイトルを保持しないため、URLの代わりに url_key() の値を返す
+        （URL・タイトルが必要な場合は search_archive() を使う）。
+        
+        Returns:
+            (URLキー, ソース名, 公開日 YYYY-MM-DD, 登録日時 YYYY-MM-DD HH:MM:SS) のリスト
+        """
+        cutoff = int((datetime.now() - timedelta(days=days)).timestamp())
+        
+        with self._lock:
+            rows = self.connection.execute('''
+                SELECT h.url_key, COALESCE(s.name, ''), h.published_at, h.created_at
+                FROM article_history h
+                LEFT JOIN history_sources s ON s.id = h.source_id
+                WHERE h.created_at >= ?
+                ORDER BY h.created_at DESC
+            ''', (cutoff,)).fetchall()
+        
+        return [
+            (key, source,
+             date.fromtimestamp(published_at).isoformat(),
+             datetime.fromtimestamp(created_at).strftime('%Y-%m-%d %H:%M:%S'))
+            for key, source, published_at, created_at in rows
+        ]
     
     def get_recent_articles(self, days=7):
-        """最近の記事一覧を取得"""
-        cutoff_date = datetime.now() - timedelta(days=days)
+        """最近登録した記事の一覧を取得（非推奨: get_recent_keys() または search_archive() を使う）
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        スキーマ v2 以降の履歴はURL・タイトルを持たないため、アーカイブに残っている記事だけ
+        URL・タイトルを返す（旧スキーマから移行した記事・アーカイブから削除された記事は None）。
         
-        cursor.execute('''
-            SELECT url, title, published_date, created_at 
-            FROM article_history 
-            WHERE created_at >= ?
-            ORDER BY created_at DESC
-        ''', (cutoff_date,))
+        Returns:
+            (URL, タイトル, 公開日 YYYY-MM-DD, 登録日時 YYYY-MM-DD HH:MM:SS) のリスト
+        """
+        warnings.warn(
+            "get_recent_articles() is deprecated; use get_recent_keys() or search_archive()",
+            DeprecationWarning, stacklevel=2
+        )
+        cutoff = int((datetime.now() - timedelta(days=days)).timestamp())
         
-        articles = cursor.fetchall()
-        conn.close()
+        with self._lock:
+            rows = self.connection.execute('''
+                SELECT a.url, a.title, h.published_at, h.created_at
+                FROM article_history h
+                LEFT JOIN article_archive a ON a.url_key = h.url_key
+                WHERE h.created_at >= ?
+                ORDER BY h.created_at DESC
+            ''', (cutoff,)).fetchall()
         
-        return articles
\ No newline at end of file
+        return [
+            (url, title,
+             date.fromtimestamp(published_at).isoformat(),
+             datetime.fromtimestamp(created_at).strftime('%Y-%m-%d %H:%M:%S'))
+            for url, title, published_at, created_at in rows
+        ]
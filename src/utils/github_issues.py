@@ -1,7 +1,15 @@
-import requests
 import os
 from datetime import datetime
+from typing import TYPE_CHECKING
 from .datetime_utils import now_jst_str
+from .http import get_session
+from .retry_policy import RetryPolicy, call_with_retry
+
+if TYPE_CHECKING:
+    import requests
+
+# Issue作成は冪等ではないため、送信済みの可能性がある読み取りタイムアウトは再試行しない
+GITHUB_RETRY_POLICY = RetryPolicy(max_retries=2, base_delay=2.0, idempotent=False)
 
 class GitHubIssueCreator:
     def __init__(self):
@@ -21,6 +29,9 @@ class GitHubIssueCreator:
             print("❌ GitHub Issue作成: 認証情報が不足")
             return False
         
+        # 認証情報がない実行（ローカル・メンテナンス時など）では requests を読み込まない
+        import requests
+        
         try:
             api_url = f"https://api.github.com/repos/{self.repository}/issues"
             
@@ -36,7 +47,10 @@ class GitHubIssueCreator:
                 'labels': labels or ['automation', 'error']
             }
             
-            response = requests.post(api_url, json=issue_data, headers=headers, timeout=10)
+            response = call_with_retry(
+                self._post_issue, api_url, issue_data, headers,
+                policy=GITHUB_RETRY_POLICY
+            )
             
             if response.status_code == 201:
                 issue_url = response.json().get('html_url')
@@ -47,10 +61,21 @@ class GitHubIssueCreator:
                 print(f"レスポンス: {response.text}")
                 return False
         
+        except requests.HTTPError as e:
+            print(f"❌ GitHub Issue作成失敗: {e.response.status_code}")
+            print(f"レスポンス: {e.response.text}")
+            return False
+        
         except Exception as e:
             print(f"❌ GitHub Issue作成エラー: {e}")
             return False
     
+    def _post_issue(self, api_url: str, issue_data: dict, headers: dict) -> "requests.Response":
+        """IssueをPOSTし、4xx/5xxは例外として送出（リトライ判定用）"""
+        response = get_session().post(api_url, json=issue_data, headers=headers, timeout=10)
+        response.raise_for_status()
+        return response
+    
     def create_error_issue(self, error_type: str, error_message: str, additional_info: str = "") -> bool:
         """エラー用のIssueを作成"""
         timestamp = now_jst_str()
@@ -0,0 +1,71 @@
+"""
+共有HTTPセッション
+
+プロセス内で1つの requests.Session を共有し、接続（DNS解決・TCP/TLS）を再利用する。
+常駐モードでは収集・投稿のたびに接続をやり直さずに済む。
+--metrics 指定時はレスポンスごとの応答時間・ダウンロード量をホスト単位で記録する。
+requests は初回の get_session() 呼び出しで読み込む。
+"""
+
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import TYPE_CHECKING, Any, Optional
+from urllib.parse import urlsplit
+
+from . import metrics
+from .constants import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+
+if TYPE_CHECKING:
+    import requests
+
+_session: Optional["requests.Session"] = None
+_lock = threading.Lock()
+
+def get_session() -> "requests.Session":
+    """共有セッションを取得（スレッド間で共有してよい）"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                # 同じホストに別アカウントで投稿することがあるため、Cookieは保持しない
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                session.hooks['response'].append(_record_response)
+                _session = session
+    return _session
+
+def _record_response(response: "requests.Response", *args: Any, **kwargs: Any) -> None:
+    """レスポンスごとの応答時間・ダウンロード量を記録（--metrics 指定時のみ。ラベルはホスト単位）
+
+    フックは本文を読む前に呼ばれるため、ダウンロード量は Content-Length ヘッダーから数える。
+    ヘッダーがない場合は stream=False のレスポンスのみ本文の長さを数え
+    （どのみち requests が直後に全て読み込む）、stream=True のレスポンスは本文を読ませないよう数えない。
+    """
+    if not metrics.enabled():
+        return
+    host = urlsplit(response.url).netloc
+    metrics.observe("http_request", response.elapsed.total_seconds(), error=not response.ok,
+                    host=host, method=response.request.method)
+
+    content_length = response.headers.get('Content-Length', '')
+    if content_length.isdigit():
+        downloaded = int(content_length)
+    elif not kwargs.get('stream'):
+        downloaded = len(response.content)
+    else:
+        return
+    metrics.count("http_downloaded_bytes_total", downloaded, host=host)
+
+def close_session() -> None:
+    """共有セッションの接続を閉じる（次の get_session() で作り直す）"""
+    global _session
+    with _lock:
+        session, _session = _session, None
+    if session is not None:
+        session.close()
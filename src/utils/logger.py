@@ -1,98 +1,216 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, TextIO
 from pathlib import Path
 
-class NewsPublisherLogger:
-    """AIニュース投稿システム専用ロガー"""
+from . import metrics
+
+# 全モジュールのロガーの親（ハンドラーはこのロガーにだけ付ける）
+ROOT_LOGGER_NAME = "news_publisher"
+LOG_DIR = Path(__file__).parent.parent.parent / "logs"
+
+class ContextFormatter(logging.Formatter):
+    """コンソール用フォーマッター（メッセージの後にコンテキストを key=value で付ける）"""
     
-    def __init__(self, name: str, log_level: str = "INFO"):
-        self.logger = logging.getLogger(name)
-        self.logger.setLevel(getattr(logging, log_level.upper()))
-        
-        # 重複ハンドラー防止
-        if not self.logger.handlers:
-            self._setup_handlers()
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        message = super().formatMessage(record)
+        context = getattr(record, 'context', None)
+        if context:
+            message += " | " + " | ".join(f"{k}={v}" for k, v in context.items())
+        return message
+
+class JsonLinesFormatter(logging.Formatter):
+    """1レコード1行のJSON（time / level / logger / message / thread / context / exception）"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        context = getattr(record, 'context', None)
+        if context:
+            entry['context'] = context
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class DailyJsonLinesHandler(logging.Handler):
+    """logs/news_publisher_YYYYMMDD.jsonl に書き出すハンドラー
+    
+    ファイルは1つだけ開いたまま使い、日付が変わったら（常駐モード）次の日のファイルに切り替える。
+    """
+    
+    def __init__(self, log_dir: Path):
+        super().__init__(logging.DEBUG)
+        self.log_dir = log_dir
+        self.setFormatter(JsonLinesFormatter())
+        self._date: Optional[str] = None
+        self._stream: Optional[TextIO] = None
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            date = datetime.fromtimestamp(record.created).strftime('%Y%m%d')
+            if self._stream is None or date != self._date:
+                if self._stream is not None:
+                    self._stream.close()
+                self._stream = open(self.log_dir / f"news_publisher_{date}.jsonl", 'a', encoding='utf-8')
+                self._date = date
+            self._stream.write(self.format(record) + "\n")
+            self._stream.flush()
+        except Exception:
+            self.handleError(record)
+    
+    def close(self) -> None:
+        self.acquire()
+        try:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+        finally:
+            self.release()
+        super().close()
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """レコードをそのままキューに入れるハンドラー
+    
+    標準の QueueHandler は呼び出し元のスレッドでメッセージを組み立てるが、
+    ここでは組み立て（% の展開・コンテキストの整形）もリスナーのスレッドに任せる。
+    同じプロセス内のキューなので pickle できる形にする必要はない。
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[DeferredQueueHandler] = None
+_setup_lock = threading.Lock()
+
+def setup_logging() -> None:
+    """ログの出力先を設定（プロセスで1回だけ。get_logger から自動的に呼ばれる）
     
-    def _setup_handlers(self):
-        """ログハンドラーの設定"""
-        # コンソール出力
+    各ロガーは親の news_publisher に伝播し、親の QueueHandler がレコードをキューに入れるだけで戻る。
+    コンソール（INFO以上）とJSON Linesのファイル（DEBUG以上）への書き出しは QueueListener のスレッドで行う。
+    """
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is not None:
+            return
+        
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
-        
-        # ログフォーマット
-        formatter = logging.Formatter(
+        console_handler.setFormatter(ContextFormatter(
             '%(asctime)s | %(levelname)8s | %(name)s | %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        console_handler.setFormatter(formatter)
-        
-        self.logger.addHandler(console_handler)
+        ))
+        handlers: List[logging.Handler] = [console_handler]
         
         # GitHub Actions環境でのログファイル出力
         try:
-            log_dir = Path(__file__).parent.parent.parent / "logs"
-            log_dir.mkdir(exist_ok=True)
-            
-            log_file = log_dir / f"news_publisher_{datetime.now().strftime('%Y%m%d')}.log"
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(logging.DEBUG)
-            file_handler.setFormatter(formatter)
-            
-            self.logger.addHandler(file_handler)
+            LOG_DIR.mkdir(exist_ok=True)
+            handlers.append(DailyJsonLinesHandler(LOG_DIR))
         except Exception:
             # ファイルログが作成できない場合はスキップ
             pass
+        
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _queue_handler = DeferredQueueHandler(log_queue)
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        root.addHandler(_queue_handler)
+        root.propagate = False
+        
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+def shutdown_logging() -> None:
+    """キューに残ったログを書き出してリスナーを止める（終了時に atexit から呼ばれる）"""
+    global _listener, _queue_handler
+    with _setup_lock:
+        listener, _listener = _listener, None
+        queue_handler, _queue_handler = _queue_handler, None
+        if queue_handler is not None:
+            logging.getLogger(ROOT_LOGGER_NAME).removeHandler(queue_handler)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+class NewsPublisherLogger:
+    """AIニュース投稿システム専用ロガー
     
-    def info(self, message: str, **kwargs):
+    メッセージには % 形式の引数を渡せる（logger.info("%s 件収集", count)）。
+    出力しないレベルのログは何もせずに戻り、出力するログもキューに入れるだけで、
+    メッセージの組み立てと書き出しはログ用のスレッドで行う。
+    """
+    
+    def __init__(self, name: str, log_level: str = "INFO"):
+        setup_logging()
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(getattr(logging, log_level.upper()))
+    
+    def info(self, message: str, *args, **kwargs):
         """情報ログ"""
-        self._log_with_context(logging.INFO, message, **kwargs)
+        self._log_with_context(logging.INFO, message, *args, **kwargs)
     
-    def warning(self, message: str, **kwargs):
+    def warning(self, message: str, *args, **kwargs):
         """警告ログ"""
-        self._log_with_context(logging.WARNING, message, **kwargs)
+        self._log_with_context(logging.WARNING, message, *args, **kwargs)
     
-    def error(self, message: str, **kwargs):
+    def error(self, message: str, *args, **kwargs):
         """エラーログ"""
-        self._log_with_context(logging.ERROR, message, **kwargs)
+        self._log_with_context(logging.ERROR, message, *args, **kwargs)
     
-    def debug(self, message: str, **kwargs):
+    def debug(self, message: str, *args, **kwargs):
         """デバッグログ"""
-        self._log_with_context(logging.DEBUG, message, **kwargs)
+        self._log_with_context(logging.DEBUG, message, *args, **kwargs)
     
-    def _log_with_context(self, level: int, message: str, **kwargs):
-        """コンテキスト付きログ出力"""
-        if kwargs:
-            context_str = " | ".join([f"{k}={v}" for k, v in kwargs.items()])
-            full_message = f"{message} | {context_str}"
-        else:
-            full_message = message
-        
-        self.logger.log(level, full_message)
+    def _log_with_context(self, level: int, message: str, *args, **kwargs):
+        """コンテキスト付きログ出力（コンテキストはレコードの context に入れ、整形は出力時に行う）"""
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, *args, extra={'context': kwargs})
     
     def start_process(self, process_name: str):
         """処理開始ログ"""
-        self.info(f"🚀 {process_name} 開始")
+        self.info("🚀 %s 開始", process_name)
     
     def end_process(self, process_name: str, success: bool = True, **kwargs):
         """処理終了ログ"""
         status = "✅" if success else "❌"
-        self.info(f"{status} {process_name} {'完了' if success else '失敗'}", **kwargs)
+        self.info("%s %s %s", status, process_name, '完了' if success else '失敗', **kwargs)
     
     def collect_stats(self, source: str, count: int, success: bool = True):
         """収集統計ログ"""
         status = "✅" if success else "⚠️"
-        self.info(f"{status} {source} 収集", count=count, success=success)
+        self.info("%s %s 収集", status, source, count=count, success=success)
     
     def api_call(self, api_name: str, success: bool = True, response_time: float = None):
-        """API呼び出しログ"""
+        """API呼び出しログ（--metrics 指定時は呼び出し回数・応答時間も記録）"""
         status = "✅" if success else "❌"
         kwargs = {"api": api_name, "success": success}
         if response_time:
             kwargs["response_time"] = f"{response_time:.2f}s"
+            metrics.observe("api_call", response_time, error=not success, api=api_name)
+        else:
+            metrics.count("api_calls_total", api=api_name, success=success)
         
-        self.info(f"{status} {api_name} API呼び出し", **kwargs)
+        self.info("%s %s API呼び出し", status, api_name, **kwargs)
+    
+    def span(self, name: str, **labels):
+        """with 文の中の所要時間を記録（--metrics 指定時のみ。utils.metrics.span と同じ）"""
+        return metrics.span(name, **labels)
+    
+    def timed(self, name: str, **labels):
+        """関数の所要時間を記録するデコレーター（utils.metrics.timed と同じ）"""
+        return metrics.timed(name, **labels)
 
 # デフォルトロガーインスタンス
 logger = NewsPublisherLogger("news_publisher")
@@ -0,0 +1,314 @@
+"""
+実行メトリクス
+
+1回の実行の中で、段階・外部呼び出しの所要時間（スパン）、件数、ダウンロード量、
+キャッシュのヒット率、LLMのトークン数を集計し、JSON と Prometheus のテキスト形式で書き出す。
+
+    with metrics.span("stage", stage="collect"):
+        ...
+
+    @metrics.timed("stage", stage="publish")
+    def publish(...): ...
+
+    metrics.count("llm_tokens_total", 1200, provider="gemini", kind="prompt")
+    metrics.cache("preflight", hit=True)
+
+enable() するまでは全ての関数が何もしない（set_span_hook() で登録したフックは計測とは別に呼ばれる）。
+span() は共有の空のコンテキストマネージャを返すだけなので、計測箇所を増やしても
+無効時のオーバーヘッドは1回あたり1マイクロ秒未満に収まる。
+集計はスレッドセーフ（収集・投稿・接続確認のスレッドから記録してよい）。
+"""
+
+import asyncio
+import functools
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Tuple, TypeVar
+
+from .config import get_data_dir
+from .constants import METRICS_DIR_NAME, METRICS_RETENTION_DAYS
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+# Prometheus のメトリクス名の接頭辞
+PROMETHEUS_PREFIX = "news_publisher_"
+QUANTILES = (0.5, 0.95)
+
+# (メトリクス名, ((ラベル名, 値), ...))
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+def _key(name: str, labels: Dict[str, Any]) -> MetricKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _quantile(samples: List[float], q: float) -> float:
+    """昇順に並んだ samples の分位点（最近傍）"""
+    return samples[max(0, math.ceil(q * len(samples)) - 1)]
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Prometheus のラベル表記（値の \\ " 改行はエスケープする）"""
+    if not labels:
+        return ""
+    escape = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+class RunMetrics:
+    """1回の実行のメトリクス"""
+
+    def __init__(self, info: Optional[Dict[str, Any]] = None) -> None:
+        self.info = dict(info or {})
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._counters: Dict[MetricKey, float] = {}
+        self._timers: Dict[MetricKey, List[float]] = {}
+        self._errors: Dict[MetricKey, int] = {}
+
+    def count(self, name: str, value: float = 1, **labels: Any) -> None:
+        """カウンターに加算"""
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, error: bool = False, **labels: Any) -> None:
+        """所要時間を記録（error なら失敗した回数にも数える）"""
+        key = _key(name, labels)
+        with self._lock:
+            self._timers.setdefault(key, []).append(seconds)
+            if error:
+                self._errors[key] = self._errors.get(key, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON で書き出す形式"""
+        with self._lock:
+            counters = dict(self._counters)
+            timers = {key: sorted(samples) for key, samples in self._timers.items()}
+            errors = dict(self._errors)
+
+        caches: Dict[str, Dict[str, Any]] = {}
+        for (name, labels), value in sorted(counters.items()):
+            if name == "cache_requests_total":
+                label_map = dict(labels)
+                entry = caches.setdefault(label_map['cache'], {'hits': 0, 'misses': 0})
+                entry['hits' if label_map['result'] == "hit" else 'misses'] += int(value)
+        for entry in caches.values():
+            entry['hit_rate'] = entry['hits'] / (entry['hits'] + entry['misses'])
+
+        return {
+            'info': self.info,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'duration_seconds': time.perf_counter() - self._started,
+            'spans': [
+                {
+                    'name': name,
+                    'labels': dict(labels),
+                    'count': len(samples),
+                    'errors': errors.get((name, labels), 0),
+                    'total_seconds': sum(samples),
+                    'min_seconds': samples[0],
+                    'max_seconds': samples[-1],
+                    **{f"p{int(q * 100)}_seconds": _quantile(samples, q) for q in QUANTILES},
+                }
+                for (name, labels), samples in sorted(timers.items())
+            ],
+            'counters': [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(counters.items())
+            ],
+            'caches': caches,
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus のテキスト形式（スパンは summary、カウンターは counter）"""
+        data = self.to_dict()
+        lines: List[str] = []
+        typed = set()
+
+        def declare(name: str, kind: str) -> None:
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for span in data['spans']:
+            name = f"{PROMETHEUS_PREFIX}{span['name']}_seconds"
+            declare(name, "summary")
+            for q in QUANTILES:
+                labels = _format_labels({**span['labels'], 'quantile': str(q)})
+                lines.append(f"{name}{labels} {span[f'p{int(q * 100)}_seconds']:.6f}")
+            labels = _format_labels(span['labels'])
+            lines.append(f"{name}_sum{labels} {span['total_seconds']:.6f}")
+            lines.append(f"{name}_count{labels} {span['count']}")
+        for span in data['spans']:
+            name = f"{PROMETHEUS_PREFIX}{span['name']}_errors_total"
+            declare(name, "counter")
+            lines.append(f"{name}{_format_labels(span['labels'])} {span['errors']}")
+        for counter in data['counters']:
+            name = f"{PROMETHEUS_PREFIX}{counter['name']}"
+            declare(name, "counter")
+            lines.append(f"{name}{_format_labels(counter['labels'])} {counter['value']:g}")
+
+        name = f"{PROMETHEUS_PREFIX}run_duration_seconds"
+        declare(name, "gauge")
+        lines.append(f"{name} {data['duration_seconds']:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: Optional[Path] = None) -> Tuple[Path, Path]:
+        """data/metrics/ に JSON と Prometheus 形式で書き出す
+
+        Returns:
+            (JSON のパス, Prometheus 形式のパス)
+        """
+        directory = Path(directory) if directory is not None else get_data_dir() / METRICS_DIR_NAME
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = f"run_{self.started_at:%Y%m%d_%H%M%S}_{os.getpid()}"
+        json_path = directory / f"{stem}.json"
+        prom_path = directory / f"{stem}.prom"
+        json_path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding='utf-8')
+        prom_path.write_text(self.to_prometheus(), encoding='utf-8')
+        return json_path, prom_path
+
+class _NoopSpan:
+    """無効時の span()（何もしない）"""
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+class _Span:
+    """有効時の span()（計測とフックのコンテキストのどちらか、または両方）"""
+    __slots__ = ('_metrics', '_name', '_labels', '_hook', '_start')
+
+    def __init__(self, metrics: Optional[RunMetrics], name: str, labels: Dict[str, Any],
+                 hook: Optional[ContextManager[Any]] = None) -> None:
+        self._metrics = metrics
+        self._name = name
+        self._labels = labels
+        self._hook = hook
+
+    def __enter__(self) -> "_Span":
+        if self._hook is not None:
+            self._hook.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        elapsed = time.perf_counter() - self._start
+        if self._metrics is not None:
+            self._metrics.observe(self._name, elapsed, error=exc_type is not None, **self._labels)
+        if self._hook is not None:
+            self._hook.__exit__(exc_type, *exc_info)
+
+_NOOP_SPAN = _NoopSpan()
+_current: Optional[RunMetrics] = None
+# スパン名 → ラベルを受け取ってコンテキストマネージャを返すフック（--profile など）
+_span_hooks: Dict[str, Callable[[Dict[str, Any]], ContextManager[Any]]] = {}
+
+def _open_span(name: str, labels: Dict[str, Any]) -> Optional[_Span]:
+    """計測もフックもなければ None"""
+    metrics = _current
+    hook = _span_hooks.get(name) if _span_hooks else None
+    if metrics is None and hook is None:
+        return None
+    return _Span(metrics, name, labels, hook(labels) if hook is not None else None)
+
+def enable(**info: Any) -> RunMetrics:
+    """計測を開始（info は書き出すファイルに含める実行情報）"""
+    global _current
+    _current = RunMetrics(info)
+    return _current
+
+def disable() -> Optional[RunMetrics]:
+    """計測を終了し、それまでのメトリクスを返す"""
+    global _current
+    metrics, _current = _current, None
+    return metrics
+
+def current() -> Optional[RunMetrics]:
+    """計測中のメトリクス（無効なら None）"""
+    return _current
+
+def enabled() -> bool:
+    """計測中か"""
+    return _current is not None
+
+def set_span_hook(name: str, hook: Optional[Callable[[Dict[str, Any]], ContextManager[Any]]]) -> None:
+    """name のスパンに入るたびに hook(labels) のコンテキストの中で実行する（None で解除）
+
+    計測（enable()）とは独立しており、--metrics を指定しなくても呼ばれる。
+    """
+    if hook is None:
+        _span_hooks.pop(name, None)
+    else:
+        _span_hooks[name] = hook
+
+def span(name: str, **labels: Any):
+    """with 文の中の所要時間を name の summary として記録（例外で抜けた場合は失敗として数える）"""
+    return _open_span(name, labels) or _NOOP_SPAN
+
+def timed(name: str, **labels: Any) -> Callable[[F], F]:
+    """関数の所要時間を記録するデコレーター（span() と同じ。コルーチン関数にも使える）"""
+    def decorator(func: F) -> F:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                opened = _open_span(name, labels)
+                if opened is None:
+                    return await func(*args, **kwargs)
+                with opened:
+                    return await func(*args, **kwargs)
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            opened = _open_span(name, labels)
+            if opened is None:
+                return func(*args, **kwargs)
+            with opened:
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+def observe(name: str, seconds: float, error: bool = False, **labels: Any) -> None:
+    """計測済みの所要時間を記録"""
+    metrics = _current
+    if metrics is not None:
+        metrics.observe(name, seconds, error=error, **labels)
+
+def count(name: str, value: float = 1, **labels: Any) -> None:
+    """カウンターに加算（名前は Prometheus の慣習に合わせて _total で終える）"""
+    metrics = _current
+    if metrics is not None:
+        metrics.count(name, value, **labels)
+
+def cache(name: str, hit: bool) -> None:
+    """キャッシュの参照結果を記録（ヒット率は JSON の caches に出力）"""
+    metrics = _current
+    if metrics is not None:
+        metrics.count("cache_requests_total", cache=name, result="hit" if hit else "miss")
+
+def cleanup_metrics(days: int = METRICS_RETENTION_DAYS, directory: Optional[Path] = None) -> int:
+    """保存期間を過ぎたメトリクスファイルを削除
+
+    Returns:
+        削除したファイル数
+    """
+    directory = Path(directory) if directory is not None else get_data_dir() / METRICS_DIR_NAME
+    if not directory.is_dir():
+        return 0
+    cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+    deleted = 0
+    for path in directory.glob("run_*"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                deleted += 1
+        except OSError:
+            continue
+    return deleted
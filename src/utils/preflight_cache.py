@@ -0,0 +1,62 @@
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import get_data_dir
+
+class PreflightCache:
+    """事前チェック（API接続確認など）の成功結果をTTL付きで保存するキャッシュ
+
+    キーには認証情報のハッシュを使い、APIキーそのものはファイルに書き込まない。
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl_minutes: float = 0) -> None:
+        self.path = Path(path) if path is not None else get_data_dir() / "preflight_cache.json"
+        self.ttl_seconds = ttl_minutes * 60
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: Optional[str]) -> str:
+        """チェック対象を表すキーを作成"""
+        return hashlib.sha256("\0".join(p or "" for p in parts).encode('utf-8')).hexdigest()
+
+    @property
+    def enabled(self) -> bool:
+        """TTLが設定されている場合のみ有効"""
+        return self.ttl_seconds > 0
+
+    def _load(self) -> Dict[str, float]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def is_valid(self, key: str) -> bool:
+        """TTL内に成功記録があるか"""
+        if not self.enabled:
+            return False
+        with self._lock:
+            checked_at = self._load().get(key)
+        return checked_at is not None and time.time() - checked_at < self.ttl_seconds
+
+    def record_success(self, key: str) -> None:
+        """成功を記録（期限切れの記録は削除）"""
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            data = {k: v for k, v in self._load().items() if now - v < self.ttl_seconds}
+            data[key] = now
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix('.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                tmp_path.replace(self.path)
+            except OSError as e:
+                print(f"⚠️  事前チェックのキャッシュを保存できません: {e}")
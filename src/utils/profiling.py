@@ -0,0 +1,301 @@
+"""
+段階ごとのプロファイル（--profile）
+
+パイプラインの各段階（metrics.span("stage", stage=...) で囲まれた処理）を cProfile と tracemalloc で計測し、
+logs/profile/YYYYMMDD_HHMMSS_<pid>/ に書き出す。
+
+    <stage>.pstats     段階ごとの cProfile の結果（python -m pstats で開ける）
+    allocations.txt    段階ごとのメモリ確保の多い箇所（ファイル:行）
+    summary.json       段階ごとの経過時間・CPU時間・待ち時間・メモリのピーク、実行全体のピーク
+
+経過時間から CPU 時間を引いた待ち時間が長い段階はネットワークなどの待ちが、
+CPU 時間が長い段階は pstats の上位（bs4・feedparser・sqlite3 など）がボトルネックになっている。
+
+    - cProfile は段階を実行したスレッドだけを計測する（接続確認・非同期モードのスレッドは段階ごとに別の結果）。
+      段階の中で入れ子になった段階は、外側の段階の結果には含めない
+    - フィード解析のプロセスプールで実行した処理は計測しない
+    - メモリは tracemalloc で追跡した Python のメモリで、ピークはプロセス全体の値
+      （同時に実行している段階があればその分も含む）
+
+enable() しなければ tracemalloc も開始せず、段階のスパンは従来どおり何もしない。
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import shutil
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import metrics
+from .constants import PROFILE_DIR_NAME, PROFILE_RETENTION_DAYS, PROFILE_TOP_ALLOCATIONS
+from .logger import LOG_DIR
+
+# プロファイルするスパン名（main.py の各段階）
+STAGE_SPAN = "stage"
+
+# スナップショットの比較から除くファイル（計測自体のメモリ確保）
+_IGNORED_FILES = (tracemalloc.__file__, cProfile.__file__, __file__)
+
+def _max_rss_bytes() -> Optional[int]:
+    """プロセスの最大常駐メモリ（resource を使えない環境では None）"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux は KB、macOS はバイト
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES]
+    )
+
+class _StageStats:
+    """1つの段階の集計（常駐モードでは同じ段階を繰り返し実行する）"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.process_cpu_seconds = 0.0
+        self.peak_traced_bytes = 0
+        self.net_allocated_bytes = 0
+        self.allocations: Dict[str, List[int]] = {}  # ファイル:行 → [増えたバイト数, 増えたブロック数]
+        self.stats: Optional[pstats.Stats] = None
+
+    def to_dict(self, pstats_file: Optional[str]) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'wall_seconds': self.wall_seconds,
+            'cpu_seconds': self.cpu_seconds,
+            'wait_seconds': max(0.0, self.wall_seconds - self.cpu_seconds),
+            'process_cpu_seconds': self.process_cpu_seconds,
+            'peak_traced_bytes': self.peak_traced_bytes,
+            'net_allocated_bytes': self.net_allocated_bytes,
+            'pstats': pstats_file,
+            'top_allocations': [
+                {'site': site, 'size_bytes': size, 'blocks': blocks}
+                for site, (size, blocks) in self.top_allocations()
+            ],
+        }
+
+    def top_allocations(self) -> List[Any]:
+        ranked = sorted(self.allocations.items(), key=lambda item: item[1][0], reverse=True)
+        return [item for item in ranked[:PROFILE_TOP_ALLOCATIONS] if item[1][0] > 0]
+
+class _StageRun:
+    """1回の段階の実行（set_span_hook のコンテキスト）"""
+
+    def __init__(self, profiler: "StageProfiler", stage: str) -> None:
+        self.profiler = profiler
+        self.stage = stage
+        self.peak = 0
+        self.outer: Optional[cProfile.Profile] = None
+        self.profile: Optional[cProfile.Profile] = None
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.wall = self.cpu = self.process_cpu = 0.0
+
+    def __enter__(self) -> "_StageRun":
+        self.profiler._begin(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.profiler._end(self)
+
+class StageProfiler:
+    """段階ごとの cProfile・tracemalloc の結果を集める"""
+
+    def __init__(self, info: Optional[Dict[str, Any]] = None) -> None:
+        self.info = dict(info or {})
+        self.started_at = datetime.now()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._active: List[_StageRun] = []
+        self._stages: Dict[str, _StageStats] = {}
+        self._peak = 0
+
+    def start(self) -> None:
+        """tracemalloc を開始し、段階のスパンにフックする"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        metrics.set_span_hook(STAGE_SPAN, lambda labels: _StageRun(self, str(labels.get('stage', 'unknown'))))
+
+    def stop(self) -> None:
+        """フックを外して tracemalloc を止める"""
+        metrics.set_span_hook(STAGE_SPAN, None)
+        with self._lock:
+            self._update_peaks()
+        tracemalloc.stop()
+
+    def _update_peaks(self) -> None:
+        """ここまでのピークを実行中の段階と実行全体に反映（_lock の中で呼ぶ）"""
+        peak = tracemalloc.get_traced_memory()[1]
+        for run in self._active:
+            run.peak = max(run.peak, peak)
+        self._peak = max(self._peak, peak)
+
+    def _begin(self, run: _StageRun) -> None:
+        # 入れ子の段階の間は外側の段階の cProfile を止める
+        run.outer = getattr(self._local, 'profile', None)
+        if run.outer is not None:
+            run.outer.disable()
+
+        with self._lock:
+            self._update_peaks()
+            tracemalloc.reset_peak()
+            self._active.append(run)
+        run.snapshot = _snapshot()
+
+        run.profile = cProfile.Profile()
+        try:
+            run.profile.enable()
+        except ValueError:
+            # Python 3.12 以降は別のスレッドで cProfile を使っている間は有効にできない
+            run.profile = None
+        self._local.profile = run.profile
+
+        run.wall = time.perf_counter()
+        run.cpu = time.thread_time()
+        run.process_cpu = time.process_time()
+
+    def _end(self, run: _StageRun) -> None:
+        wall = time.perf_counter() - run.wall
+        cpu = time.thread_time() - run.cpu
+        process_cpu = time.process_time() - run.process_cpu
+        if run.profile is not None:
+            run.profile.disable()
+        diff = _snapshot().compare_to(run.snapshot, 'lineno')
+
+        with self._lock:
+            self._update_peaks()
+            self._active.remove(run)
+
+            stage = self._stages.setdefault(run.stage, _StageStats())
+            stage.calls += 1
+            stage.wall_seconds += wall
+            stage.cpu_seconds += cpu
+            stage.process_cpu_seconds += process_cpu
+            stage.peak_traced_bytes = max(stage.peak_traced_bytes, run.peak)
+            for stat in diff:
+                frame = stat.traceback[0]
+                entry = stage.allocations.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+                entry[0] += stat.size_diff
+                entry[1] += stat.count_diff
+                stage.net_allocated_bytes += stat.size_diff
+            if run.profile is not None:
+                if stage.stats is None:
+                    stage.stats = pstats.Stats(run.profile)
+                else:
+                    stage.stats.add(run.profile)
+
+        self._local.profile = run.outer
+        if run.outer is not None:
+            try:
+                run.outer.enable()
+            except ValueError:
+                pass
+
+    def summary(self) -> Dict[str, Any]:
+        """summary.json の内容"""
+        with self._lock:
+            stages = dict(self._stages)
+            peak = self._peak
+        return {
+            'info': self.info,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'peak_traced_bytes': peak,
+            'max_rss_bytes': _max_rss_bytes(),
+            'stages': {
+                name: stage.to_dict(f"{name}.pstats" if stage.stats is not None else None)
+                for name, stage in stages.items()
+            },
+        }
+
+    def write(self, directory: Optional[Path] = None) -> Path:
+        """logs/profile/YYYYMMDD_HHMMSS_<pid>/ に書き出す
+
+        Returns:
+            書き出したディレクトリ
+        """
+        if directory is None:
+            directory = LOG_DIR / PROFILE_DIR_NAME / f"{self.started_at:%Y%m%d_%H%M%S}_{os.getpid()}"
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        summary = self.summary()
+        lines = []
+        with self._lock:
+            for name, stage in self._stages.items():
+                if stage.stats is not None:
+                    stage.stats.dump_stats(str(directory / f"{name}.pstats"))
+                lines.append(f"## {name}（{stage.calls}回、増加 {stage.net_allocated_bytes / 1024:,.1f} KiB）")
+                lines.extend(f"{size / 1024:12,.1f} KiB {blocks:8,d} blocks  {site}"
+                             for site, (size, blocks) in stage.top_allocations())
+                lines.append("")
+        (directory / "allocations.txt").write_text("\n".join(lines), encoding='utf-8')
+        (directory / "summary.json").write_text(json.dumps(summary, ensure_ascii=False, indent=2),
+                                                encoding='utf-8')
+        return directory
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    """段階ごとの時間・メモリを表示"""
+    # 全角の見出しは幅2として揃える
+    print(f"  {'段階':<12s} {'経過':>6s} {'CPU':>8s} {'待ち':>6s} {'ピーク':>7s}")
+    for name, stage in summary['stages'].items():
+        print(f"  {name:<14s} {stage['wall_seconds']:7.2f}s {stage['cpu_seconds']:7.2f}s "
+              f"{stage['wait_seconds']:7.2f}s {stage['peak_traced_bytes'] / 1024 / 1024:8.1f}MiB")
+    rss = summary['max_rss_bytes']
+    print(f"  メモリのピーク: {summary['peak_traced_bytes'] / 1024 / 1024:.1f}MiB（tracemalloc）"
+          + (f" / 最大常駐 {rss / 1024 / 1024:.1f}MiB" if rss else ""))
+
+_current: Optional[StageProfiler] = None
+
+def enable(**info: Any) -> StageProfiler:
+    """プロファイルを開始（info は summary.json に含める実行情報）"""
+    global _current
+    if _current is not None:
+        _current.stop()
+    _current = StageProfiler(info)
+    _current.start()
+    return _current
+
+def disable() -> Optional[StageProfiler]:
+    """プロファイルを終了し、それまでの結果を返す"""
+    global _current
+    profiler, _current = _current, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+def enabled() -> bool:
+    """プロファイル中か"""
+    return _current is not None
+
+def cleanup_profiles(days: int = PROFILE_RETENTION_DAYS, directory: Optional[Path] = None) -> int:
+    """保存期間を過ぎたプロファイルを削除
+
+    Returns:
+        削除したディレクトリ数
+    """
+    directory = Path(directory) if directory is not None else LOG_DIR / PROFILE_DIR_NAME
+    if not directory.is_dir():
+        return 0
+    cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+    deleted = 0
+    for path in directory.iterdir():
+        try:
+            if path.is_dir() and path.stat().st_mtime < cutoff:
+                shutil.rmtree(path)
+                deleted += 1
+        except OSError:
+            continue
+    return deleted
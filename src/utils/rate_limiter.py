@@ -1,105 +1,333 @@
+import asyncio
+import sqlite3
+import threading
 import time
+from dataclasses import dataclass
 from functools import wraps
-from datetime import datetime, timedelta
-from typing import Dict, List
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .config import get_data_dir
+from .retry_policy import RetryPolicy, retry_with_policy
+
+@dataclass(frozen=True)
+class RateLimit:
+    """APIごとのレート制限設定
+
+    calls_per_minute は任意の60秒間に許可する呼び出し数の上限（バースト分を含む）。
+    GCRA はバースト分を一度に許可したあと interval ごとに1回ずつ許可するため、
+    60秒間の呼び出し数は burst + (60 / interval) - 1 になる。これが calls_per_minute を
+    超えないよう、burst が大きいほど interval を長くする（平均の呼び出し数は減る）。
+    """
+    calls_per_minute: float
+    burst: int = 1
+    shared: bool = False
+
+    def __post_init__(self) -> None:
+        if self.calls_per_minute <= 0:
+            raise ValueError("calls_per_minute must be positive")
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+        if self.burst > 1 and self.burst > self.calls_per_minute:
+            raise ValueError("burst must not exceed calls_per_minute")
+
+    @property
+    def interval(self) -> float:
+        """バースト後に1回分の枠が戻る間隔（秒）"""
+        return 60.0 / (self.calls_per_minute - self.burst + 1)
+
+    @property
+    def tolerance(self) -> float:
+        """バースト分として前倒しを許容する時間（秒）"""
+        return self.interval * (self.burst - 1)
+
+def _gcra(tat: Optional[float], now: float, limit: RateLimit, reserve: bool) -> Tuple[Optional[float], float]:
+    """GCRAの1ステップを計算
+
+    Args:
+        tat: 保存されている理論上の次回到着時刻（未記録ならNone）
+        now: 現在時刻
+        limit: レート制限設定
+        reserve: Trueなら待機が必要でも枠を予約する
+
+    Returns:
+        (新しいTAT（更新しない場合None）, 必要な待機秒数)
+    """
+    tat = now if tat is None else max(tat, now)
+    wait_seconds = max(0.0, tat - limit.tolerance - now)
+    if wait_seconds > 0 and not reserve:
+        return None, wait_seconds
+    return tat + limit.interval, wait_seconds
+
+class MemoryRateLimitStore:
+    """プロセス内メモリにTATを保持するストア（単調時計を使用）"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._tat: Dict[str, float] = {}
+
+    def admit(self, api_name: str, limit: RateLimit, reserve: bool = True) -> float:
+        """枠を判定・消費し、必要な待機秒数を返す"""
+        with self._lock:
+            new_tat, wait_seconds = _gcra(self._tat.get(api_name), self._clock(), limit, reserve)
+            if new_tat is not None:
+                self._tat[api_name] = new_tat
+        return wait_seconds
+
+    def reset(self, api_name: Optional[str] = None) -> None:
+        """状態をリセット（api_name省略時は全API）"""
+        with self._lock:
+            if api_name is None:
+                self._tat.clear()
+            else:
+                self._tat.pop(api_name, None)
+
+class SQLiteRateLimitStore:
+    """SQLiteファイルにTATを保持し、複数プロセスで1つの枠を共有するストア
+
+    プロセス間で比較できるよう壁時計（time.time）を使い、
+    BEGIN IMMEDIATE で読み取りから更新までを排他する。
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, clock: Callable[[], float] = time.time,
+                 timeout: float = 10.0) -> None:
+        if db_path is None:
+            db_path = get_data_dir() / "rate_limits.db"
+
+        self.db_path = Path(db_path)
+        self._clock = clock
+        self._timeout = timeout
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """自動コミット無効化済みの接続を作成"""
+        conn = sqlite3.connect(self.db_path, timeout=self._timeout, isolation_level=None)
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.execute(
+                        'CREATE TABLE IF NOT EXISTS rate_limit_state ('
+                        'api_name TEXT PRIMARY KEY, tat REAL NOT NULL)'
+                    )
+                    self._initialized = True
+        return conn
+
+    def admit(self, api_name: str, limit: RateLimit, reserve: bool = True) -> float:
+        """枠を判定・消費し、必要な待機秒数を返す"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT tat FROM rate_limit_state WHERE api_name = ?', (api_name,)
+                ).fetchone()
+                new_tat, wait_seconds = _gcra(row[0] if row else None, self._clock(), limit, reserve)
+                if new_tat is not None:
+                    conn.execute(
+                        'INSERT INTO rate_limit_state (api_name, tat) VALUES (?, ?) '
+                        'ON CONFLICT(api_name) DO UPDATE SET tat = excluded.tat',
+                        (api_name, new_tat)
+                    )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        finally:
+            conn.close()
+        return wait_seconds
+
+    def reset(self, api_name: Optional[str] = None) -> None:
+        """状態をリセット（api_name省略時は全API）"""
+        if not self.db_path.exists():
+            return
+        conn = self._connect()
+        try:
+            if api_name is None:
+                conn.execute('DELETE FROM rate_limit_state')
+            else:
+                conn.execute('DELETE FROM rate_limit_state WHERE api_name = ?', (api_name,))
+        finally:
+            conn.close()
 
 class RateLimiter:
-    """API レート制限管理クラス"""
-    
-    def __init__(self):
-        self._call_history: Dict[str, List[datetime]] = {}
-    
-    def is_allowed(self, api_name: str, max_calls: int, time_window_minutes: int) -> bool:
-        """指定されたAPI呼び出しが制限内かチェック"""
-        now = datetime.now()
-        cutoff_time = now - timedelta(minutes=time_window_minutes)
-        
-        # 履歴の初期化
-        if api_name not in self._call_history:
-            self._call_history[api_name] = []
-        
-        # 古い履歴を削除
-        self._call_history[api_name] = [
-            call_time for call_time in self._call_history[api_name]
-            if call_time > cutoff_time
-        ]
-        
-        # 制限チェック
-        return len(self._call_history[api_name]) < max_calls
-    
-    def record_call(self, api_name: str):
-        """API呼び出しを記録"""
-        now = datetime.now()
-        if api_name not in self._call_history:
-            self._call_history[api_name] = []
-        
-        self._call_history[api_name].append(now)
-    
-    def wait_if_needed(self, api_name: str, max_calls: int, time_window_minutes: int):
-        """必要に応じて待機"""
-        if not self.is_allowed(api_name, max_calls, time_window_minutes):
-            # 最も古い呼び出し時刻から計算
-            oldest_call = min(self._call_history[api_name])
-            wait_until = oldest_call + timedelta(minutes=time_window_minutes)
-            wait_seconds = (wait_until - datetime.now()).total_seconds()
-            
-            if wait_seconds > 0:
-                print(f"⏳ {api_name} レート制限: {wait_seconds:.1f}秒待機中...")
-                time.sleep(wait_seconds)
+    """GCRA（トークンバケット相当）による API レート制限管理クラス
+
+    APIごとに「理論上の次回到着時刻（TAT）」だけを保持するため、
+    呼び出し履歴の長さに関係なく判定はO(1)で行える。
+    スレッドセーフで、asyncioからは acquire_async を使う。
+    shared が有効なAPIはSQLiteストアを通じて複数プロセスで枠を共有する。
+    """
+
+    def __init__(self, limits: Optional[Dict[str, RateLimit]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 shared_store: Optional[SQLiteRateLimitStore] = None) -> None:
+        self._lock = threading.Lock()
+        self._memory_store = MemoryRateLimitStore(clock)
+        self._shared_store = shared_store
+        self._limits: Dict[str, RateLimit] = dict(limits or {})
+        self._config_loaded: bool = limits is not None
+
+    def configure(self, api_name: str, calls_per_minute: float, burst: Optional[int] = None,
+                  shared: bool = False) -> None:
+        """APIのレート制限を設定（burst省略時は連続させず 60 / calls_per_minute 秒ごとに1回）"""
+        limit = RateLimit(calls_per_minute, burst if burst is not None else 1, shared)
+        with self._lock:
+            self._limits[api_name] = limit
+
+    def load_config(self, config: Any = None) -> None:
+        """rate_limits.yml からAPIごとの設定を読み込み
+
+        Args:
+            config: Configオブジェクト（省略時は新規作成）
+        """
+        if config is None:
+            from .config import Config
+            config = Config()
+
+        try:
+            data = config.rate_limits
+        except FileNotFoundError:
+            data = {}
+
+        limits: Dict[str, RateLimit] = {}
+        for api_name, settings in (data.get('apis') or {}).items():
+            calls_per_minute = float(settings['calls_per_minute'])
+            burst = int(settings.get('burst', 1))
+            limits[api_name] = RateLimit(calls_per_minute, burst, bool(settings.get('shared', False)))
+
+        shared_db = data.get('shared_db')
+
+        with self._lock:
+            self._limits.update(limits)
+            if shared_db and self._shared_store is None:
+                self._shared_store = SQLiteRateLimitStore(get_data_dir() / shared_db)
+            self._config_loaded = True
+
+    def get_limit(self, api_name: str, default_calls_per_minute: Optional[float] = None,
+                  shared: bool = False) -> RateLimit:
+        """APIのレート制限設定を取得（YAML設定がデコレータ引数より優先）"""
+        if not self._config_loaded:
+            try:
+                self.load_config()
+            except Exception as e:
+                print(f"⚠️  レート制限設定の読み込みに失敗: {e}")
+                self._config_loaded = True
+
+        limit = self._limits.get(api_name)
+        if limit is not None:
+            return limit
+        if default_calls_per_minute is None:
+            raise ValueError(f"レート制限が設定されていません: {api_name}")
+
+        # 未設定のAPIは連続させず、任意の60秒間で max_calls 回までに抑える
+        return RateLimit(default_calls_per_minute, 1, shared)
+
+    def _store_for(self, limit: RateLimit):
+        """制限設定に対応するストアを取得"""
+        if not limit.shared:
+            return self._memory_store
+        if self._shared_store is None:
+            with self._lock:
+                if self._shared_store is None:
+                    self._shared_store = SQLiteRateLimitStore()
+        return self._shared_store
+
+    def _admit(self, api_name: str, limit: RateLimit, reserve: bool) -> float:
+        """ストアで枠を判定（共有ストアの失敗時はプロセス内で判定）"""
+        store = self._store_for(limit)
+        try:
+            return store.admit(api_name, limit, reserve)
+        except sqlite3.Error as e:
+            print(f"⚠️  共有レート制限ストアにアクセスできません（プロセス内で制限）: {e}")
+            return self._memory_store.admit(api_name, limit, reserve)
+
+    def reserve(self, api_name: str, max_calls_per_minute: Optional[float] = None,
+                shared: bool = False) -> float:
+        """呼び出し枠を1つ予約し、実行までに必要な待機秒数を返す"""
+        limit = self.get_limit(api_name, max_calls_per_minute, shared)
+        return self._admit(api_name, limit, reserve=True)
+
+    def try_acquire(self, api_name: str, max_calls_per_minute: Optional[float] = None,
+                    shared: bool = False) -> bool:
+        """待機なしで呼び出せる場合のみ枠を消費してTrueを返す"""
+        limit = self.get_limit(api_name, max_calls_per_minute, shared)
+        return self._admit(api_name, limit, reserve=False) == 0
+
+    def acquire(self, api_name: str, max_calls_per_minute: Optional[float] = None,
+                shared: bool = False) -> float:
+        """呼び出し枠を取得（必要なら待機）し、待機した秒数を返す"""
+        wait_seconds = self.reserve(api_name, max_calls_per_minute, shared)
+        if wait_seconds > 0:
+            print(f"⏳ {api_name} レート制限: {wait_seconds:.1f}秒待機中...")
+            time.sleep(wait_seconds)
+        return wait_seconds
+
+    async def acquire_async(self, api_name: str, max_calls_per_minute: Optional[float] = None,
+                            shared: bool = False) -> float:
+        """acquire の asyncio 版（イベントループをブロックしない）"""
+        limit = self.get_limit(api_name, max_calls_per_minute, shared)
+        if limit.shared:
+            # SQLiteのロック待ちでイベントループを止めないようスレッドで予約
+            loop = asyncio.get_running_loop()
+            wait_seconds = await loop.run_in_executor(None, self._admit, api_name, limit, True)
+        else:
+            wait_seconds = self._admit(api_name, limit, True)
+        if wait_seconds > 0:
+            print(f"⏳ {api_name} レート制限: {wait_seconds:.1f}秒待機中...")
+            await asyncio.sleep(wait_seconds)
+        return wait_seconds
+
+    def reset(self, api_name: Optional[str] = None) -> None:
+        """状態をリセット（api_name省略時は全API）"""
+        self._memory_store.reset(api_name)
+        if self._shared_store is not None:
+            self._shared_store.reset(api_name)
 
 # グローバルレートリミッター
 rate_limiter = RateLimiter()
 
-def rate_limited(api_name: str, max_calls_per_minute: int = 15):
+def rate_limited(api_name: str, max_calls_per_minute: int = 15, shared: bool = False):
     """
     レート制限デコレータ
-    
+
+    config/rate_limits.yml に api_name の設定があればそちらを優先する。
+    コルーチン関数にも使用できる。
+
     Args:
         api_name: API名
-        max_calls_per_minute: 1分あたりの最大呼び出し数
+        max_calls_per_minute: 1分あたりの最大呼び出し数（YAML未設定時の既定値）
+        shared: 複数プロセスで枠を共有するか（YAML未設定時の既定値）
     """
     def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                await rate_limiter.acquire_async(api_name, max_calls_per_minute, shared)
+                return await func(*args, **kwargs)
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # レート制限チェック
-            rate_limiter.wait_if_needed(api_name, max_calls_per_minute, 1)
-            
-            try:
-                result = func(*args, **kwargs)
-                rate_limiter.record_call(api_name)
-                return result
-            except Exception as e:
-                # エラーの場合もレート制限にカウント（不正利用防止）
-                rate_limiter.record_call(api_name)
-                raise e
-        
+            # 呼び出し前に枠を消費する（エラー時もカウントされる）
+            rate_limiter.acquire(api_name, max_calls_per_minute, shared)
+            return func(*args, **kwargs)
+
         return wrapper
     return decorator
 
 def retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0):
     """
-    指数バックオフによるリトライデコレータ
-    
+    リトライデコレータ（後方互換用）
+
+    retry_policy.retry_with_policy に委譲するため、再試行不可な例外は即座に送出され、
+    待機時間にはジッターが入り、実行全体のリトライ予算が適用される。
+
     Args:
         max_retries: 最大リトライ回数
         base_delay: 基本待機時間（秒）
     """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            for attempt in range(max_retries + 1):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    if attempt == max_retries:
-                        # 最後の試行で失敗した場合は例外を再発生
-                        raise e
-                    
-                    # 指数バックオフで待機
-                    delay = base_delay * (2 ** attempt)
-                    print(f"  ⚠️  試行 {attempt + 1}/{max_retries + 1} 失敗: {e}")
-                    print(f"  ⏳ {delay}秒後にリトライ...")
-                    time.sleep(delay)
-            
-        return wrapper
-    return decorator
\ No newline at end of file
+    return retry_with_policy(RetryPolicy(max_retries=max_retries, base_delay=base_delay))
@@ -0,0 +1,301 @@
+"""
+リトライポリシー
+
+例外を「再試行すべきか」で分類し、サーバーの Retry-After や Gemini のクォータ情報を尊重しつつ
+decorrelated jitter で待機する。1回の実行全体のリトライはRetryBudgetで上限を設ける。
+"""
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import wraps
+from typing import Any, Callable, Optional, TypeVar
+
+from .constants import RETRY_BASE_DELAY, RETRY_MAX_ATTEMPTS, RETRY_MAX_DELAY
+
+T = TypeVar('T')
+
+# 再試行で回復が見込めるHTTPステータス
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+# Retry-After 付きなら要求を処理せずに断ったとみなせるステータス（非冪等な要求でも再試行できる）
+REJECTED_STATUS_CODES = frozenset({429, 503})
+
+# 接続する前に失敗したことを示す urllib3 の例外名（要求は送信されていない）
+_CONNECT_PHASE_ERRORS = frozenset({'NewConnectionError', 'NameResolutionError', 'ConnectTimeoutError'})
+
+# 設定・プログラムの誤りを示し、再試行しても結果が変わらない例外
+NON_RETRYABLE_EXCEPTIONS = (
+    ValueError, TypeError, KeyError, AttributeError, ImportError, NotImplementedError
+)
+
+# google.api_core の例外名（SDKはインポートせず名前で判定する）
+RETRYABLE_GOOGLE_ERRORS = frozenset({
+    'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable',
+    'DeadlineExceeded', 'InternalServerError', 'GatewayTimeout', 'Aborted',
+})
+
+_QUOTA_HINT_PATTERNS = (
+    re.compile(r'retry_delay\s*\{\s*seconds:\s*(\d+)'),
+    re.compile(r'retry in\s*([\d.]+)\s*s', re.IGNORECASE),
+    re.compile(r'retry after\s*([\d.]+)', re.IGNORECASE),
+)
+
+class RetryableError(Exception):
+    """再試行可能であることを明示する例外"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+@dataclass(frozen=True)
+class RetryDecision:
+    """例外の分類結果"""
+    retryable: bool
+    reason: str
+    retry_after: Optional[float] = None
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """リトライ方針
+
+    Attributes:
+        max_retries: 最大リトライ回数
+        base_delay: 最小待機時間（秒）
+        max_delay: 1回あたりの最大待機時間（秒）。これを超える Retry-After は諦める
+        idempotent: Falseの場合、送信済みの可能性がある失敗（読み取りタイムアウト・5xx・408・
+            接続後の通信エラー）は再試行しない。Retry-After 付きの 429・503 と接続前の失敗だけ再試行する
+        retry_unknown: 分類できない例外を再試行するか
+    """
+    max_retries: int = RETRY_MAX_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+    idempotent: bool = True
+    retry_unknown: bool = True
+
+    def next_delay(self, previous_delay: float) -> float:
+        """decorrelated jitter による次の待機時間を計算"""
+        upper = max(self.base_delay, previous_delay * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+class RetryBudget:
+    """1回の実行全体で使えるリトライ回数と待機時間の上限（スレッドセーフ）"""
+
+    def __init__(self, max_retries: int = 10, max_delay_seconds: float = 120.0) -> None:
+        self._lock = threading.Lock()
+        self.max_retries = max_retries
+        self.max_delay_seconds = max_delay_seconds
+        self._retries = 0
+        self._delay = 0.0
+        self._config_loaded = False
+
+    def configure(self, max_retries: int, max_delay_seconds: float) -> None:
+        """上限を設定"""
+        with self._lock:
+            self.max_retries = max_retries
+            self.max_delay_seconds = max_delay_seconds
+            self._config_loaded = True
+
+    def load_config(self, config: Any = None) -> None:
+        """rate_limits.yml の retry セクションから上限を読み込み"""
+        if config is None:
+            from .config import Config
+            config = Config()
+
+        try:
+            settings = config.rate_limits.get('retry') or {}
+        except FileNotFoundError:
+            settings = {}
+
+        self.configure(
+            int(settings.get('budget_retries', self.max_retries)),
+            float(settings.get('budget_seconds', self.max_delay_seconds))
+        )
+
+    def try_spend(self, delay: float) -> bool:
+        """リトライ1回分（待機delay秒）を消費できればTrue"""
+        if not self._config_loaded:
+            try:
+                self.load_config()
+            except Exception as e:
+                print(f"⚠️  リトライ予算の設定読み込みに失敗: {e}")
+                self._config_loaded = True
+
+        with self._lock:
+            if self._retries + 1 > self.max_retries:
+                return False
+            if self._delay + delay > self.max_delay_seconds:
+                return False
+            self._retries += 1
+            self._delay += delay
+            return True
+
+    def reset(self) -> None:
+        """消費量をリセット（実行開始時に呼ぶ）"""
+        with self._lock:
+            self._retries = 0
+            self._delay = 0.0
+
+    @property
+    def spent(self) -> tuple:
+        """(消費したリトライ回数, 消費した待機秒数)"""
+        with self._lock:
+            return self._retries, self._delay
+
+# 実行全体で共有するリトライ予算
+retry_budget = RetryBudget()
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After ヘッダー（秒数またはHTTP日付）を秒数に変換"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def _quota_hint(message: str) -> Optional[float]:
+    """Geminiのクォータエラーメッセージから待機秒数を取得"""
+    for pattern in _QUOTA_HINT_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+def _classify_status(status: int, retry_after: Optional[float], policy: RetryPolicy) -> RetryDecision:
+    """HTTPステータスで分類"""
+    if status not in RETRYABLE_STATUS_CODES:
+        return RetryDecision(False, f"HTTP {status}")
+    if policy.idempotent or (status in REJECTED_STATUS_CODES and retry_after is not None):
+        return RetryDecision(True, f"HTTP {status}", retry_after)
+    return RetryDecision(False, f"処理済みの可能性がある HTTP {status}")
+
+def _failed_before_connect(exc: BaseException) -> bool:
+    """requests の ConnectionError が接続前（名前解決・接続拒否）の失敗か
+
+    requests は urllib3 の MaxRetryError を args[0] に持ち、その reason が接続時の例外になる。
+    """
+    reason = getattr(exc.args[0], 'reason', None) if exc.args else None
+    return reason is not None and any(cls.__name__ in _CONNECT_PHASE_ERRORS for cls in type(reason).__mro__)
+
+def classify_exception(exc: BaseException, policy: Optional[RetryPolicy] = None) -> RetryDecision:
+    """例外を再試行可能かどうか分類
+
+    Args:
+        exc: 発生した例外
+        policy: リトライ方針（冪等性・未知例外の扱いに使用）
+
+    Returns:
+        分類結果
+    """
+    policy = policy or RetryPolicy()
+
+    if isinstance(exc, RetryableError):
+        return RetryDecision(True, str(exc), exc.retry_after)
+
+    # requests の例外（インポートせずに型名とモジュールで判定）
+    module = type(exc).__module__ or ""
+    if module.startswith('requests'):
+        response = getattr(exc, 'response', None)
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            return _classify_status(response.status_code, retry_after, policy)
+
+        name = type(exc).__name__
+        if name == 'ConnectTimeout':
+            # 接続できていないので非冪等な要求でも安全
+            return RetryDecision(True, "接続タイムアウト")
+        if name in ('ReadTimeout', 'Timeout'):
+            if policy.idempotent:
+                return RetryDecision(True, "読み取りタイムアウト")
+            return RetryDecision(False, "送信済みの可能性があるタイムアウト")
+        if name in ('ConnectionError', 'ChunkedEncodingError', 'ProxyError', 'SSLError'):
+            if policy.idempotent:
+                return RetryDecision(True, f"通信エラー ({name})")
+            if name == 'ConnectionError' and _failed_before_connect(exc):
+                return RetryDecision(True, "接続エラー（未送信）")
+            return RetryDecision(False, f"送信済みの可能性がある通信エラー ({name})")
+        return RetryDecision(False, f"リクエストエラー ({name})")
+
+    # google.api_core の例外（Gemini）
+    if module.startswith('google'):
+        name = type(exc).__name__
+        code = getattr(exc, 'code', None)
+        if name in RETRYABLE_GOOGLE_ERRORS or (isinstance(code, int) and code in RETRYABLE_STATUS_CODES):
+            return RetryDecision(True, f"Gemini {name}", _quota_hint(str(exc)))
+        if isinstance(code, int) and 400 <= code < 500:
+            return RetryDecision(False, f"Gemini {name}")
+
+    if isinstance(exc, NON_RETRYABLE_EXCEPTIONS):
+        return RetryDecision(False, type(exc).__name__)
+
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return RetryDecision(True, type(exc).__name__)
+
+    return RetryDecision(policy.retry_unknown, f"未分類の例外 ({type(exc).__name__})")
+
+def call_with_retry(func: Callable[..., T], *args: Any, policy: Optional[RetryPolicy] = None,
+                    budget: Optional[RetryBudget] = None, **kwargs: Any) -> T:
+    """ポリシーに従って関数を再試行付きで呼び出す
+
+    Raises:
+        最後に発生した例外（再試行不可・回数超過・予算超過の場合）
+    """
+    policy = policy or RetryPolicy()
+    budget = budget if budget is not None else retry_budget
+    delay = policy.base_delay
+
+    for attempt in range(policy.max_retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt == policy.max_retries:
+                raise
+
+            decision = classify_exception(e, policy)
+            if not decision.retryable:
+                raise
+
+            delay = policy.next_delay(delay)
+            if decision.retry_after is not None:
+                if decision.retry_after > policy.max_delay:
+                    print(f"  ❌ 待機指示が長すぎるためリトライしません: {decision.retry_after:.1f}秒")
+                    raise
+                delay = max(delay, decision.retry_after)
+
+            if not budget.try_spend(delay):
+                print("  ❌ リトライ予算を使い切ったためリトライしません")
+                raise
+
+            print(f"  ⚠️  試行 {attempt + 1}/{policy.max_retries + 1} 失敗 ({decision.reason}): {e}")
+            print(f"  ⏳ {delay:.1f}秒後にリトライ...")
+            time.sleep(delay)
+
+    raise RuntimeError("unreachable")
+
+def retry_with_policy(policy: Optional[RetryPolicy] = None, budget: Optional[RetryBudget] = None):
+    """
+    リトライポリシーを適用するデコレータ
+
+    Args:
+        policy: リトライ方針
+        budget: リトライ予算（省略時は実行全体の共有予算）
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return call_with_retry(func, *args, policy=policy, budget=budget, **kwargs)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,216 @@
+"""
+状態スナップショット
+
+data/ 配下の状態ファイル（履歴DB・投稿記録など）を、圧縮・バージョン付きの1ファイルに
+まとめて書き出し／読み込みする。GitHub Actions のように毎回まっさらな環境で実行する場合に、
+キャッシュやアーティファクトから前回の状態を復元するために使う。
+
+ファイル形式:
+    MAGIC (8バイト) | フォーマットバージョン (uint16) | マニフェスト長 (uint32) |
+    マニフェスト (JSON) | エントリ1 (zlib) | エントリ2 (zlib) | ...
+マニフェストには各エントリの名前・種類・サイズ・SHA-256 を記録し、読み込み時に全て検証してから書き込む。
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import get_data_dir
+from .datetime_utils import now_jst
+
+MAGIC = b"NPSTATE\x00"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct(">HI")
+COMPRESSION_LEVEL = 6
+
+# 重複チェックの履歴DB（空の場合は書き出さない）
+HISTORY_DB_NAME = "history.db"
+
+# スナップショットに含める状態ファイル（data/ からの相対パス, 種類）
+# sqlite は実行中でも一貫したコピーを VACUUM INTO で作成する
+STATE_FILES: Tuple[Tuple[str, str], ...] = (
+    (HISTORY_DB_NAME, "sqlite"),
+    ("publish_journal.db", "sqlite"),
+    ("preflight_cache.json", "file"),
+)
+
+def _read_sqlite(path: Path) -> bytes:
+    """SQLiteファイルの一貫したコピーを取得（空きページを詰めた状態）"""
+    with tempfile.TemporaryDirectory(prefix="state_snapshot_") as tmp:
+        copy_path = Path(tmp) / path.name
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute('VACUUM INTO ?', (str(copy_path),))
+        finally:
+            conn.close()
+        return copy_path.read_bytes()
+
+def _has_history(path: Path) -> bool:
+    """履歴DBに投稿履歴が1件以上あるか（ファイル・テーブルがなければ False）"""
+    if not path.exists():
+        return False
+    conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+    try:
+        return conn.execute('SELECT EXISTS (SELECT 1 FROM article_history)').fetchone()[0] == 1
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+def export_state(snapshot_path, data_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """状態ファイルをスナップショットに書き出す
+
+    履歴DBが空の場合は書き出さない（復元に失敗した実行などの空の状態で、
+    前回までの重複チェック履歴を持つスナップショットを置き換えないため）。
+
+    Args:
+        snapshot_path: 出力先のファイル
+        data_dir: 状態ファイルのディレクトリ（省略時は get_data_dir()）
+
+    Returns:
+        書き出したマニフェスト
+
+    Raises:
+        ValueError: 履歴DBがない・空の場合
+    """
+    data_dir = Path(data_dir) if data_dir is not None else get_data_dir()
+    snapshot_path = Path(snapshot_path)
+
+    if not _has_history(data_dir / HISTORY_DB_NAME):
+        raise ValueError(f"履歴DBが空のため状態スナップショットを書き出しません: {data_dir / HISTORY_DB_NAME}")
+
+    entries: List[Dict[str, Any]] = []
+    blobs: List[bytes] = []
+    for name, kind in STATE_FILES:
+        path = data_dir / name
+        if not path.exists():
+            continue
+        data = _read_sqlite(path) if kind == "sqlite" else path.read_bytes()
+        blob = zlib.compress(data, COMPRESSION_LEVEL)
+        entries.append({
+            'name': name,
+            'kind': kind,
+            'size': len(data),
+            'compressed_size': len(blob),
+            'sha256': hashlib.sha256(data).hexdigest(),
+        })
+        blobs.append(blob)
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'created_at': now_jst().isoformat(timespec='seconds'),
+        'entries': entries,
+    }
+    manifest_bytes = json.dumps(manifest, ensure_ascii=False).encode('utf-8')
+
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = snapshot_path.with_name(f".{snapshot_path.name}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER.pack(FORMAT_VERSION, len(manifest_bytes)))
+        f.write(manifest_bytes)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, snapshot_path)
+
+    return manifest
+
+def _read_snapshot(snapshot_path: Path) -> Tuple[Dict[str, Any], List[bytes]]:
+    """スナップショットを読み込み、全エントリを展開・検証する
+
+    Raises:
+        ValueError: 形式・バージョンが異なる、または内容が壊れている場合
+    """
+    raw = snapshot_path.read_bytes()
+    header_end = len(MAGIC) + _HEADER.size
+    if len(raw) < header_end or raw[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"状態スナップショットではありません: {snapshot_path}")
+
+    version, manifest_length = _HEADER.unpack_from(raw, len(MAGIC))
+    if version != FORMAT_VERSION:
+        raise ValueError(f"未対応のスナップショット形式です: version={version}")
+
+    try:
+        manifest = json.loads(raw[header_end:header_end + manifest_length].decode('utf-8'))
+    except ValueError as e:
+        raise ValueError(f"スナップショットのマニフェストが壊れています: {e}")
+
+    offset = header_end + manifest_length
+    contents: List[bytes] = []
+    for entry in manifest.get('entries', []):
+        blob = raw[offset:offset + entry['compressed_size']]
+        offset += entry['compressed_size']
+        try:
+            data = zlib.decompress(blob)
+        except zlib.error as e:
+            raise ValueError(f"スナップショットが壊れています ({entry['name']}): {e}")
+        if len(data) != entry['size'] or hashlib.sha256(data).hexdigest() != entry['sha256']:
+            raise ValueError(f"スナップショットのチェックサムが一致しません: {entry['name']}")
+        contents.append(data)
+
+    if offset != len(raw):
+        raise ValueError("スナップショットのサイズが一致しません")
+    return manifest, contents
+
+def read_manifest(snapshot_path) -> Dict[str, Any]:
+    """スナップショットを検証してマニフェストを返す"""
+    manifest, _ = _read_snapshot(Path(snapshot_path))
+    return manifest
+
+def import_state(snapshot_path, data_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """スナップショットから状態ファイルを復元する
+
+    全エントリを検証してから書き込むため、壊れたスナップショットで既存の状態を上書きしない。
+
+    Returns:
+        読み込んだマニフェスト
+
+    Raises:
+        ValueError: スナップショットが壊れている場合
+    """
+    data_dir = Path(data_dir) if data_dir is not None else get_data_dir()
+    manifest, contents = _read_snapshot(Path(snapshot_path))
+
+    known = {name for name, _ in STATE_FILES}
+    data_dir.mkdir(parents=True, exist_ok=True)
+    staged: List[Tuple[Dict[str, Any], Path]] = []
+    try:
+        # 1. 一時ファイルに書き出してDBを検査
+        for entry, data in zip(manifest['entries'], contents):
+            if entry['name'] not in known:
+                # 新しいバージョンで追加された状態ファイルは無視する
+                continue
+            tmp_path = data_dir / f".{entry['name']}.tmp"
+            tmp_path.write_bytes(data)
+            staged.append((entry, tmp_path))
+
+            if entry['kind'] == "sqlite":
+                conn = sqlite3.connect(tmp_path)
+                try:
+                    ok = conn.execute('PRAGMA quick_check').fetchone()[0] == 'ok'
+                except sqlite3.DatabaseError:
+                    ok = False
+                finally:
+                    conn.close()
+                if not ok:
+                    raise ValueError(f"スナップショットのDBが壊れています: {entry['name']}")
+
+        # 2. 全て揃ってから置き換える
+        for entry, tmp_path in staged:
+            path = data_dir / entry['name']
+            if entry['kind'] == "sqlite":
+                # 置き換え前のDBのWALが新しいDBに適用されないよう削除
+                for suffix in ("-wal", "-shm"):
+                    Path(f"{path}{suffix}").unlink(missing_ok=True)
+            os.replace(tmp_path, path)
+    finally:
+        for _, tmp_path in staged:
+            tmp_path.unlink(missing_ok=True)
+
+    return manifest
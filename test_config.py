@@ -5,6 +5,7 @@
 
 import sys
 import os
+from contextlib import contextmanager
 sys.path.append('src')
 
 def test_config_loading():
@@ -29,6 +30,14 @@ def test_config_loading():
         templates = config.templates
         print(f"  ✅ templates.yml: テンプレート読み込み成功")
         
+        # ファイルが変わらない限り同じ（変更不可の）オブジェクトが返る
+        assert config.sources is Config().sources
+        try:
+            sources['rss_sources'] = []
+            raise AssertionError("設定が変更可能になっています")
+        except TypeError:
+            print(f"  ✅ キャッシュ: 変更不可の共有ビュー")
+        
         print("✅ 設定ファイル読み込みテスト: 成功")
         return True
         
@@ -41,7 +50,7 @@ def test_database():
     print("\n🧪 データベース接続テスト開始...")
     
     try:
-        from utils.database import ArticleHistoryDB
+        from utils.database import ArticleHistoryDB, url_key
         db = ArticleHistoryDB()
         
         # テストデータ追加
@@ -55,8 +64,13 @@ def test_database():
         is_duplicate = db.is_duplicate(test_url)
         print(f"  ✅ 重複チェック: {is_duplicate}")
         
+        # 一括追加（既存のURLは無視される）
+        added = db.add_articles([(test_url, test_title), ("https://test.example.com/article2", "テスト記事2")])
+        print(f"  ✅ 一括追加: {added}件")
+        
         # 履歴取得
-        recent = db.get_recent_articles(days=1)
+        recent = db.get_recent_keys(days=1)
+        assert (url_key(test_url), "") in [(key, source) for key, source, _, _ in recent]
         print(f"  ✅ 最近の記事: {len(recent)}件")
         
         # クリーンアップ
@@ -135,6 +149,645 @@ def test_content_filter():
         print(f"詳細: {traceback.format_exc()}")
         return False
 
+# main の読み込み時間の上限（重いSDKを読み込んでいない状態で100ms前後）
+IMPORT_TIME_BUDGET_MS = 400
+# 使うときまで読み込まないモジュール
+LAZY_MODULES = ['google.generativeai', 'feedparser', 'bs4', 'requests']
+
+def test_import_time():
+    """main の読み込み時間テスト（-X importtime の出力で計測）"""
+    print("\n🧪 読み込み時間テスト開始...")
+    
+    try:
+        import subprocess
+        src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import main'],
+            cwd=src_dir, capture_output=True, text=True, check=True
+        )
+        
+        # "import time: self [us] | cumulative | imported package" の形式
+        cumulative_us = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            cumulative_us[name.strip()] = int(cumulative)
+        
+        loaded = [name for name in LAZY_MODULES if name in cumulative_us]
+        elapsed_ms = cumulative_us['main'] / 1000
+        print(f"  ✅ import main: {elapsed_ms:.0f}ms（上限 {IMPORT_TIME_BUDGET_MS}ms）")
+        
+        assert not loaded, f"遅延読み込みすべきモジュールが読み込まれています: {loaded}"
+        assert elapsed_ms <= IMPORT_TIME_BUDGET_MS, f"読み込み時間が上限を超えています: {elapsed_ms:.0f}ms"
+        
+        print("✅ 読み込み時間テスト: 成功")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 読み込み時間テスト: 失敗 - {e}")
+        return False
+
+def test_retry_policy():
+    """非冪等な要求のリトライテスト（処理済みの可能性がある失敗は再送しない）"""
+    print("\n🧪 リトライポリシーテスト開始...")
+    
+    try:
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        import requests
+        from utils.retry_policy import RetryBudget, RetryPolicy, call_with_retry
+        
+        responses = []  # (ステータス, Retry-After) を順に返す
+        received = []
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                received.append(self.path)
+                status, retry_after = responses[min(len(received), len(responses)) - 1]
+                self.send_response(status)
+                if retry_after is not None:
+                    self.send_header('Retry-After', retry_after)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            
+            def log_message(self, *args):
+                pass
+        
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/entry"
+        
+        def post():
+            response = requests.post(url, data=b"<entry/>", timeout=5)
+            response.raise_for_status()
+            return response
+        
+        policy = RetryPolicy(max_retries=2, base_delay=0.0, max_delay=1.0, idempotent=False)
+        budget = RetryBudget()
+        budget.configure(10, 10.0)
+        try:
+            # 502 はサーバーが処理済みの可能性があるため再送しない
+            responses[:] = [(502, None)]
+            try:
+                call_with_retry(post, policy=policy, budget=budget)
+                raise AssertionError("502 が成功扱いになっています")
+            except requests.HTTPError:
+                pass
+            assert len(received) == 1, f"502 の POST が {len(received)} 回送信されました"
+            print("  ✅ 502: 1回だけ送信")
+            
+            # Retry-After 付きの 503 は処理されていないため再試行する
+            received.clear()
+            responses[:] = [(503, '0'), (201, None)]
+            assert call_with_retry(post, policy=policy, budget=budget).status_code == 201
+            assert len(received) == 2, f"Retry-After 付き 503 の POST が {len(received)} 回送信されました"
+            print("  ✅ Retry-After 付き 503: 再試行して成功")
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        print("✅ リトライポリシーテスト: 成功")
+        return True
+        
+    except Exception as e:
+        print(f"❌ リトライポリシーテスト: 失敗 - {e}")
+        return False
+
+# Gemini API（無料枠）の1分あたりのリクエスト上限
+GEMINI_RPM_LIMIT = 15
+
+def _max_calls_in_window(times, window=60.0):
+    """呼び出し時刻の列から、任意の window 秒間（半開区間）の最大呼び出し数を求める
+    
+    ちょうど window 秒離れた呼び出しが浮動小数点の誤差で同じ区間に数えられないよう、1µs の余裕を持たせる。
+    """
+    times = sorted(times)
+    start = 0
+    best = 0
+    for end, t in enumerate(times):
+        while times[start] <= t - window + 1e-6:
+            start += 1
+        best = max(best, end - start + 1)
+    return best
+
+def test_rate_limiter():
+    """レート制限テスト（任意の60秒間の呼び出し数が calls_per_minute を超えない）"""
+    print("\n🧪 レート制限テスト開始...")
+    
+    try:
+        from utils.rate_limiter import RateLimit, RateLimiter
+        
+        for calls_per_minute, burst in ((15, 1), (15, 5), (60, 10), (4, 4)):
+            now = [0.0]
+            limiter = RateLimiter({'api': RateLimit(calls_per_minute, burst)}, clock=lambda: now[0])
+            
+            # 待機なしで呼べるときだけ呼ぶ（できるだけ多く呼ぶ）
+            admitted = []
+            for step in range(300 * 20):
+                now[0] = step / 20
+                if limiter.try_acquire('api'):
+                    admitted.append(now[0])
+            
+            # 待機が必要なら予約した時刻に呼ぶ（acquire と同じ）
+            limiter.reset()
+            reserved = []
+            for _ in range(len(admitted)):
+                now[0] += limiter.reserve('api')
+                reserved.append(now[0])
+            
+            for name, times in (("try_acquire", admitted), ("reserve", reserved)):
+                peak = _max_calls_in_window(times)
+                assert peak <= calls_per_minute, (
+                    f"{calls_per_minute}/分 burst={burst} ({name}): 60秒間に{peak}回許可されました"
+                )
+            print(f"  ✅ {calls_per_minute}/分 burst={burst}: 60秒間の最大 {_max_calls_in_window(admitted)}回")
+        
+        # rate_limits.yml の Gemini の設定が提供元の上限（15 RPM）に収まる
+        from utils.config import Config
+        config_limiter = RateLimiter()
+        config_limiter.load_config(Config())
+        gemini = config_limiter.get_limit('gemini_api')
+        now = [0.0]
+        limiter = RateLimiter({'gemini_api': RateLimit(gemini.calls_per_minute, gemini.burst)},
+                              clock=lambda: now[0])
+        admitted = []
+        for step in range(300 * 20):
+            now[0] = step / 20
+            if limiter.try_acquire('gemini_api'):
+                admitted.append(now[0])
+        peak = _max_calls_in_window(admitted)
+        assert peak <= GEMINI_RPM_LIMIT, f"rate_limits.yml の gemini_api は60秒間に{peak}回呼び出せます"
+        print(f"  ✅ rate_limits.yml gemini_api: 60秒間の最大 {peak}回（上限 {GEMINI_RPM_LIMIT}回）")
+        
+        # 設定を省略したAPIは連続させない
+        assert RateLimiter({}).get_limit('unknown', 15).burst == 1
+        
+        print("✅ レート制限テスト: 成功")
+        return True
+        
+    except Exception as e:
+        print(f"❌ レート制限テスト: 失敗 - {e}")
+        return False
+
+class FakeHatenaAPI:
+    """はてなブログ AtomPub の代わり（HatenaPublisher._request を置き換える）
+    
+    post_failure を指定すると、POST でエントリを作成したあと応答の代わりにその例外を送出する。
+    """
+    
+    def __init__(self, post_failure=None, create_on_failure=True):
+        self.entries = {}  # 編集URI -> (タイトル, 本文)
+        self.calls = []
+        self.post_failure = post_failure
+        self.create_on_failure = create_on_failure
+    
+    def _response(self, status, text=""):
+        import requests
+        response = requests.Response()
+        response.status_code = status
+        response._content = text.encode('utf-8')
+        response.encoding = 'utf-8'
+        return response
+    
+    def _entry_xml(self, edit_url, title):
+        return (f'<entry xmlns="http://www.w3.org/2005/Atom"><title>{title}</title>'
+                f'<link rel="edit" href="{edit_url}"/><link rel="alternate" href="{edit_url}/view"/></entry>')
+    
+    def request(self, method, url, data=None, **kwargs):
+        from xml.etree.ElementTree import fromstring
+        self.calls.append(method)
+        if method == 'GET':
+            entries = "".join(self._entry_xml(edit_url, title) for edit_url, (title, _) in self.entries.items())
+            return self._response(200, f'<feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>')
+        
+        title = fromstring(data).findtext('{http://www.w3.org/2005/Atom}title')
+        if method == 'PUT':
+            self.entries[url] = (title, data)
+            return self._response(200, self._entry_xml(url, title))
+        
+        edit_url = f"https://blog.example.com/atom/entry/{len(self.entries) + 1}"
+        if self.post_failure is not None:
+            failure, self.post_failure = self.post_failure, None
+            if self.create_on_failure:
+                self.entries[edit_url] = (title, data)
+            raise failure
+        self.entries[edit_url] = (title, data)
+        return self._response(201, self._entry_xml(edit_url, title))
+
+def test_hatena_publish_journal():
+    """はてなブログ投稿の二重投稿防止テスト（応答を受け取れなかったPOSTを再送しない）"""
+    print("\n🧪 はてなブログ二重投稿防止テスト開始...")
+    
+    try:
+        import tempfile
+        import requests
+        from utils.config import Config
+        from publishers.hatena_publisher import HatenaPublisher
+        from publishers.publish_journal import PublishJournal, STATUS_PENDING, STATUS_PUBLISHED
+        
+        config = Config()
+        bad_gateway = requests.Response()
+        bad_gateway.status_code = 502
+        failures = {
+            "読み取りタイムアウト": requests.ReadTimeout("read timed out"),
+            "502": requests.HTTPError("502 Server Error", response=bad_gateway),
+            "接続中断": requests.ConnectionError("Connection aborted."),
+        }
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            for i, (label, failure) in enumerate(failures.items()):
+                api = FakeHatenaAPI(post_failure=failure)
+                publisher = HatenaPublisher(config, user_id="u", blog_id="b", api_key="k")
+                publisher.journal = PublishJournal(os.path.join(tmp, f"journal_{i}.db"))
+                publisher._request = api.request
+                
+                # POSTは処理されたが応答が失敗 → 一覧で見つけてPUTで更新（POSTは1回だけ）
+                assert publisher.publish("今日のAIニュース", "本文"), f"{label}: 投稿に失敗しました"
+                assert api.calls.count('POST') == 1, f"{label}: POST が {api.calls.count('POST')} 回送信されました"
+                assert len(api.entries) == 1, f"{label}: エントリが {len(api.entries)} 件作成されました"
+                record = publisher.journal.get(publisher.blog_key, "今日のAIニュース")
+                assert record.status == STATUS_PUBLISHED and record.edit_url in api.entries
+                
+                # 再実行: 内容が変われば記録の編集URIにPUT、同じなら何も送らない
+                api.calls.clear()
+                assert publisher.publish("今日のAIニュース", "本文（修正）")
+                assert api.calls == ['PUT'], f"{label}: 再実行で {api.calls} を送信しました"
+                api.calls.clear()
+                assert publisher.publish("今日のAIニュース", "本文（修正）")
+                assert api.calls == [], f"{label}: 同じ内容の再実行で {api.calls} を送信しました"
+                print(f"  ✅ {label}: POST 1回 → 確認して更新")
+            
+            # POSTが処理されなかった場合は pending のまま失敗し、次の実行で確認してから投稿する
+            api = FakeHatenaAPI(post_failure=requests.HTTPError("502 Server Error", response=bad_gateway),
+                                create_on_failure=False)
+            publisher = HatenaPublisher(config, user_id="u", blog_id="b", api_key="k")
+            publisher.journal = PublishJournal(os.path.join(tmp, "journal_pending.db"))
+            publisher._request = api.request
+            assert not publisher.publish("今日のAIニュース", "本文")
+            assert publisher.journal.get(publisher.blog_key, "今日のAIニュース").status == STATUS_PENDING
+            assert publisher.publish("今日のAIニュース", "本文")
+            assert api.calls == ['GET', 'POST', 'GET', 'GET', 'POST'], f"送信順: {api.calls}"
+            assert len(api.entries) == 1
+            print("  ✅ 未処理のPOST: pending のまま失敗 → 次の実行で投稿")
+        
+        print("✅ はてなブログ二重投稿防止テスト: 成功")
+        return True
+        
+    except Exception as e:
+        print(f"❌ はてなブログ二重投稿防止テスト: 失敗 - {e}")
+        return False
+
+def test_publish_fanout():
+    """投稿先の並行投稿テスト（必須の投稿先はタイムアウト後も結果を待つ）"""
+    print("\n🧪 並行投稿テスト開始...")
+    
+    try:
+        import time
+        from types import SimpleNamespace
+        from publishers.base_publisher import BasePublisher
+        from publishers.publish_fanout import PublishFanOut, requires_default_hatena_credentials
+        
+        class SlowPublisher(BasePublisher):
+            def __init__(self, name, required, delay):
+                super().__init__(name, required, timeout_seconds=0.05)
+                self.delay = delay
+            
+            def publish(self, title, content, category="AI"):
+                time.sleep(self.delay)
+                self.last_url = f"https://example.com/{self.name}"
+                return True
+        
+        fanout = PublishFanOut([
+            SlowPublisher("required", required=True, delay=0.3),
+            SlowPublisher("optional", required=False, delay=1.0),
+        ])
+        results = {r.destination: r for r in fanout.publish_all("タイトル", "本文")}
+        assert results["required"].success, "必須の投稿先がタイムアウトで失敗扱いになりました"
+        assert results["required"].url == "https://example.com/required"
+        assert not results["optional"].success
+        assert fanout.succeeded(list(results.values()))
+        print("  ✅ タイムアウト: 必須は完了を待って成功、任意は失敗として報告")
+        
+        # HATENA_* は既定の認証情報を使う有効・必須のはてなブログがある場合だけ必要
+        def config_with(*destinations):
+            return SimpleNamespace(publishers={'destinations': list(destinations)})
+        hatena = {'name': 'hatena', 'type': 'hatena', 'required': True}
+        assert requires_default_hatena_credentials(SimpleNamespace(publishers={}))
+        assert requires_default_hatena_credentials(config_with(hatena))
+        assert not requires_default_hatena_credentials(config_with(
+            dict(hatena, enabled=False), {'name': 'md', 'type': 'markdown', 'required': True}
+        ))
+        assert not requires_default_hatena_credentials(config_with(dict(
+            hatena, username_env='SUB_USER', blog_id_env='SUB_BLOG', api_key_env='SUB_KEY'
+        )))
+        print("  ✅ 認証情報の確認: 有効な投稿先のみ")
+        
+        print("✅ 並行投稿テスト: 成功")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 並行投稿テスト: 失敗 - {e}")
+        return False
+
+def test_state_snapshot():
+    """状態スナップショットテスト（書き出し→読み込みで復元でき、壊れたファイルは拒否する）"""
+    print("\n🧪 状態スナップショットテスト開始...")
+    
+    try:
+        import tempfile
+        from pathlib import Path
+        from utils.database import ArticleHistoryDB
+        from publishers.publish_journal import PublishJournal
+        from utils.state_snapshot import MAGIC, export_state, import_state
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            source, restored, snapshot = Path(tmp, "source"), Path(tmp, "restored"), Path(tmp, "state.bin")
+            
+            # 空の履歴DBは書き出さない
+            with ArticleHistoryDB(source / "history.db"):
+                pass
+            try:
+                export_state(snapshot, data_dir=source)
+                raise AssertionError("空の履歴DBのスナップショットを書き出しました")
+            except ValueError:
+                pass
+            assert not snapshot.exists()
+            
+            urls = [f"https://example.com/articles/{i}" for i in range(100)]
+            with ArticleHistoryDB(source / "history.db") as db:
+                db.add_articles([(url, "タイトル") for url in urls])
+            PublishJournal(source / "publish_journal.db").mark_published(
+                "u/b", "今日のAIニュース", "hash", "https://blog.example.com/entry/1", "https://blog.example.com/edit/1"
+            )
+            (source / "preflight_cache.json").write_text('{"hatena": 1}', encoding='utf-8')
+            
+            manifest = export_state(snapshot, data_dir=source)
+            assert [e['name'] for e in manifest['entries']] == ["history.db", "publish_journal.db", "preflight_cache.json"]
+            import_state(snapshot, data_dir=restored)
+            with ArticleHistoryDB(restored / "history.db") as db:
+                assert all(db.is_duplicate(url) for url in urls), "復元した履歴DBに記事がありません"
+                assert not db.is_duplicate("https://example.com/other")
+            record = PublishJournal(restored / "publish_journal.db").get("u/b", "今日のAIニュース")
+            assert record is not None and record.edit_url == "https://blog.example.com/edit/1"
+            assert (restored / "preflight_cache.json").read_text(encoding='utf-8') == '{"hatena": 1}'
+            print(f"  ✅ 書き出し→読み込み: {len(manifest['entries'])}ファイルを復元")
+            
+            # 壊れたスナップショットは拒否し、既存の状態を変更しない
+            raw = snapshot.read_bytes()
+            before = (restored / "history.db").read_bytes()
+            tampered_manifest = raw.replace(manifest['entries'][0]['sha256'].encode(), b"0" * 64)
+            corrupted = {
+                "マジック不一致": b"X" + raw[1:],
+                "途中で切れたファイル": raw[:len(raw) // 2],
+                "末尾の欠け": raw[:-1],
+                "内容の破損": raw[:-40] + bytes(b ^ 0xFF for b in raw[-40:-20]) + raw[-20:],
+                "チェックサム不一致": tampered_manifest,
+                "空のファイル": b"",
+            }
+            assert raw.startswith(MAGIC) and tampered_manifest != raw
+            for label, data in corrupted.items():
+                broken = Path(tmp, "broken.bin")
+                broken.write_bytes(data)
+                try:
+                    import_state(broken, data_dir=restored)
+                    raise AssertionError(f"{label}: 壊れたスナップショットを読み込みました")
+                except ValueError:
+                    pass
+                assert (restored / "history.db").read_bytes() == before, f"{label}: 既存の状態が変更されました"
+            print(f"  ✅ 壊れたスナップショット: {len(corrupted)}種類とも拒否")
+        
+        print("✅ 状態スナップショットテスト: 成功")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 状態スナップショットテスト: 失敗 - {e}")
+        return False
+
+# フェイクサーバー（src/devtools/fake_services.py）に向ける環境変数
+FAKE_SERVICES_ENV = {
+    'ENDPOINT_PROFILE': 'fake',
+    'HATENA_USERNAME': 'test-user',
+    'HATENA_BLOG_ID': 'test.example.com',
+    'HATENA_API_KEY': 'test-key',
+    'GEMINI_API_KEY': 'test-key',
+}
+
+@contextmanager
+def _fake_services_env():
+    """フェイクサーバーを起動し、空の data ディレクトリでパイプラインを向ける（終了時に環境変数を戻す）"""
+    import tempfile
+    from devtools.fake_services import FakeServices
+    
+    with FakeServices(port=0) as services, tempfile.TemporaryDirectory() as data_dir:
+        env = dict(FAKE_SERVICES_ENV, FAKE_SERVICES_URL=services.url, NEWS_PUBLISHER_DATA_DIR=data_dir)
+        saved = {name: os.environ.get(name) for name in list(env) + ['GITHUB_TOKEN']}
+        os.environ.update(env)
+        os.environ.pop('GITHUB_TOKEN', None)
+        try:
+            yield services
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+            from utils.http import close_session
+            close_session()
+
+def test_daemon_candidate_pool():
+    """常駐モードの候補プールテスト（収集した記事を投稿時刻に再フィルタし、投稿済みの記事を外す）"""
+    print("\n🧪 常駐モード候補プールテスト開始...")
+    
+    try:
+        from datetime import timedelta
+        from main import NewsDaemon
+        from collectors.base_collector import Article
+        from processors.candidate_pool import CandidatePool
+        from utils.datetime_utils import now_jst
+        
+        # 上限を超えた分は古い記事から捨て、期限切れの記事は prune で消す
+        now = now_jst()
+        pool = CandidatePool(timedelta(hours=1), max_size=3)
+        added = pool.add([Article(f"記事{i}", f"https://example.com/{i}", "要約", None, "Test") for i in range(5)], now)
+        assert added == 5 and [a.url for a in pool.articles()] == [f"https://example.com/{i}" for i in range(2, 5)]
+        assert pool.add([Article("記事4（更新）", "https://example.com/4", "要約", None, "Test")], now + timedelta(minutes=59)) == 0
+        assert pool.prune(now + timedelta(minutes=61)) == 3 and len(pool) == 0
+        
+        with _fake_services_env():
+            daemon = NewsDaemon(use_llm=False)
+            try:
+                daemon._collect_cycle(now)
+                collected = len(daemon.pool)
+                assert collected > 0, "候補プールに記事がありません"
+                
+                # 同じ記事を再収集しても増えない
+                daemon._collect_cycle(now + timedelta(minutes=30))
+                assert len(daemon.pool) == collected
+                
+                # 収集後に別の実行で投稿された記事は、投稿時刻の再フィルタで外れる
+                posted = daemon.pool.articles()[0]
+                daemon.db.add_article(posted.url, posted.title)
+                before = [(a.url, a.score) for a in daemon.pool.articles()]
+                selected = daemon._select_articles(daemon.pool.articles())
+                urls = {a.url for a in selected}
+                assert posted.url not in urls, "投稿済みの記事が再フィルタで外れていません"
+                assert urls == {url for url, _ in before} - {posted.url}
+                assert [(a.url, a.score) for a in daemon.pool.articles()] == before, "スコア付けでプールの記事が変わりました"
+                print(f"  ✅ 再フィルタ: {collected}件 → {len(selected)}件（投稿済み1件を除外）")
+                
+                assert daemon.pool.prune(now + daemon.settings.candidate_max_age + timedelta(minutes=1)) == collected
+            finally:
+                daemon.db.close()
+        
+        print("✅ 常駐モード候補プールテスト: 成功")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 常駐モード候補プールテスト: 失敗 - {e}")
+        return False
+
+def test_async_pipeline():
+    """非同期モードテスト（フェイクサーバーに対して同期モードと同じ記事・本文を投稿する）"""
+    print("\n🧪 非同期モードテスト開始...")
+    
+    try:
+        from main import NewsPublisher
+        from utils.article_io import read_articles
+        from utils.checkpoint import RunCheckpoint, STAGE_SCORED, STAGE_GENERATED
+        from utils.datetime_utils import now_jst
+        
+        outputs = {}
+        with _fake_services_env():
+            base_dir = os.environ['NEWS_PUBLISHER_DATA_DIR']
+            for mode in ("sync", "async"):
+                # 同じフィードから空の状態で実行する
+                os.environ['NEWS_PUBLISHER_DATA_DIR'] = os.path.join(base_dir, mode)
+                try:
+                    NewsPublisher(use_llm=False).run(use_async=mode == "async")
+                except SystemExit as e:
+                    raise AssertionError(f"{mode}: 終了コード {e.code}")
+                checkpoint = RunCheckpoint(now_jst().date())
+                assert checkpoint.published_record() is not None, f"{mode}: 投稿されていません"
+                scored = read_articles(checkpoint.stage_path(STAGE_SCORED)).articles
+                outputs[mode] = {
+                    'articles': [(a.url, a.title, a.source, a.category, round(a.score, 3)) for a in scored],
+                    'content': checkpoint.stage_path(STAGE_GENERATED).read_text(encoding='utf-8'),
+                }
+        
+        sync, async_ = outputs["sync"], outputs["async"]
+        assert sync['articles'], "スコア付けした記事がありません"
+        assert async_['articles'] == sync['articles'], "スコア付けした記事・順序が同期モードと異なります"
+        assert async_['content'] == sync['content'], "生成した本文が同期モードと異なります"
+        print(f"  ✅ 同期・非同期とも {len(sync['articles'])}件を同じ順序で選定し、同じ本文を投稿")
+        
+        print("✅ 非同期モードテスト: 成功")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 非同期モードテスト: 失敗 - {e}")
+        return False
+
+def test_feed_parse_pool():
+    """フィード解析テスト（プロセスプールとこのプロセスでの解析が同じ結果になる）"""
+    print("\n🧪 フィード解析プールテスト開始...")
+    
+    try:
+        from collectors import feed_parser
+        from collectors.feed_parser import FeedParseSettings, close_parse_pool, parse_feed_content, parse_feeds
+        from devtools.fake_services import FakeServices
+        
+        with FakeServices(port=0) as services:
+            contents = [services.render_feed(f"feed-{i}").encode('utf-8') for i in range(5)]
+            contents += [services.render_nitter_feed("OpenAI").encode('utf-8'), b"", b"<rss><broken"]
+        
+        try:
+            inline = parse_feeds(contents, FeedParseSettings(workers=0))
+            assert sum(len(entries) for entries in inline) > 0, "記事を解析できません"
+            
+            sizes = sorted(len(content) for content in contents)
+            settings = {
+                "プールのみ": FeedParseSettings(workers=1, min_feed_bytes=0, chunksize=2),
+                "プール・このプロセスの併用": FeedParseSettings(workers=2, min_feed_bytes=sizes[len(sizes) // 2]),
+            }
+            for label, setting in settings.items():
+                assert parse_feeds(contents, setting) == inline, f"{label}: 解析結果が異なります"
+            assert feed_parser._pool is not None, "プロセスプールが使われていません"
+            
+            single = FeedParseSettings(workers=1, min_feed_bytes=0)
+            assert [parse_feed_content(content, single) for content in contents] == inline
+            print(f"  ✅ {len(contents)}フィード・{sum(len(e) for e in inline)}件: プールとこのプロセスで同じ結果")
+        finally:
+            close_parse_pool()
+        
+        print("✅ フィード解析プールテスト: 成功")
+        return True
+        
+    except Exception as e:
+        print(f"❌ フィード解析プールテスト: 失敗 - {e}")
+        return False
+
+def test_slotted_articles():
+    """記事クラステスト（__slots__ の Article・FrozenArticle が記事ファイル・pickle で復元できる）"""
+    print("\n🧪 記事クラステスト開始...")
+    
+    try:
+        import pickle
+        import tempfile
+        from dataclasses import FrozenInstanceError
+        from datetime import datetime
+        from collectors.base_collector import Article, FrozenArticle
+        from utils.article_io import article_from_dict, article_to_row, read_articles, write_articles, ARTICLE_FIELDS
+        
+        articles = [
+            Article("OpenAIが新モデルを発表", "https://example.com/1", "要約です", datetime(2024, 5, 1, 9, 30),
+                    "OpenAI Blog", 12.5, "rss"),
+            Article.trusted("Claudeの新機能", "https://x.com/AnthropicAI/status/1", "ツイート",
+                            datetime(2024, 5, 2, 12, 0, 15), "@AnthropicAI", 3.0, "twitter"),
+        ]
+        
+        # __slots__ のため属性を追加できない。FrozenArticle は変更もできない
+        assert not hasattr(articles[0], '__dict__')
+        for target, error in ((articles[0], AttributeError), (articles[0].freeze(), FrozenInstanceError)):
+            try:
+                target.extra = 1
+                raise AssertionError(f"{type(target).__name__}: 属性を追加できました")
+            except error:
+                pass
+        try:
+            FrozenArticle("タイトル", "https://example.com/", "要約", score=-1.0)
+            raise AssertionError("不正なスコアの記事を作成できました")
+        except ValueError:
+            pass
+        
+        for article in articles:
+            frozen = article.freeze()
+            assert frozen.thaw() == article and hash(frozen) == hash(article.freeze())
+            
+            # 記事ファイルの1行（category を含む）
+            row = article_to_row(article)
+            assert article_to_row(frozen) == row
+            assert article_from_dict(dict(zip(ARTICLE_FIELDS, row))) == article
+            
+            for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+                assert pickle.loads(pickle.dumps(article, protocol)) == article, f"Article: protocol {protocol}"
+                assert pickle.loads(pickle.dumps(frozen, protocol)) == frozen, f"FrozenArticle: protocol {protocol}"
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "articles.jsonl.gz")
+            write_articles(path, [article.freeze() for article in articles])
+            restored = read_articles(path).articles
+        assert restored == articles and [a.category for a in restored] == ["rss", "twitter"]
+        print(f"  ✅ {len(articles)}件: 記事ファイル・pickle・freeze/thaw で復元")
+        
+        print("✅ 記事クラステスト: 成功")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 記事クラステスト: 失敗 - {e}")
+        return False
+
 def main():
     """メインテスト実行"""
     print("🚀 AI News Publisher テスト開始\n")
@@ -144,6 +797,16 @@ def main():
     results.append(test_database())
     results.append(test_rss_collector())
     results.append(test_content_filter())
+    results.append(test_import_time())
+    results.append(test_retry_policy())
+    results.append(test_rate_limiter())
+    results.append(test_hatena_publish_journal())
+    results.append(test_publish_fanout())
+    results.append(test_state_snapshot())
+    results.append(test_daemon_candidate_pool())
+    results.append(test_async_pipeline())
+    results.append(test_feed_parse_pool())
+    results.append(test_slotted_articles())
     
     print(f"\n📊 テスト結果: {sum(results)}/{len(results)} 成功")
     